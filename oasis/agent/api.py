@@ -9,6 +9,11 @@ class AgentAPI(rpc_service.API):
         if topic is None:
             cfg.CONF.import_opt('topic', 'oasis.agent.config',
                                 group='agent')
+        if AgentAPI.client_cache is None:
+            cfg.CONF.import_opt('client_cache_size', 'oasis.agent.config',
+                                group='agent')
+            AgentAPI.client_cache = rpc_service.ClientCache(
+                cfg.CONF.agent.client_cache_size)
         super(AgentAPI, self).__init__(transport,
                                   topic=cfg.CONF.agent.topic)
 
@@ -25,6 +25,12 @@ AGENT_SERVICE_OPTS = [
                default=4,
                help=('RPC timeout for the conductor liveness check that is '
                      'used for bay locking.')),
+    cfg.IntOpt('client_cache_size',
+               default=1024,
+               min=1,
+               help=('Maximum number of per-nodepool RPC clients kept by '
+                     'each API worker. The least recently used client is '
+                     'dropped when the limit is reached.')),
 ]
 
 opt_group = cfg.OptGroup(
@@ -20,6 +20,7 @@ from oasis.api import config as api_config
 from oasis.api import middleware
 from oasis.common import config as common_config
 from oasis.i18n import _
+from oasis.i18n import _LW
 
 # Register options for the service
 API_SERVICE_OPTS = [
@@ -36,7 +37,228 @@ API_SERVICE_OPTS = [
     cfg.StrOpt('api_paste_config',
                default="api-paste.ini",
                help="Configuration file for WSGI definition of API."
-               )
+               ),
+    cfg.IntOpt('workers',
+               min=1,
+               help='Number of worker processes for the Oasis API service. '
+                    'The default is equal to the number of CPUs available.'),
+    cfg.IntOpt('max_green_threads',
+               default=100,
+               min=1,
+               help='Maximum number of green threads serving requests '
+                    'concurrently inside each API worker process.'),
+    cfg.BoolOpt('keep_alive',
+                default=True,
+                help='If False, closes the client socket connection '
+                     'explicitly after each response.'),
+    cfg.IntOpt('client_socket_timeout',
+               default=900,
+               min=0,
+               help='Timeout in seconds for idle client connections. '
+                    'A value of 0 means wait forever.'),
+    cfg.BoolOpt('async_function_deploy',
+                default=False,
+                help='If True, function create, update and delete requests '
+                     'return 202 Accepted with a deployment job right away '
+                     'and the conductor runs them on the nodepool agents. '
+                     'The job can be polled under /v1/jobs.'),
+    cfg.StrOpt('pagination_secret',
+               secret=True,
+               help='Key used to sign the pagination markers of collection '
+                    'next links. It must be the same on every API host. If '
+                    'unset, a random key is generated and kept in '
+                    '$state_path/pagination_secret, which is only valid on '
+                    'the host it was generated on.'),
+    cfg.BoolOpt('stream_collections',
+                default=False,
+                help='If True, collection resources are serialized one item '
+                     'at a time while they are read from a server-side '
+                     'database cursor, instead of being built in memory '
+                     'first.'),
+    cfg.IntOpt('stream_batch_size',
+               default=100,
+               min=1,
+               help='Number of rows fetched from the database at a time '
+                    'when streaming collections.'),
+    cfg.BoolOpt('fast_serializers',
+                default=True,
+                help='If True, the resources returned by GET requests are '
+                     'serialized by serializers compiled from the API '
+                     'types when the service starts, instead of by wsme.'),
+    cfg.BoolOpt('db_session_per_request',
+                default=False,
+                help='If True, the database queries of a request share one '
+                     'session and connection, and its writes are committed '
+                     'in one transaction at the end of the request. The '
+                     'writes made so far are committed, and the connection '
+                     'returned to the pool, before each RPC call or cast. '
+                     'If False, each database call uses a session of its '
+                     'own.'),
+    cfg.BoolOpt('rate_limit_enabled',
+                default=False,
+                help='If True, requests are admitted by per-project rate '
+                     'limits and answered with 429 Too Many Requests when '
+                     'a limit is exceeded.'),
+    cfg.StrOpt('rate_limit_backend',
+               default='memory',
+               help='Storage of the rate limit state, loaded from the '
+                    'oasis.api.rate_limit_backend entry point namespace. '
+                    'The memory backend enforces the limits per API '
+                    'worker; the memcached backend enforces them across '
+                    'all the workers and hosts sharing '
+                    'rate_limit_memcached_servers.'),
+    cfg.ListOpt('rate_limit_memcached_servers',
+                default=['127.0.0.1:11211'],
+                help='host:port of the memcached servers of the memcached '
+                     'rate limit backend.'),
+    cfg.FloatOpt('rate_limit_memcached_timeout',
+                 default=0.5,
+                 min=0,
+                 help='Timeout in seconds of the requests to the memcached '
+                      'servers of the rate limit backend.'),
+    cfg.FloatOpt('rate_limit_read_rate',
+                 default=20.0,
+                 min=0,
+                 help='Read requests admitted per second and project. '
+                      'A value of 0 disables the limit.'),
+    cfg.IntOpt('rate_limit_read_burst',
+               default=100,
+               min=1,
+               help='Read requests a project may burst above its rate.'),
+    cfg.FloatOpt('rate_limit_write_rate',
+                 default=5.0,
+                 min=0,
+                 help='Write requests admitted per second and project. '
+                      'A value of 0 disables the limit.'),
+    cfg.IntOpt('rate_limit_write_burst',
+               default=20,
+               min=1,
+               help='Write requests a project may burst above its rate.'),
+    cfg.FloatOpt('rate_limit_expensive_rate',
+                 default=0.5,
+                 min=0,
+                 help='Expensive requests admitted per second and project. '
+                      'A value of 0 disables the limit.'),
+    cfg.IntOpt('rate_limit_expensive_burst',
+               default=5,
+               min=1,
+               help='Expensive requests a project may burst above its '
+                    'rate.'),
+    cfg.ListOpt('rate_limit_expensive_paths',
+                default=['/v1/functions', '/v1/nodepools'],
+                help='Paths, and the paths below them, whose write '
+                     'requests are expensive: they call out to the '
+                     'conductor, the nodepool agents or Heat.'),
+    cfg.IntOpt('rate_limit_max_inflight',
+               default=4,
+               min=0,
+               help='Expensive requests a project may have in progress at '
+                    'the same time. A value of 0 disables the cap.'),
+    cfg.BoolOpt('server_timing',
+                default=False,
+                help='If True, responses carry a Server-Timing header with '
+                     'the time spent in token validation, database '
+                     'queries, RPC calls, object hydration and the rest '
+                     'of the request.'),
+    cfg.StrOpt('profile_dir',
+               help='Directory where the cProfile stats of requests '
+                    'carrying the X-Oasis-Profile header are written. '
+                    'Profiling is disabled when unset. Since API workers '
+                    'serve requests on green threads, a profile may '
+                    'include the work of concurrent requests.'),
+    cfg.BoolOpt('token_cache_enabled',
+                default=False,
+                help='If True, the tokens validated by keystonemiddleware, '
+                     'and those keystone rejected, are kept in the token '
+                     'cache of token_cache_backend instead of the cache of '
+                     'keystonemiddleware. Revocations are still checked '
+                     'as configured in [keystone_authtoken].'),
+    cfg.StrOpt('token_cache_backend',
+               default='memory',
+               help='Storage of the token cache, loaded from the '
+                    'oasis.api.token_cache_backend entry point namespace: '
+                    '"memory" for a cache per API worker, or "memcached" '
+                    'for one shared through token_cache_memcached_servers.'),
+    cfg.IntOpt('token_cache_ttl',
+               default=300,
+               min=0,
+               help='Seconds a validated token is cached for, at most. '
+                    'Tokens are never cached past their expiry.'),
+    cfg.IntOpt('token_cache_negative_ttl',
+               default=10,
+               min=0,
+               help='Seconds a token keystone rejected is remembered for. '
+                    'A value of 0 disables the negative cache.'),
+    cfg.IntOpt('token_cache_size',
+               default=10000,
+               min=1,
+               help='Maximum number of tokens in the memory token cache.'),
+    cfg.ListOpt('token_cache_memcached_servers',
+                default=['127.0.0.1:11211'],
+                help='host:port of the memcached servers of the memcached '
+                     'token cache.'),
+    cfg.FloatOpt('token_cache_memcached_timeout',
+                 default=0.5,
+                 min=0,
+                 help='Timeout in seconds of the requests to the memcached '
+                      'servers of the token cache.'),
+    cfg.StrOpt('token_cache_secret_key',
+               secret=True,
+               help='Key the entries of the memcached token cache are '
+                    'authenticated with, shared by all the API hosts. '
+                    'Required by the memcached backend; entries which do '
+                    'not carry a valid MAC are ignored.'),
+    cfg.IntOpt('name_cache_ttl',
+               default=60,
+               min=0,
+               help='Seconds for which the id of a resource looked up by '
+                    'name is cached. A value of 0 disables the cache.'),
+    cfg.IntOpt('name_cache_size',
+               default=4096,
+               min=1,
+               help='Maximum number of resource names cached by each API '
+                    'worker.'),
+    cfg.IntOpt('max_batch_ids',
+               default=100,
+               min=1,
+               help='The maximum number of ids a batch GET of a collection '
+                    'resource may request.'),
+    cfg.IntOpt('max_bulk_items',
+               default=100,
+               min=1,
+               help='The maximum number of resources a bulk create, or an '
+                    'endpoint definition, may create at once.'),
+    cfg.IntOpt('max_expand_depth',
+               default=3,
+               min=1,
+               help='The maximum depth of the related resources the expand '
+                    'parameter of a GET request may embed.'),
+    cfg.BoolOpt('coalesce_gets',
+                default=False,
+                help='If True, identical GET requests in progress at the '
+                     'same time in an API worker, from the same project '
+                     'and with the same roles, are answered with the '
+                     'response of the first one.'),
+    cfg.FloatOpt('coalesce_ttl',
+                 default=0.0,
+                 min=0,
+                 help='Seconds a successful response to a coalesced GET '
+                      'request is reused for after it completed. A value '
+                      'of 0 only shares responses in progress.'),
+    cfg.IntOpt('coalesce_cache_size',
+               default=1000,
+               min=1,
+               help='Maximum number of completed responses kept for '
+                    'coalesce_ttl by each API worker.'),
+    cfg.PortOpt('metrics_port',
+                help='First port on which the API workers serve their '
+                     'metrics in the Prometheus text format at any path, '
+                     'without authentication. Each worker listens on the '
+                     'first free one of as many ports as there are '
+                     'workers. The metrics are not served when unset.'),
+    cfg.IPOpt('metrics_host',
+              default='127.0.0.1',
+              help='The listen IP of the API metrics servers.'),
 ]
 
 CONF = cfg.CONF
@@ -60,6 +282,13 @@ def setup_app(config=None):
     app_conf = dict(config.app)
     common_config.set_config_defaults()
 
+    if not CONF.api.pagination_secret:
+        LOG.warning(_LW('[api]pagination_secret is not set; pagination '
+                        'markers are signed with a key generated in '
+                        '$state_path/pagination_secret, which other API '
+                        'hosts do not accept. Set the same secret on '
+                        'every API host.'))
+
     app = pecan.make_app(
         app_conf.pop('root'),
         logging=getattr(config, 'logging', {}),
@@ -17,8 +17,15 @@ app = {
     'root': 'oasis.api.controllers.root.RootController',
     'modules': ['oasis.api'],
     'debug': True,
+    # NOTE: 'after' hooks run in reverse order. StreamingHook has to come
+    # first so that it runs last, after the hooks which read the body.
     'hooks': [
+        hooks.StreamingHook(),
+        hooks.MetricsHook(),
         hooks.ContextHook(),
+        hooks.TimingHook(),
+        hooks.DBSessionHook(),
+        hooks.RateLimitHook(),
         hooks.RPCHook(),
         hooks.NoExceptionTracebackHook(),
     ],
@@ -28,6 +28,7 @@ from oasis.api.controllers import base as controllers_base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import endpoint
 from oasis.api.controllers.v1 import function
+from oasis.api.controllers.v1 import job
 from oasis.api.controllers.v1 import nodepool
 from oasis.api.controllers.v1 import nodepool_policy
 from oasis.api.controllers.v1 import httpapi
@@ -102,6 +103,9 @@ class V1(controllers_base.APIBase):
     nodepool_policies = [link.Link]
     """Links to the nodepool_policies resource"""
 
+    jobs = [link.Link]
+    """Links to the jobs resource"""
+
     @staticmethod
     def convert():
         v1 = V1()
@@ -151,6 +155,10 @@ class V1(controllers_base.APIBase):
                                                     'nodepool_policies', ''),
                                 link.Link.make_link('bookmark', pecan.request.host_url,
                                                     'nodepool_policies', '', bookmark=True)]
+
+        v1.jobs = [link.Link.make_link('self', pecan.request.host_url, 'jobs', ''),
+                   link.Link.make_link('bookmark', pecan.request.host_url,
+                                       'jobs', '', bookmark=True)]
         return v1
 
 
@@ -159,6 +167,7 @@ class Controller(rest.RestController):
 
     endpoints = endpoint.EndpointsController()
     functions = function.FunctionsController()
+    jobs = job.JobsController()
     nodepools = nodepool.NodePoolsController()
     nodepool_policies = nodepool_policy.NodePoolPoliciesController()
     httpapis = httpapi.HttpApisController()
@@ -13,11 +13,43 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 import pecan
+import six
+from wsme.rest import json as wsme_json
 from wsme import types as wtypes
 
 from oasis.api.controllers import base
 from oasis.api.controllers import link
+from oasis.api.controllers.v1 import serializers
+from oasis.api import utils as api_utils
+
+
+def _next_link(host_url, resource_url, limit, marker, **kwargs):
+    for key, value in list(kwargs.items()):
+        if value is None:
+            del kwargs[key]
+        elif isinstance(value, (list, tuple)):
+            kwargs[key] = ','.join(value)
+    q_args = ''.join(['%s=%s&' % (key, kwargs[key]) for key in kwargs])
+    next_args = '?%(args)slimit=%(limit)d&marker=%(marker)s' % {
+        'args': q_args, 'limit': limit, 'marker': marker}
+
+    return link.Link.make_link('next', host_url,
+                               resource_url, next_args).href
+
+
+def _encode_marker(rpc_item, sort_key=None, sort_dir=None, **kwargs):
+    return api_utils.encode_marker(rpc_item,
+                                   api_utils.get_sort_keys(sort_key),
+                                   sort_dir)
+
+
+def _encode(chunk):
+    if isinstance(chunk, six.text_type):
+        return chunk.encode('utf-8')
+    return chunk
 
 
 class Collection(base.APIBase):
@@ -25,6 +57,9 @@ class Collection(base.APIBase):
     next = wtypes.text
     """A link to retrieve the next subset of the collection"""
 
+    not_found = [wtypes.text]
+    """The requested ids which were not found, for a batch GET"""
+
     @property
     def collection(self):
         return getattr(self, self._type)
@@ -33,16 +68,118 @@ class Collection(base.APIBase):
         """Return whether collection has more items."""
         return len(self.collection) and len(self.collection) == limit
 
-    def get_next(self, limit, url=None, **kwargs):
-        """Return a link to the next subset of the collection."""
+    def get_next(self, limit, url=None, rpc_items=None, **kwargs):
+        """Return a link to the next subset of the collection.
+
+        :param rpc_items: the objects the collection was built from. When
+                          given, the link carries an opaque marker made
+                          from the sort key values of the last one, instead
+                          of its id.
+        """
         if not self.has_next(limit):
             return wtypes.Unset
 
         resource_url = url or self._type
-        q_args = ''.join(['%s=%s&' % (key, kwargs[key]) for key in kwargs])
-        next_args = '?%(args)slimit=%(limit)d&marker=%(marker)s' % {
-            'args': q_args, 'limit': limit,
-            'marker': self.collection[-1].id}
+        if rpc_items:
+            marker = _encode_marker(rpc_items[-1], **kwargs)
+        else:
+            marker = self.collection[-1].id
+        return _next_link(pecan.request.host_url, resource_url, limit,
+                          marker, **kwargs)
+
+    @classmethod
+    def respond_with_links(cls, item_cls, rpc_items, limit, url=None,
+                           expand=False, fields=None, not_found=None,
+                           **kwargs):
+        """Return the collection, serialized by the item type's serializer.
+
+        Falls back to convert_with_links() when the serializers are
+        disabled.
+
+        :param item_cls: the API type of the items, e.g. Function.
+        :param rpc_items: the objects of the collection.
+        :param not_found: the requested ids which were not found, for a
+                          batch GET.
+        """
+        serializer = serializers.get(item_cls)
+        if serializer is None:
+            collection = cls.convert_with_links(rpc_items, limit, url=url,
+                                                expand=expand, fields=fields,
+                                                **kwargs)
+            if not_found is not None:
+                collection.not_found = not_found
+            return collection
+
+        collection = cls()
+        host_url = pecan.request.host_url
+        body = {collection._type: [
+            serializer.serialize(rpc_item, host_url, expand, fields)
+            for rpc_item in rpc_items]}
+        if rpc_items and len(rpc_items) == limit:
+            marker = _encode_marker(rpc_items[-1], **kwargs)
+            body['next'] = _next_link(host_url, url or collection._type,
+                                      limit, marker, fields=fields,
+                                      **kwargs)
+        if not_found is not None:
+            body['not_found'] = not_found
+        serializers.set_body(body)
+        return collection
+
+    @classmethod
+    def stream_with_links(cls, item_cls, rpc_items, limit, url=None,
+                          expand=False, fields=None, **kwargs):
+        """Serialize the collection lazily while the response is sent.
+
+        The items are converted and written one at a time, so the whole
+        collection is never held in memory. The JSON body is attached to
+        the request for StreamingHook, and an empty collection is returned
+        to wsme in its place.
+
+        :param item_cls: the API type of the items, e.g. Function.
+        :param rpc_items: an iterator of objects, usually backed by a
+                          server-side database cursor.
+        """
+        collection = cls()
+        pecan.request.stream_body = cls._iter_json(
+            collection._type, item_cls, rpc_items, limit,
+            pecan.request.host_url, url or collection._type,
+            expand, fields, serializers.get(item_cls), **kwargs)
+        return collection
+
+    @staticmethod
+    def _iter_json(collection_type, item_cls, rpc_items, limit, host_url,
+                   resource_url, expand, fields, serializer, **kwargs):
+        # NOTE: this runs after the controller has returned, when
+        # pecan.request is gone, so everything it needs is passed in.
+        yield _encode('{"%s": [' % collection_type)
+
+        count = 0
+        last_item = None
+        try:
+            for rpc_item in rpc_items:
+                if serializer is not None:
+                    item = serializer.serialize(rpc_item, host_url, expand,
+                                                fields)
+                else:
+                    item = wsme_json.tojson(
+                        item_cls, item_cls._convert_with_links(
+                            item_cls(**rpc_item.as_dict()), host_url,
+                            expand, fields))
+                if count:
+                    yield b', '
+                yield _encode(json.dumps(item))
+                count += 1
+                last_item = rpc_item
+        finally:
+            # NOTE: the items are read through a database session of their
+            # own, which is closed here, also when the client went away.
+            if hasattr(rpc_items, 'close'):
+                rpc_items.close()
 
-        return link.Link.make_link('next', pecan.request.host_url,
-                                   resource_url, next_args).href
+        yield b']'
+        if count and count == limit:
+            marker = _encode_marker(last_item, **kwargs)
+            next_href = _next_link(host_url, resource_url, limit, marker,
+                                   fields=fields, **kwargs)
+            yield _encode(', "next": %s' % json.dumps(next_href))
+        yield b'}'
@@ -0,0 +1,192 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""API representation of an endpoint with all of its http apis.
+
+A definition nests the http apis of an endpoint, and below each of them
+its request with the request headers and its response with the status
+codes and their error messages. The ids of every resource of a
+definition are generated by the server.
+"""
+
+from oslo_config import cfg
+import wsme
+from wsme import types as wtypes
+
+from oasis.api.controllers import base
+from oasis.api.controllers.v1 import types
+from oasis.i18n import _
+
+CONF = cfg.CONF
+
+
+class _Definition(base.APIBase):
+    """Base class of the resources of a definition."""
+
+    # The attributes of the resource itself.
+    _attrs = ('id', 'created_at')
+
+    # The (attribute, nested definition type, is a list) of the resources
+    # below this one.
+    _children = ()
+
+    id = wsme.wsattr(types.uuid, readonly=True)
+    """Unique UUID of the resource, generated by the server"""
+
+    def to_dict(self):
+        """Return the definition as nested dicts and lists."""
+        values = dict((attr, getattr(self, attr)) for attr in self._attrs
+                      if getattr(self, attr) not in (None, wsme.Unset))
+        for attr, child_cls, many in self._children:
+            child = getattr(self, attr)
+            if child in (None, wsme.Unset):
+                continue
+            if many:
+                values[attr] = [item.to_dict() for item in child]
+            else:
+                values[attr] = child.to_dict()
+        return values
+
+    @classmethod
+    def from_dict(cls, values):
+        definition = cls()
+        for attr in cls._attrs:
+            if values.get(attr) is not None:
+                setattr(definition, attr, values[attr])
+        for attr, child_cls, many in cls._children:
+            child = values.get(attr)
+            if child is None:
+                continue
+            if many:
+                setattr(definition, attr,
+                        [child_cls.from_dict(item) for item in child])
+            else:
+                setattr(definition, attr, child_cls.from_dict(child))
+        return definition
+
+
+class RequestHeaderDefinition(_Definition):
+    """A header of the request of an http api."""
+
+    _attrs = _Definition._attrs + ('name', 'value')
+
+    name = wtypes.StringType(min_length=1, max_length=255)
+    """Name of the header"""
+
+    value = wtypes.StringType(min_length=1, max_length=255)
+    """Value of the header"""
+
+
+class RequestDefinition(_Definition):
+    """The request of an http api."""
+
+    _children = (('headers', RequestHeaderDefinition, True),)
+
+    headers = [RequestHeaderDefinition]
+    """The headers of the request"""
+
+
+class ResponseMessageDefinition(_Definition):
+    """An error message of a response status code."""
+
+    _attrs = _Definition._attrs + ('message',)
+
+    message = wtypes.StringType(min_length=1, max_length=255)
+    """The error message"""
+
+
+class ResponseCodeDefinition(_Definition):
+    """A status code of the response of an http api."""
+
+    _attrs = _Definition._attrs + ('status_code',)
+    _children = (('messages', ResponseMessageDefinition, True),)
+
+    status_code = wtypes.StringType(min_length=1, max_length=3)
+    """The HTTP status code"""
+
+    messages = [ResponseMessageDefinition]
+    """The error messages of the status code"""
+
+
+class ResponseDefinition(_Definition):
+    """The response of an http api."""
+
+    _children = (('status_codes', ResponseCodeDefinition, True),)
+
+    status_codes = [ResponseCodeDefinition]
+    """The status codes of the response"""
+
+
+class HttpApiDefinition(_Definition):
+    """An http api of an endpoint, with its request and response."""
+
+    _attrs = _Definition._attrs + ('method',)
+    _children = (('request', RequestDefinition, False),
+                 ('response', ResponseDefinition, False))
+
+    method = wtypes.StringType(min_length=1, max_length=10)
+    """HTTP method of the api"""
+
+    request = RequestDefinition
+    """The request of the api"""
+
+    response = ResponseDefinition
+    """The response of the api"""
+
+
+class EndpointDefinition(_Definition):
+    """An endpoint with all of its http apis."""
+
+    _attrs = _Definition._attrs + ('name', 'desc', 'url', 'project_id',
+                                   'user_id')
+    _children = (('http_apis', HttpApiDefinition, True),)
+
+    name = wtypes.StringType(min_length=1, max_length=255)
+    """Name of this endpoint"""
+
+    desc = wtypes.StringType(min_length=1, max_length=255)
+    """Description of this endpoint"""
+
+    url = wtypes.StringType(min_length=1, max_length=255)
+    """Url of this endpoint"""
+
+    project_id = wsme.wsattr(wtypes.text, readonly=True)
+    """The project owning the endpoint"""
+
+    user_id = wsme.wsattr(wtypes.text, readonly=True)
+    """The user who created the endpoint"""
+
+    http_apis = [HttpApiDefinition]
+    """The http apis of the endpoint"""
+
+
+def count_resources(values):
+    """Return the number of resources in a definition given as dicts."""
+    count = 1
+    for value in values.values():
+        if isinstance(value, dict):
+            count += count_resources(value)
+        elif isinstance(value, list):
+            count += sum(count_resources(item) for item in value)
+    return count
+
+
+def validate(values):
+    """Check that a definition is small enough to be created at once.
+
+    :param values: the definition, as returned by to_dict().
+    :raises: ClientSideError if the definition has too many resources.
+    """
+    if count_resources(values) > CONF.api.max_bulk_items:
+        raise wsme.exc.ClientSideError(
+            _("At most %d resources can be created at once.") %
+            CONF.api.max_bulk_items)
@@ -7,6 +7,10 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import definition
+from oasis.api.controllers.v1 import httpapi as httpapi_api
+from oasis.api.controllers.v1 import relations
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +32,9 @@ class EndpointPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'name', 'url', 'desc', 'created_at')
+
+
 class Endpoint(base.APIBase):
     """API representation of a endpoint.
 
@@ -53,6 +60,9 @@ class Endpoint(base.APIBase):
     user_id = wsme.wsattr(wtypes.text, readonly=True)
     """Stack id of the heat stack"""
 
+    httpapis = wsme.wsattr([httpapi_api.HttpApi], readonly=True)
+    """The http apis of the endpoint, when expanded"""
+
     def __init__(self, **kwargs):
         super(Endpoint, self).__init__()
 
@@ -65,9 +75,9 @@ class Endpoint(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(endpoint, url, expand=True):
+    def _convert_with_links(endpoint, url, expand=True, fields=None):
         if not expand:
-            endpoint.unset_fields_except(['id', 'name', 'url', 'desc', 'created_at'])
+            endpoint.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             endpoint.links = [link.Link.make_link('self', url,
                                          'endpoints', endpoint.id),
@@ -77,9 +87,19 @@ class Endpoint(base.APIBase):
         return endpoint
 
     @classmethod
-    def convert_with_links(cls, rpc_endpoint, expand=True):
+    def convert_with_links(cls, rpc_endpoint, expand=True, fields=None):
         endpoint = Endpoint(**rpc_endpoint.as_dict())
-        return cls._convert_with_links(endpoint, pecan.request.host_url, expand)
+        return cls._convert_with_links(endpoint, pecan.request.host_url,
+                                       expand, fields)
+
+
+relations.register('Endpoint', 'httpapis', relations.Relation(
+    httpapi_api.HttpApi, objects.HttpApi, 'id', key='endpoint_id',
+    many=True))
+
+
+serializers.register(Endpoint, objects.Endpoint, 'endpoints',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class EndpointCollection(collection.Collection):
@@ -90,12 +110,15 @@ class EndpointCollection(collection.Collection):
         self._type = 'endpoints'
 
     @staticmethod
-    def convert_with_links(rpc_endpoints, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_endpoints, limit, url=None, expand=False,
+                           fields=None, **kwargs):
 
         collection = EndpointCollection()
-        collection.endpoints = [Endpoint.convert_with_links(p, expand)
+        collection.endpoints = [Endpoint.convert_with_links(p, expand, fields)
                                 for p in rpc_endpoints]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_endpoints,
+                                              **kwargs)
         return collection
 
 
@@ -104,40 +127,104 @@ class EndpointsController(rest.RestController):
     def __init__(self):
         super(EndpointsController, self).__init__()
 
+    _custom_actions = {
+        'definitions': ['POST'],
+    }
+
     def _get_endpoints_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None):
+                                  sort_dir, expand=False, resource_url=None,
+                                  fields=None, ids=None, embed=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.Endpoint.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, Endpoint, objects.Endpoint)
+        columns = api_utils.get_columns(
+            objects.Endpoint, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        columns = relations.get_columns('Endpoint', columns, embed)
+        yield_per = api_utils.get_stream_batch_size()
+        if embed:
+            # NOTE: the related resources are loaded for the whole page at
+            # once, so a collection with expanded relations is not streamed.
+            yield_per = None
+
+        if ids:
+            endpoints, not_found = api_utils.get_batch(
+                objects.Endpoint, ids, columns)
+            if not embed:
+                api_utils.set_etag(endpoints)
+                return EndpointCollection.respond_with_links(
+                    Endpoint, endpoints, None, url=resource_url,
+                    expand=expand, fields=fields, not_found=not_found)
+            batch = EndpointCollection.convert_with_links(
+                endpoints, None, url=resource_url, expand=expand,
+                fields=fields)
+            relations.embed('Endpoint', batch.endpoints, endpoints, embed)
+            batch.not_found = not_found
+            return batch
+
+        marker_obj = api_utils.get_marker(objects.Endpoint, marker, sort_keys,
+                                          sort_dir)
+
+        # NOTE: the ETag of a page only covers the endpoints themselves, so
+        # it is not used when related resources are embedded.
+        if api_utils.is_conditional_get() and not embed:
+            page = objects.Endpoint.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         endpoints = objects.Endpoint.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return EndpointCollection.convert_with_links(endpoints, limit,
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return EndpointCollection.stream_with_links(
+                Endpoint, endpoints, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        if not embed:
+            api_utils.set_etag(endpoints)
+            return EndpointCollection.respond_with_links(
+                Endpoint, endpoints, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        page = EndpointCollection.convert_with_links(endpoints, limit,
                                                      url=resource_url,
                                                      expand=expand,
+                                                     fields=fields,
                                                      sort_key=sort_key,
                                                      sort_dir=sort_dir)
+        relations.embed('Endpoint', page.endpoints, endpoints, embed)
+        return page
 
-    @expose.expose(EndpointCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+    @expose.expose(EndpointCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text], wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None, id=None, expand=None):
         """Retrieve a list of endpoints.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
+        :param expand: a comma separated list of the related resources to
+                       embed, e.g. "httpapis.request.headers".
         """
         context = pecan.request.context
-        return self._get_endpoints_collection(marker, limit, sort_key, sort_dir)
+        embed = relations.parse('Endpoint', expand)
+        return self._get_endpoints_collection(marker, limit, sort_key, sort_dir,
+                                              fields=fields, ids=id,
+                                              embed=embed)
 
     @expose.expose(Endpoint, body=Endpoint, status_code=201)
     def post(self, endpoint):
@@ -169,15 +256,50 @@ class EndpointsController(rest.RestController):
         #                                          function.id)
         return Endpoint.convert_with_links(endpoint)
 
-    @expose.expose(Endpoint, types.uuid_or_name)
-    def get_one(self, endpoint_ident):
+    @expose.expose(definition.EndpointDefinition,
+                   body=definition.EndpointDefinition, status_code=201)
+    def definitions(self, endpoint_definition):
+        """Create an endpoint and all of its http apis in one transaction.
+
+        :param endpoint_definition: the endpoint within the request body,
+                                    with its http apis nested in it.
+        :returns: the created definition, with the generated ids.
+        """
+        context = pecan.request.context
+        values = endpoint_definition.to_dict()
+        definition.validate(values)
+
+        values['project_id'] = context.project_id
+        values['user_id'] = context.user_id
+
+        created = objects.Endpoint.create_definition(context, values)
+        return definition.EndpointDefinition.from_dict(created)
+
+    @expose.expose(Endpoint, types.uuid_or_name, wtypes.text)
+    def get_one(self, endpoint_ident, expand=None):
         """Retrieve information about the given function.
 
         :param function_ident: UUID of a function or logical name of the function.
+        :param expand: a comma separated list of the related resources to
+                       embed, e.g. "httpapis.request.headers".
         """
         context = pecan.request.context
+        embed = relations.parse('Endpoint', expand)
+
+        if not embed:
+            not_modified = api_utils.check_resource_not_modified(
+                objects.Endpoint, endpoint_ident)
+            if not_modified:
+                return not_modified
+
         endpoint = api_utils.get_resource('Endpoint', endpoint_ident)
-        return Endpoint.convert_with_links(endpoint)
+        if not embed:
+            api_utils.set_etag([endpoint])
+            return serializers.respond(Endpoint, endpoint)
+
+        result = Endpoint.convert_with_links(endpoint)
+        relations.embed('Endpoint', [result], [endpoint], embed)
+        return result
 
     @expose.expose(None, types.uuid_or_name, status_code=204)
     def delete(self, endpoint_ident):
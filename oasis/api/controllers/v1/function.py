@@ -12,27 +12,39 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+from oslo_utils import excutils
 from oslo_utils import timeutils
 import pecan
 from pecan import rest
+import six
 import wsme
 from wsme import types as wtypes
 
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import endpoint as endpoint_api
+from oasis.api.controllers.v1 import httpapi as httpapi_api
+from oasis.api.controllers.v1 import job as job_api
+from oasis.api.controllers.v1 import nodepool as nodepool_api
+from oasis.api.controllers.v1 import relations
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
 # from oasis.api.validation import validate_function_properties
 from oasis.common import exception
 from oasis.common import policy
+from oasis.db import api as db_api
 from oasis import objects
 from oasis.objects import fields
 
 from oslo_log import log as logging
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
 
 class FunctionPatchType(types.JsonPatchType):
 
@@ -46,6 +58,11 @@ class FunctionPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'name', 'status', 'status_reason', 'desc',
+                          'nodepool_id', 'endpoint_id', 'stack_id',
+                          'created_at')
+
+
 class Function(base.APIBase):
     """API representation of a function.
 
@@ -84,6 +101,15 @@ class Function(base.APIBase):
     body = wtypes.text
     """Url used for function node discovery"""
 
+    endpoint = wsme.wsattr(endpoint_api.Endpoint, readonly=True)
+    """The endpoint of the function, when expanded"""
+
+    nodepool = wsme.wsattr(nodepool_api.NodePool, readonly=True)
+    """The nodepool of the function, when expanded"""
+
+    httpapis = wsme.wsattr([httpapi_api.HttpApi], readonly=True)
+    """The http apis of the endpoint of the function, when expanded"""
+
     def __init__(self, **kwargs):
         super(Function, self).__init__()
 
@@ -96,12 +122,9 @@ class Function(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(function, url, expand=True):
+    def _convert_with_links(function, url, expand=True, fields=None):
         if not expand:
-            function.unset_fields_except(['id', 'name',
-                                     'status', 'status_reason', 'desc',
-                                     'nodepool_id', 'endpoint_id',
-                                     'body', 'stack_id', 'created_at'])
+            function.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             function.links = [link.Link.make_link('self', url,
                                          'functions', function.id),
@@ -111,9 +134,10 @@ class Function(base.APIBase):
         return function
 
     @classmethod
-    def convert_with_links(cls, rpc_function, expand=True):
+    def convert_with_links(cls, rpc_function, expand=True, fields=None):
         function = Function(**rpc_function.as_dict())
-        return cls._convert_with_links(function, pecan.request.host_url, expand)
+        return cls._convert_with_links(function, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -134,6 +158,19 @@ class Function(base.APIBase):
         return cls._convert_with_links(sample, 'http://localhost:9417', expand)
 
 
+relations.register('Function', 'endpoint', relations.Relation(
+    endpoint_api.Endpoint, objects.Endpoint, 'endpoint_id'))
+relations.register('Function', 'nodepool', relations.Relation(
+    nodepool_api.NodePool, objects.NodePool, 'nodepool_id'))
+relations.register('Function', 'httpapis', relations.Relation(
+    httpapi_api.HttpApi, objects.HttpApi, 'endpoint_id', key='endpoint_id',
+    many=True, owner=objects.Endpoint))
+
+
+serializers.register(Function, objects.Function, 'functions',
+                     _DEFAULT_RETURN_FIELDS)
+
+
 class FunctionCollection(collection.Collection):
     """API representation of a collection of functions."""
 
@@ -144,11 +181,14 @@ class FunctionCollection(collection.Collection):
         self._type = 'functions'
 
     @staticmethod
-    def convert_with_links(rpc_functions, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_functions, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = FunctionCollection()
-        collection.functions = [Function.convert_with_links(p, expand)
+        collection.functions = [Function.convert_with_links(p, expand, fields)
                            for p in rpc_functions]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_functions,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -167,53 +207,156 @@ class FunctionsController(rest.RestController):
         'detail': ['GET'],
     }
 
+    def _deploy_async(self, function, action, rpc_method, *args):
+        """Cast a function operation to the conductor as a deployment job.
+
+        :param function: the function being deployed.
+        :param action: the JobAction recorded on the job.
+        :param rpc_method: the conductor API method casting the operation;
+                           it receives the job id followed by args.
+        :returns: a 202 response carrying the new job.
+        """
+        context = pecan.request.context
+        job = objects.Job(context,
+                          project_id=context.project_id,
+                          user_id=context.user_id,
+                          function_id=function.id,
+                          nodepool_id=function.nodepool_id,
+                          action=action,
+                          status=fields.JobStatus.PENDING,
+                          results=[],
+                          # NOTE: the conductor runs the operation on one
+                          # agent of the nodepool.
+                          expected_reports=1)
+        job.create()
+
+        # NOTE: the job is committed before the cast, and a failed cast
+        # must leave it failed.
+        try:
+            rpc_method(job.id, *args)
+        except Exception as e:
+            with excutils.save_and_reraise_exception():
+                job.status = fields.JobStatus.FAILED
+                job.status_reason = six.text_type(e)
+                job.save()
+                db_api.get_instance().commit_unit_of_work()
+
+        pecan.response.location = link.build_url('jobs', job.id)
+        return wsme.api.Response(job_api.Job.convert_with_links(job),
+                                 status_code=202,
+                                 return_type=job_api.Job)
+
     def _get_functions_collection(self, marker, limit,
                                   sort_key, sort_dir, expand=False,
-                                  resource_url=None):
+                                  resource_url=None,
+                                  fields=None, ids=None, embed=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.Function.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, Function, objects.Function)
+        columns = api_utils.get_columns(
+            objects.Function, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        columns = relations.get_columns('Function', columns, embed)
+        yield_per = api_utils.get_stream_batch_size()
+        if embed:
+            # NOTE: the related resources are loaded for the whole page at
+            # once, so a collection with expanded relations is not streamed.
+            yield_per = None
+
+        if ids:
+            functions, not_found = api_utils.get_batch(
+                objects.Function, ids, columns)
+            if not embed:
+                api_utils.set_etag(functions)
+                return FunctionCollection.respond_with_links(
+                    Function, functions, None, url=resource_url,
+                    expand=expand, fields=fields, not_found=not_found)
+            batch = FunctionCollection.convert_with_links(
+                functions, None, url=resource_url, expand=expand,
+                fields=fields)
+            relations.embed('Function', batch.functions, functions, embed)
+            batch.not_found = not_found
+            return batch
+
+        marker_obj = api_utils.get_marker(objects.Function, marker, sort_keys,
+                                          sort_dir)
+
+        # NOTE: the ETag of a page only covers the functions themselves, so
+        # it is not used when related resources are embedded.
+        if api_utils.is_conditional_get() and not embed:
+            page = objects.Function.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         functions = objects.Function.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return FunctionCollection.convert_with_links(functions, limit,
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return FunctionCollection.stream_with_links(
+                Function, functions, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        if not embed:
+            api_utils.set_etag(functions)
+            return FunctionCollection.respond_with_links(
+                Function, functions, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        page = FunctionCollection.convert_with_links(functions, limit,
                                                      url=resource_url,
                                                      expand=expand,
+                                                     fields=fields,
                                                      sort_key=sort_key,
                                                      sort_dir=sort_dir)
+        relations.embed('Function', page.functions, functions, embed)
+        return page
 
-    @expose.expose(FunctionCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+    @expose.expose(FunctionCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text], wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None, id=None, expand=None):
         """Retrieve a list of functions.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
+        :param expand: a comma separated list of the related resources to
+                       embed, e.g. "endpoint,nodepool,httpapis".
         """
         context = pecan.request.context
+        embed = relations.parse('Function', expand)
         return self._get_functions_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir,
+                                         fields=fields, ids=id, embed=embed)
 
-    @expose.expose(FunctionCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+    @expose.expose(FunctionCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text], wtypes.text)
     def detail(self, marker=None, limit=None, sort_key='id',
-               sort_dir='asc'):
+               sort_dir='asc', fields=None, id=None, expand=None):
         """Retrieve a list of functions with detail.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
+        :param expand: a comma separated list of the related resources to
+                       embed, e.g. "endpoint,nodepool,httpapis".
         """
         context = pecan.request.context
 
@@ -222,23 +365,38 @@ class FunctionsController(rest.RestController):
         if parent != "functions":
             raise exception.HTTPNotFound
 
-        expand = True
+        embed = relations.parse('Function', expand)
         resource_url = '/'.join(['functions', 'detail'])
         return self._get_functions_collection(marker, limit,
-                                         sort_key, sort_dir, expand,
-                                         resource_url)
+                                         sort_key, sort_dir, True,
+                                         resource_url, fields=fields, ids=id,
+                                         embed=embed)
 
-    @expose.expose(Function, types.uuid_or_name)
-    def get_one(self, function_ident):
+    @expose.expose(Function, types.uuid_or_name, wtypes.text)
+    def get_one(self, function_ident, expand=None):
         """Retrieve information about the given function.
 
         :param function_ident: UUID of a function or logical name of the function.
+        :param expand: a comma separated list of the related resources to
+                       embed, e.g. "endpoint,nodepool,httpapis".
         """
         context = pecan.request.context
+        embed = relations.parse('Function', expand)
+
+        if not embed:
+            not_modified = api_utils.check_resource_not_modified(
+                objects.Function, function_ident)
+            if not_modified:
+                return not_modified
 
         function = api_utils.get_resource('Function', function_ident)
+        if not embed:
+            api_utils.set_etag([function])
+            return serializers.respond(Function, function)
 
-        return Function.convert_with_links(function)
+        result = Function.convert_with_links(function)
+        relations.embed('Function', [result], [function], embed)
+        return result
 
     @expose.expose(Function, body=Function, status_code=201)
     def post(self, function):
@@ -292,6 +450,13 @@ class FunctionsController(rest.RestController):
         else:
             endpoint_url = '/%s' % endpoint.url
 
+        if CONF.api.async_function_deploy:
+            return self._deploy_async(
+                function, fields.JobAction.CREATE,
+                pecan.request.conductor_rpcapi.function_create_async,
+                function_dict['nodepool_id'], function.id, endpoint_url,
+                function_dict['body'], httpapi_methods)
+
         # have to add function_id, rule, httpapi header(methods)
         pecan.request.agent_rpcapi.function_create(function_dict['nodepool_id'], function.id, endpoint_url, function_dict['body'], httpapi_methods)
         #test: pecan.request.agent_rpcapi.function_create("1234", "1111222", "/ddd", function_dict['body'], ["GET", ])
@@ -362,6 +527,13 @@ class FunctionsController(rest.RestController):
         else:
             endpoint_url = '/%s' % endpoint.url
 
+        if CONF.api.async_function_deploy:
+            return self._deploy_async(
+                function, fields.JobAction.UPDATE,
+                pecan.request.conductor_rpcapi.function_update_async,
+                function.nodepool_id, function.id, endpoint_url,
+                function.body, httpapi_methods)
+
         pecan.request.agent_rpcapi.function_create(function.nodepool_id, function.id, endpoint.url, function.body, httpapi_methods)
 
         return Function.convert_with_links(function)
@@ -374,6 +546,15 @@ class FunctionsController(rest.RestController):
         """
         context = pecan.request.context
         function = api_utils.get_resource('Function', function_ident)
+
+        if CONF.api.async_function_deploy:
+            # NOTE: the function is destroyed by the conductor once the
+            # job completes, so a failed delete leaves it in place.
+            return self._deploy_async(
+                function, fields.JobAction.DELETE,
+                pecan.request.conductor_rpcapi.function_delete_async,
+                function.nodepool_id, function.id)
+
         function.destroy()
         pecan.request.agent_rpcapi.function_delete(function.nodepool_id, function_ident)
 
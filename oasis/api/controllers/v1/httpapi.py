@@ -1,10 +1,14 @@
 import pecan
 from pecan import rest
-
+import wsme
 from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import relations
+from oasis.api.controllers.v1 import request as request_api
+from oasis.api.controllers.v1 import response as response_api
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -24,6 +28,9 @@ class HttpApiPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'method', 'endpoint_id')
+
+
 class HttpApi(base.APIBase):
     """API representation of a http api.
 
@@ -40,6 +47,12 @@ class HttpApi(base.APIBase):
     endpoint_id = types.uuid
     """id of this endpoint"""
 
+    request = wsme.wsattr(request_api.Request, readonly=True)
+    """The request of the http api, when expanded"""
+
+    response = wsme.wsattr(response_api.Response, readonly=True)
+    """The response of the http api, when expanded"""
+
     def __init__(self, **kwargs):
         super(HttpApi, self).__init__()
 
@@ -52,9 +65,9 @@ class HttpApi(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(httpapi, url, expand=True):
+    def _convert_with_links(httpapi, url, expand=True, fields=None):
         if not expand:
-            httpapi.unset_fields_except(['id', 'method', 'endpoint_id',])
+            httpapi.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             httpapi.links = [link.Link.make_link('self', url,
                                          'httpapis', httpapi.id),
@@ -64,9 +77,20 @@ class HttpApi(base.APIBase):
         return httpapi
 
     @classmethod
-    def convert_with_links(cls, rpc_httpapi, expand=True):
+    def convert_with_links(cls, rpc_httpapi, expand=True, fields=None):
         httpapi = HttpApi(**rpc_httpapi.as_dict())
-        return cls._convert_with_links(httpapi, pecan.request.host_url, expand)
+        return cls._convert_with_links(httpapi, pecan.request.host_url,
+                                       expand, fields)
+
+
+relations.register('HttpApi', 'request', relations.Relation(
+    request_api.Request, objects.Request, 'id', key='http_api_id'))
+relations.register('HttpApi', 'response', relations.Relation(
+    response_api.Response, objects.Response, 'id', key='http_api_id'))
+
+
+serializers.register(HttpApi, objects.HttpApi, 'httpapis',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class HttpApiCollection(collection.Collection):
@@ -77,11 +101,14 @@ class HttpApiCollection(collection.Collection):
         self._type = 'httpapis'
 
     @staticmethod
-    def convert_with_links(rpc_httpapis, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_httpapis, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = HttpApiCollection()
-        collection.httpapis = [HttpApi.convert_with_links(p, expand)
+        collection.httpapis = [HttpApi.convert_with_links(p, expand, fields)
                                 for p in rpc_httpapis]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_httpapis,
+                                              **kwargs)
 
         return collection
 
@@ -91,33 +118,56 @@ class HttpApisController(rest.RestController):
     def __init__(self):
         super(HttpApisController, self).__init__()
 
+    _custom_actions = {
+        'bulk': ['POST'],
+    }
+
     def _get_httpapis_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None, endpoint_id=None):
+                                  sort_dir, expand=False, resource_url=None, endpoint_id=None,
+                                  fields=None):
 
         context = pecan.request.context
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, HttpApi, objects.HttpApi)
+        columns = api_utils.get_columns(
+            objects.HttpApi, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
 
-        marker_obj = None
-
-        if marker:
-            marker_obj = objects.HttpApi.get_by_id(pecan.request.context,
-                                                    marker)
+        marker_obj = api_utils.get_marker(objects.HttpApi, marker, sort_keys,
+                                          sort_dir)
 
         filters = {'endpoint_id': endpoint_id}
 
+        if api_utils.is_conditional_get():
+            page = objects.HttpApi.list(
+                context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir, filters=filters,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
+
         httpapis = objects.HttpApi.list(context,
                                         limit,
                                         marker_obj,
-                                        sort_key,
+                                        sort_keys,
                                         sort_dir,
-                                        filters=filters)
+                                        filters=filters,
+                                        columns=columns,
+                                        yield_per=yield_per)
+
+        if yield_per:
+            return HttpApiCollection.stream_with_links(
+                HttpApi, httpapis, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
 
-        return HttpApiCollection.convert_with_links(httpapis, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
+        api_utils.set_etag(httpapis)
+        return HttpApiCollection.respond_with_links(
+            HttpApi, httpapis, limit, url=resource_url, expand=expand,
+            fields=fields, sort_key=sort_key, sort_dir=sort_dir)
 
     @expose.expose(HttpApi, body=HttpApi, status_code=201)
     def post(self, httpapi):
@@ -147,15 +197,36 @@ class HttpApisController(rest.RestController):
         #                                          function.id)
         return HttpApi.convert_with_links(httpapi)
 
-    @expose.expose(HttpApiCollection, types.uuid_or_name)
-    def get_one(self, endpoint_ident):
+    @expose.expose(HttpApiCollection, body=[HttpApi],
+                   status_code=201)
+    def bulk(self, items):
+        """Create several http apis in one transaction.
+
+        Every item is validated before any of them is created, so either
+        all of them are created or none is.
+
+        :param items: a list of http apis within the request body.
+        :returns: the created http apis, in the order they were given.
+        """
+        context = pecan.request.context
+        values_list = [item.as_dict() for item in items]
+        api_utils.validate_bulk(values_list, objects.Endpoint,
+                                'endpoint_id')
+
+        created = objects.HttpApi.create_many(context, values_list)
+        return HttpApiCollection.convert_with_links(created, None,
+                                                    expand=True)
+
+    @expose.expose(HttpApiCollection, types.uuid_or_name, wtypes.text)
+    def get_one(self, endpoint_ident, fields=None):
         """Retrieve information about the given bay.
 
         :param nodepool_ident: ID of a nodepool or logical name of the nodepool.
         """
 
         return self._get_httpapis_collection(marker=None, limit=None, sort_key='id',
-                                             sort_dir='asc', endpoint_id=endpoint_ident)
+                                             sort_dir='asc', endpoint_id=endpoint_ident,
+                                             fields=fields)
 
     @expose.expose(None, types.uuid_or_name, status_code=204)
     def delete(self, httpapi_ident):
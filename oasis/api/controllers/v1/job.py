@@ -0,0 +1,227 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_utils import timeutils
+import pecan
+from pecan import rest
+import wsme
+from wsme import types as wtypes
+
+from oasis.api.controllers import base
+from oasis.api.controllers import link
+from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
+from oasis.api.controllers.v1 import types
+from oasis.api import expose
+from oasis.api import utils as api_utils
+from oasis import objects
+from oasis.objects import fields
+
+
+_DEFAULT_RETURN_FIELDS = ('id', 'function_id', 'nodepool_id', 'action',
+                          'status', 'created_at', 'updated_at')
+
+
+class Job(base.APIBase):
+    """API representation of a function deployment job.
+
+    Jobs are created by the function operations when the API runs in
+    asynchronous mode and collect the result reported by each node.
+    """
+
+    id = types.uuid
+    """Unique UUID for this job"""
+
+    project_id = wsme.wsattr(wtypes.text, readonly=True)
+
+    user_id = wsme.wsattr(wtypes.text, readonly=True)
+
+    function_id = types.uuid
+    """Id of the function being deployed"""
+
+    nodepool_id = types.uuid
+    """Id of the nodepool the function is deployed to"""
+
+    action = wtypes.Enum(str, *fields.JobAction.ALL)
+    """The function operation this job runs"""
+
+    status = wtypes.Enum(str, *fields.JobStatus.ALL)
+    """Status of the job"""
+
+    status_reason = wtypes.text
+    """Status reason of the job"""
+
+    results = [wtypes.DictType(wtypes.text, wtypes.text)]
+    """The host, status and status_reason reported by each node"""
+
+    expected_reports = wsme.wsattr(int, readonly=True)
+    """The number of nodes which must succeed for the job to complete"""
+
+    links = wsme.wsattr([link.Link], readonly=True)
+    """A list containing a self link and associated job links"""
+
+    def __init__(self, **kwargs):
+        super(Job, self).__init__()
+
+        self.fields = []
+        for field in objects.Job.fields:
+            # Skip fields we do not expose.
+            if not hasattr(self, field):
+                continue
+            self.fields.append(field)
+            setattr(self, field, kwargs.get(field, wtypes.Unset))
+
+    @staticmethod
+    def _convert_with_links(job, url, expand=True, fields=None):
+        if not expand:
+            job.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
+
+        job.links = [link.Link.make_link('self', url,
+                                         'jobs', job.id),
+                     link.Link.make_link('bookmark', url,
+                                         'jobs', job.id,
+                                         bookmark=True)]
+        return job
+
+    @classmethod
+    def convert_with_links(cls, rpc_job, expand=True, fields=None):
+        job = Job(**rpc_job.as_dict())
+        return cls._convert_with_links(job, pecan.request.host_url,
+                                       expand, fields)
+
+    @classmethod
+    def sample(cls, expand=True):
+        sample = cls(id='9f1c4e0a-61a2-4c2d-9d3e-3e1f9b2c7a10',
+                     function_id='27e3153e-d5bf-4b7e-b517-fb518e17f34c',
+                     nodepool_id='88c3153e-d5bf-4b7e-c234-fb518e17f34c',
+                     action=fields.JobAction.CREATE,
+                     status=fields.JobStatus.COMPLETE,
+                     results=[{'host': 'node-1',
+                               'status': fields.JobStatus.COMPLETE}],
+                     expected_reports=1,
+                     created_at=timeutils.utcnow(),
+                     updated_at=timeutils.utcnow())
+        return cls._convert_with_links(sample, 'http://localhost:9417', expand)
+
+
+serializers.register(Job, objects.Job, 'jobs',
+                     _DEFAULT_RETURN_FIELDS, always_links=True)
+
+
+class JobCollection(collection.Collection):
+    """API representation of a collection of jobs."""
+
+    jobs = [Job]
+    """A list containing jobs objects"""
+
+    def __init__(self, **kwargs):
+        self._type = 'jobs'
+
+    @staticmethod
+    def convert_with_links(rpc_jobs, limit, url=None, expand=False,
+                           fields=None, **kwargs):
+        collection = JobCollection()
+        collection.jobs = [Job.convert_with_links(p, expand, fields)
+                           for p in rpc_jobs]
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_jobs,
+                                              **kwargs)
+        return collection
+
+    @classmethod
+    def sample(cls):
+        sample = cls()
+        sample.jobs = [Job.sample(expand=False)]
+        return sample
+
+
+class JobsController(rest.RestController):
+    """REST controller for Jobs."""
+    def __init__(self):
+        super(JobsController, self).__init__()
+
+    def _get_jobs_collection(self, marker, limit, sort_key, sort_dir,
+                             expand=False, resource_url=None, filters=None,
+                             fields=None):
+
+        limit = api_utils.validate_limit(limit)
+        sort_dir = api_utils.validate_sort_dir(sort_dir)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, Job, objects.Job)
+        columns = api_utils.get_columns(
+            objects.Job, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        marker_obj = api_utils.get_marker(objects.Job, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.Job.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir, filters=filters,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
+
+        jobs = objects.Job.list(pecan.request.context, limit,
+                                marker_obj, sort_key=sort_keys,
+                                sort_dir=sort_dir, filters=filters,
+                                columns=columns,
+                                yield_per=yield_per)
+
+        if yield_per:
+            return JobCollection.stream_with_links(
+                Job, jobs, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        api_utils.set_etag(jobs)
+        return JobCollection.respond_with_links(
+            Job, jobs, limit, url=resource_url, expand=expand, fields=fields,
+            sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(JobCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, types.uuid, wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key='id',
+                sort_dir='asc', function_id=None, fields=None):
+        """Retrieve a list of jobs.
+
+        :param marker: pagination marker for large data sets.
+        :param limit: maximum number of resources to return in a single result.
+        :param sort_key: column to sort results by. Default: id.
+        :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param function_id: only return the jobs of this function.
+        :param fields: a comma separated list of fields to return.
+        """
+        filters = {}
+        if function_id:
+            filters['function_id'] = function_id
+        return self._get_jobs_collection(marker, limit, sort_key, sort_dir,
+                                         filters=filters, fields=fields)
+
+    @expose.expose(Job, types.uuid)
+    def get_one(self, job_id):
+        """Retrieve information about the given job.
+
+        :param job_id: UUID of a job.
+        """
+        not_modified = api_utils.check_resource_not_modified(objects.Job,
+                                                             job_id)
+        if not_modified:
+            return not_modified
+
+        job = objects.Job.get_by_id(pecan.request.context, job_id)
+        api_utils.set_etag([job])
+        return serializers.respond(Job, job)
@@ -21,6 +21,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -43,6 +44,12 @@ class NodePoolPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'name', 'updated_at', 'created_at',
+                          'project_id', 'stack_id', 'user_id', 'host',
+                          'status', 'function_id', 'nodepool_policy_id',
+                          'status_reason')
+
+
 class NodePool(base.APIBase):
     """API representation of a nodepool.
 
@@ -86,11 +93,9 @@ class NodePool(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(nodepool, url, expand=True):
+    def _convert_with_links(nodepool, url, expand=True, fields=None):
         if not expand:
-            nodepool.unset_fields_except(['id', 'name', 'updated_at', 'created_at',
-                                          'proejct_id', 'stack_id', 'user_id', 'host',
-                                          'status', 'function_id', 'nodepool_policy_id', 'status_reason'])
+            nodepool.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
             nodepool.links = [link.Link.make_link('self', url,
                                          'nodepools', nodepool.id),
                      link.Link.make_link('bookmark', url,
@@ -99,9 +104,10 @@ class NodePool(base.APIBase):
         return nodepool
 
     @classmethod
-    def convert_with_links(cls, rpc_nodepool, expand=True):
+    def convert_with_links(cls, rpc_nodepool, expand=True, fields=None):
         nodepool = NodePool(**rpc_nodepool.as_dict())
-        return cls._convert_with_links(nodepool, pecan.request.host_url, expand)
+        return cls._convert_with_links(nodepool, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -117,6 +123,10 @@ class NodePool(base.APIBase):
         return cls._convert_with_links(sample, 'http://localhost:9417', expand)
 
 
+serializers.register(NodePool, objects.NodePool, 'nodepools',
+                     _DEFAULT_RETURN_FIELDS)
+
+
 class NodePoolCollection(collection.Collection):
     """API representation of a collection of nodepools."""
 
@@ -127,11 +137,14 @@ class NodePoolCollection(collection.Collection):
         self._type = 'nodepools'
 
     @staticmethod
-    def convert_with_links(rpc_bays, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_bays, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = NodePoolCollection()
-        collection.nodepools = [NodePool.convert_with_links(p, expand)
+        collection.nodepools = [NodePool.convert_with_links(p, expand, fields)
                            for p in rpc_bays]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_bays,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -152,51 +165,86 @@ class NodePoolsController(rest.RestController):
 
     def _get_nodepools_collection(self, marker, limit,
                              sort_key, sort_dir, expand=False,
-                             resource_url=None):
+                             resource_url=None,
+                             fields=None, ids=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.NodePool.get_by_id(pecan.request.context,
-                                                 marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, NodePool, objects.NodePool)
+        columns = api_utils.get_columns(
+            objects.NodePool, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        if ids:
+            nodepools, not_found = api_utils.get_batch(
+                objects.NodePool, ids, columns)
+            api_utils.set_etag(nodepools)
+            return NodePoolCollection.respond_with_links(
+                NodePool, nodepools, None, url=resource_url, expand=expand,
+                fields=fields, not_found=not_found)
+
+        marker_obj = api_utils.get_marker(objects.NodePool, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.NodePool.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         nodepools = objects.NodePool.list(pecan.request.context, limit,
-                                marker_obj, sort_key=sort_key,
-                                sort_dir=sort_dir)
-
-        return NodePoolCollection.convert_with_links(nodepools, limit,
-                                                url=resource_url,
-                                                expand=expand,
-                                                sort_key=sort_key,
-                                                sort_dir=sort_dir)
-
-    @expose.expose(NodePoolCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                marker_obj, sort_key=sort_keys,
+                                sort_dir=sort_dir,
+                                columns=columns,
+                                yield_per=yield_per)
+
+        if yield_per:
+            return NodePoolCollection.stream_with_links(
+                NodePool, nodepools, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        api_utils.set_etag(nodepools)
+        return NodePoolCollection.respond_with_links(
+            NodePool, nodepools, limit, url=resource_url, expand=expand,
+            fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(NodePoolCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text])
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None, id=None):
         """Retrieve a list of nodepools.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
         """
         context = pecan.request.context
         return self._get_nodepools_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir,
+                                         fields=fields, ids=id)
 
-    @expose.expose(NodePoolCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+    @expose.expose(NodePoolCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text])
     def detail(self, marker=None, limit=None, sort_key='id',
-               sort_dir='asc'):
+               sort_dir='asc', fields=None, id=None):
         """Retrieve a list of nodepools with detail.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
         """
         context = pecan.request.context
 
@@ -209,7 +257,7 @@ class NodePoolsController(rest.RestController):
         resource_url = '/'.join(['nodepools', 'detail'])
         return self._get_nodepools_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, fields=fields, ids=id)
 
     @expose.expose(NodePool, types.uuid_or_name)
     def get_one(self, nodepool_ident):
@@ -217,8 +265,14 @@ class NodePoolsController(rest.RestController):
 
         :param nodepool_ident: ID of a nodepool or logical name of the nodepool.
         """
+        not_modified = api_utils.check_resource_not_modified(objects.NodePool,
+                                                             nodepool_ident)
+        if not_modified:
+            return not_modified
+
         nodepool = api_utils.get_resource('NodePool', nodepool_ident)
-        return NodePool.convert_with_links(nodepool)
+        api_utils.set_etag([nodepool])
+        return serializers.respond(NodePool, nodepool)
 
     @expose.expose(NodePool, body=NodePool, status_code=201)
     def post(self, nodepool):
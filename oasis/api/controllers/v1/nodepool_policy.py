@@ -21,6 +21,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -39,6 +40,15 @@ class NodePoolPolicyPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'name', 'min_size', 'max_size',
+                          'scaleup_adjust', 'scaleup_cooldown',
+                          'scaleup_period', 'scaleup_evaluation_periods',
+                          'scaledown_adjust', 'scaledown_cooldown',
+                          'scaledown_period', 'scaledown_evaluation_periods',
+                          'scaledown_threshold', 'scaleup_threshold',
+                          'created_at')
+
+
 class NodePoolPolicy(base.APIBase):
     """API representation of a nodepool_policy.
 
@@ -92,13 +102,9 @@ class NodePoolPolicy(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(nodepool_policy, url, expand=True):
+    def _convert_with_links(nodepool_policy, url, expand=True, fields=None):
         if not expand:
-            nodepool_policy.unset_fields_except(['id', 'name', 'min_size',
-                                                 'max_size', 'scaleup_adjust', 'scaleup_cooldown',
-                                                 'scaleup_period', 'scaleup_evaluation_periods', 'scaledown_adjust',
-                                                 'scaledown_cooldown', 'scaledown_period', 'scaledown_evaluation_periods',
-                                                 'scaledown_threshold', 'scaleup_threshold', 'created_at'])
+            nodepool_policy.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
             nodepool_policy.links = [link.Link.make_link('self', url,
                                          'nodepool_policies', nodepool_policy.id),
                      link.Link.make_link('bookmark', url,
@@ -107,9 +113,10 @@ class NodePoolPolicy(base.APIBase):
         return nodepool_policy
 
     @classmethod
-    def convert_with_links(cls, rpc_nodepool_policy, expand=True):
+    def convert_with_links(cls, rpc_nodepool_policy, expand=True, fields=None):
         nodepool_policy = NodePoolPolicy(**rpc_nodepool_policy.as_dict())
-        return cls._convert_with_links(nodepool_policy, pecan.request.host_url, expand)
+        return cls._convert_with_links(nodepool_policy, pecan.request.host_url,
+                                       expand, fields)
 
     @classmethod
     def sample(cls, expand=True):
@@ -130,6 +137,10 @@ class NodePoolPolicy(base.APIBase):
         return cls._convert_with_links(sample, 'http://localhost:9417', expand)
 
 
+serializers.register(NodePoolPolicy, objects.NodePoolPolicy,
+                     'nodepool_policies', _DEFAULT_RETURN_FIELDS)
+
+
 class NodePoolPolicyCollection(collection.Collection):
     """API representation of a collection of nodepool_policies."""
 
@@ -140,11 +151,14 @@ class NodePoolPolicyCollection(collection.Collection):
         self._type = 'nodepool_policies'
 
     @staticmethod
-    def convert_with_links(rpc_bays, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_bays, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = NodePoolPolicyCollection()
-        collection.nodepool_policies = [NodePoolPolicy.convert_with_links(p, expand)
+        collection.nodepool_policies = [NodePoolPolicy.convert_with_links(p, expand, fields)
                            for p in rpc_bays]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_bays,
+                                              **kwargs)
         return collection
 
     @classmethod
@@ -165,51 +179,87 @@ class NodePoolPoliciesController(rest.RestController):
 
     def _get_nodepool_policies_collection(self, marker, limit,
                              sort_key, sort_dir, expand=False,
-                             resource_url=None):
+                             resource_url=None,
+                             fields=None, ids=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.NodePoolPolicy.get_by_id(pecan.request.context,
-                                                 marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, NodePoolPolicy, objects.NodePoolPolicy)
+        columns = api_utils.get_columns(
+            objects.NodePoolPolicy, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        if ids:
+            policies, not_found = api_utils.get_batch(
+                objects.NodePoolPolicy, ids, columns)
+            api_utils.set_etag(policies)
+            return NodePoolPolicyCollection.respond_with_links(
+                NodePoolPolicy, policies, None, url=resource_url,
+                expand=expand, fields=fields, not_found=not_found)
+
+        marker_obj = api_utils.get_marker(objects.NodePoolPolicy, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.NodePoolPolicy.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         nodepool_policies = objects.NodePoolPolicy.list(pecan.request.context, limit,
-                                marker_obj, sort_key=sort_key,
-                                sort_dir=sort_dir)
-
-        return NodePoolPolicyCollection.convert_with_links(nodepool_policies, limit,
-                                                url=resource_url,
-                                                expand=expand,
-                                                sort_key=sort_key,
-                                                sort_dir=sort_dir)
-
-    @expose.expose(NodePoolPolicyCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                marker_obj, sort_key=sort_keys,
+                                sort_dir=sort_dir,
+                                columns=columns,
+                                yield_per=yield_per)
+
+        if yield_per:
+            return NodePoolPolicyCollection.stream_with_links(
+                NodePoolPolicy, nodepool_policies, limit, url=resource_url,
+                expand=expand, fields=fields, sort_key=sort_key,
+                sort_dir=sort_dir)
+
+        api_utils.set_etag(nodepool_policies)
+        return NodePoolPolicyCollection.respond_with_links(
+            NodePoolPolicy, nodepool_policies, limit, url=resource_url,
+            expand=expand, fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(NodePoolPolicyCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text])
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None, id=None):
         """Retrieve a list of bays.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
         """
         context = pecan.request.context
         return self._get_nodepool_policies_collection(marker, limit, sort_key,
-                                         sort_dir)
+                                         sort_dir,
+                                         fields=fields, ids=id)
 
-    @expose.expose(NodePoolPolicyCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+    @expose.expose(NodePoolPolicyCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text, [wtypes.text])
     def detail(self, marker=None, limit=None, sort_key='id',
-               sort_dir='asc'):
+               sort_dir='asc', fields=None, id=None):
         """Retrieve a list of bays with detail.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
+        :param id: ids of resources to return, given in place of the
+                   pagination parameters.
         """
         context = pecan.request.context
 
@@ -222,7 +272,7 @@ class NodePoolPoliciesController(rest.RestController):
         resource_url = '/'.join(['nodepool_policies', 'detail'])
         return self._get_nodepool_policies_collection(marker, limit,
                                          sort_key, sort_dir, expand,
-                                         resource_url)
+                                         resource_url, fields=fields, ids=id)
 
     @expose.expose(NodePoolPolicy, types.uuid_or_name)
     def get_one(self, nodepool_policy_ident):
@@ -231,11 +281,17 @@ class NodePoolPoliciesController(rest.RestController):
         :param nodepool_policy_ident: UUID of a bay or logical name of the bay.
         """
         context = pecan.request.context
+        not_modified = api_utils.check_resource_not_modified(
+            objects.NodePoolPolicy, nodepool_policy_ident)
+        if not_modified:
+            return not_modified
+
         nodepool_policy = api_utils.get_resource('NodePoolPolicy', nodepool_policy_ident)
+        api_utils.set_etag([nodepool_policy])
         # policy.enforce(context, 'nodepool_policy:get', nodepool_policy,
         #                action='nodepool_policy:get')
 
-        return NodePoolPolicy.convert_with_links(nodepool_policy)
+        return serializers.respond(NodePoolPolicy, nodepool_policy)
 
     @expose.expose(NodePoolPolicy, body=NodePoolPolicy, status_code=201)
     def post(self, nodepool_policy):
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Inline expansion of the resources related to the ones returned.
+
+The ``expand`` query parameter names the relations to embed, separated
+by commas, e.g. ``expand=endpoint,httpapis.request.headers``. A dotted
+path embeds the relations of the embedded resources, up to
+[api]max_expand_depth levels.
+
+Each relation is loaded with one ``IN`` query for all the resources of
+the response, whatever their number. The relations of a resource are
+registered by the module of its API type.
+"""
+
+import collections
+
+from oslo_config import cfg
+import pecan
+import wsme
+
+from oasis.i18n import _
+
+CONF = cfg.CONF
+
+# Object name of the parent -> relation name -> Relation
+_RELATIONS = collections.defaultdict(dict)
+
+
+class Relation(object):
+    """Resources related to a parent resource.
+
+    :param api_cls: the API type of the related resources.
+    :param obj_cls: the object type of the related resources.
+    :param parent_key: the field of the parent matched against key.
+    :param key: the field of the related resources matched against
+                parent_key.
+    :param many: whether a list of resources is embedded, rather than
+                 a single one.
+    :param owner: if set, the object type whose records, visible to the
+                  project, parent_key must be the id of. It guards the
+                  relations which do not go through a resource filtered
+                  by project.
+    """
+
+    def __init__(self, api_cls, obj_cls, parent_key, key='id', many=False,
+                 owner=None):
+        self.api_cls = api_cls
+        self.obj_cls = obj_cls
+        self.parent_key = parent_key
+        self.key = key
+        self.many = many
+        self.owner = owner
+
+
+def register(resource, name, relation):
+    """Make a relation of a resource expandable.
+
+    :param resource: the object name of the parent, e.g. 'Function'.
+    :param name: the name of the relation, which is also the attribute of
+                 the parent API type the related resources are set on.
+    :param relation: the Relation.
+    """
+    _RELATIONS[resource][name] = relation
+
+
+def parse(resource, expand):
+    """Parse the value of the expand query parameter.
+
+    :param resource: the object name of the resources returned.
+    :param expand: the comma separated relation paths, or None.
+    :returns: a dict from relation name to the dict of the relations to
+              expand below it, or None if nothing is expanded.
+    :raises: ClientSideError if a relation is unknown or too deep.
+    """
+    if not expand:
+        return None
+    tree = {}
+    for path in expand.split(','):
+        names = [name.strip() for name in path.split('.')]
+        if len(names) > CONF.api.max_expand_depth:
+            raise wsme.exc.ClientSideError(
+                _("Relations can be expanded at most %d levels deep.") %
+                CONF.api.max_expand_depth)
+        node = tree
+        parent = resource
+        for name in names:
+            relation = _RELATIONS[parent].get(name)
+            if relation is None:
+                raise wsme.exc.ClientSideError(
+                    _("Invalid relation to expand: %s") % path.strip())
+            node = node.setdefault(name, {})
+            parent = relation.obj_cls.obj_name()
+    return tree
+
+
+def get_columns(resource, columns, tree):
+    """Add the fields expanding relations needs to the columns to load.
+
+    :param resource: the object name of the resources loaded.
+    :param columns: the fields to load, or None to load all of them.
+    :param tree: the relations to expand, as returned by parse().
+    """
+    if not tree or columns is None:
+        return columns
+    keys = [_RELATIONS[resource][name].parent_key for name in tree]
+    return list(columns) + [key for key in keys if key not in columns]
+
+
+def embed(resource, api_items, objs, tree):
+    """Set the related resources on the API representation of objects.
+
+    :param resource: the object name of objs.
+    :param api_items: the API representations of objs, in the same order.
+    :param objs: the objects the API representations were made from.
+    :param tree: the relations to expand, as returned by parse().
+    """
+    if not tree or not objs:
+        return
+    context = pecan.request.context
+    for name, subtree in tree.items():
+        relation = _RELATIONS[resource][name]
+        values = set(getattr(obj, relation.parent_key) for obj in objs)
+        values.discard(None)
+        if values and relation.owner is not None:
+            values = set(owner.id for owner in relation.owner.list_by_ids(
+                context, list(values), columns=['id']))
+
+        related = []
+        if values:
+            related = relation.obj_cls.list_by_ids(context, list(values),
+                                                   key=relation.key)
+        api_related = [relation.api_cls.convert_with_links(obj)
+                       for obj in related]
+        embed(relation.obj_cls.obj_name(), api_related, related, subtree)
+
+        by_key = collections.defaultdict(list)
+        for obj, api_obj in zip(related, api_related):
+            by_key[getattr(obj, relation.key)].append(api_obj)
+        for obj, api_item in zip(objs, api_items):
+            matches = by_key.get(getattr(obj, relation.parent_key), [])
+            if relation.many:
+                setattr(api_item, name, matches)
+            elif matches:
+                setattr(api_item, name, matches[0])
@@ -7,6 +7,9 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import relations
+from oasis.api.controllers.v1 import requestheader
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +31,9 @@ class RequestPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'http_api_id', 'created_at')
+
+
 class Request(base.APIBase):
     """API representation of a http api.
 
@@ -41,6 +47,9 @@ class Request(base.APIBase):
     http_api_id = types.uuid
     """id of this endpoint"""
 
+    headers = wsme.wsattr([requestheader.RequestHeader], readonly=True)
+    """The headers of the request, when expanded"""
+
     def __init__(self, **kwargs):
         super(Request, self).__init__()
 
@@ -53,9 +62,9 @@ class Request(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(request, url, expand=True):
+    def _convert_with_links(request, url, expand=True, fields=None):
         if not expand:
-            request.unset_fields_except(['id', 'http_api_id', 'created_at'])
+            request.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             request.links = [link.Link.make_link('self', url,
                                          'requests', request.id),
@@ -65,9 +74,19 @@ class Request(base.APIBase):
         return request
 
     @classmethod
-    def convert_with_links(cls, rpc_request, expand=True):
+    def convert_with_links(cls, rpc_request, expand=True, fields=None):
         request = Request(**rpc_request.as_dict())
-        return cls._convert_with_links(request, pecan.request.host_url, expand)
+        return cls._convert_with_links(request, pecan.request.host_url,
+                                       expand, fields)
+
+
+relations.register('Request', 'headers', relations.Relation(
+    requestheader.RequestHeader, objects.RequestHeader, 'id',
+    key='request_id', many=True))
+
+
+serializers.register(Request, objects.Request, 'requests',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class RequestCollection(collection.Collection):
@@ -78,11 +97,14 @@ class RequestCollection(collection.Collection):
         self._type = 'requests'
 
     @staticmethod
-    def convert_with_links(rpc_requests, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_requests, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = RequestCollection()
-        collection.endpoints = [Request.convert_with_links(p, expand)
+        collection.endpoints = [Request.convert_with_links(p, expand, fields)
                                 for p in rpc_requests]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_requests,
+                                              **kwargs)
         return collection
 
 
@@ -92,39 +114,61 @@ class RequestsController(rest.RestController):
         super(RequestsController, self).__init__()
 
     def _get_requests_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None):
+                                  sort_dir, expand=False, resource_url=None,
+                                  fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.Request.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, Request, objects.Request)
+        columns = api_utils.get_columns(
+            objects.Request, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        marker_obj = api_utils.get_marker(objects.Request, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.Request.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         endpoints = objects.Request.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return RequestCollection.convert_with_links(endpoints, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
-
-    @expose.expose(RequestCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return RequestCollection.stream_with_links(
+                Request, endpoints, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        api_utils.set_etag(endpoints)
+        return RequestCollection.respond_with_links(
+            Request, endpoints, limit, url=resource_url, expand=expand,
+            fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(RequestCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None):
         """Retrieve a list of requests.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
         """
         context = pecan.request.context
-        return self._get_requests_collection(marker, limit, sort_key, sort_dir)
+        return self._get_requests_collection(marker, limit, sort_key, sort_dir,
+                                             fields=fields)
 
     @expose.expose(Request, body=Request, status_code=201)
     def post(self, request):
@@ -157,7 +201,7 @@ class RequestsController(rest.RestController):
         """
         request = api_utils.get_resource('Request', httpapi_ident)
 
-        return Request.convert_with_links(request)
+        return serializers.respond(Request, request)
 
     @expose.expose(None, types.uuid_or_name, status_code=204)
     def delete(self, httpapi_ident):
@@ -7,6 +7,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +29,9 @@ class RequestHeaderPatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'name', 'value', 'request_id', 'created_at')
+
+
 class RequestHeader(base.APIBase):
     """API representation of a requestheader.
 
@@ -59,9 +63,9 @@ class RequestHeader(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(requestheader, url, expand=True):
+    def _convert_with_links(requestheader, url, expand=True, fields=None):
         if not expand:
-            requestheader.unset_fields_except(['id', 'name', 'value', 'request_id', 'created_at'])
+            requestheader.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             requestheader.links = [link.Link.make_link('self', url,
                                          'requestheaders', requestheader.id),
@@ -71,9 +75,14 @@ class RequestHeader(base.APIBase):
         return requestheader
 
     @classmethod
-    def convert_with_links(cls, rpc_requestheader, expand=True):
+    def convert_with_links(cls, rpc_requestheader, expand=True, fields=None):
         requestheader = RequestHeader(**rpc_requestheader.as_dict())
-        return cls._convert_with_links(requestheader, pecan.request.host_url, expand)
+        return cls._convert_with_links(requestheader, pecan.request.host_url,
+                                       expand, fields)
+
+
+serializers.register(RequestHeader, objects.RequestHeader, 'requestheaders',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class RequestHeaderCollection(collection.Collection):
@@ -84,11 +93,14 @@ class RequestHeaderCollection(collection.Collection):
         self._type = 'requestheaders'
 
     @staticmethod
-    def convert_with_links(rpc_requestheaders, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_requestheaders, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = RequestHeaderCollection()
-        collection.requestheaders = [RequestHeader.convert_with_links(p, expand)
+        collection.requestheaders = [RequestHeader.convert_with_links(p, expand, fields)
                                 for p in rpc_requestheaders]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_requestheaders,
+                                              **kwargs)
         return collection
 
 
@@ -97,42 +109,69 @@ class RequestHeadersController(rest.RestController):
     def __init__(self):
         super(RequestHeadersController, self).__init__()
 
+    _custom_actions = {
+        'bulk': ['POST'],
+    }
+
     def _get_requestheaders_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None, id=None):
+                                  sort_dir, expand=False, resource_url=None, id=None,
+                                  fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, RequestHeader, objects.RequestHeader)
+        columns = api_utils.get_columns(
+            objects.RequestHeader, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
 
-        marker_obj = None
-        if marker:
-            marker_obj = objects.RequestHeader.get_by_id(pecan.request.context,
-                                                    marker)
+        marker_obj = api_utils.get_marker(objects.RequestHeader, marker, sort_keys,
+                                          sort_dir)
 
         filters = {'request_id': id}
 
-        requestheaders = objects.RequestHeader.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir, filters=filters)
-
-        return RequestHeaderCollection.convert_with_links(requestheaders, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
+        if api_utils.is_conditional_get():
+            page = objects.RequestHeader.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir, filters=filters,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
-    @expose.expose(RequestHeaderCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+        requestheaders = objects.RequestHeader.list(pecan.request.context, limit,
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir, filters=filters,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return RequestHeaderCollection.stream_with_links(
+                RequestHeader, requestheaders, limit, url=resource_url,
+                expand=expand, fields=fields, sort_key=sort_key,
+                sort_dir=sort_dir)
+
+        api_utils.set_etag(requestheaders)
+        return RequestHeaderCollection.respond_with_links(
+            RequestHeader, requestheaders, limit, url=resource_url,
+            expand=expand, fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(RequestHeaderCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None):
         """Retrieve a list of requestheaders.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
         """
         context = pecan.request.context
-        return self._get_requestheaders_collection(marker, limit, sort_key, sort_dir)
+        return self._get_requestheaders_collection(marker, limit, sort_key, sort_dir,
+                                                   fields=fields)
 
     @expose.expose(RequestHeader, body=RequestHeader, status_code=201)
     def post(self, requestheader):
@@ -161,15 +200,36 @@ class RequestHeadersController(rest.RestController):
         #                                          function.id)
         return RequestHeader.convert_with_links(requestheader)
 
-    @expose.expose(RequestHeaderCollection, types.uuid_or_name)
-    def get_one(self, request_ident):
+    @expose.expose(RequestHeaderCollection, body=[RequestHeader],
+                   status_code=201)
+    def bulk(self, items):
+        """Create several request headers in one transaction.
+
+        Every item is validated before any of them is created, so either
+        all of them are created or none is.
+
+        :param items: a list of request headers within the request body.
+        :returns: the created request headers, in the order they were given.
+        """
+        context = pecan.request.context
+        values_list = [item.as_dict() for item in items]
+        api_utils.validate_bulk(values_list, objects.Request,
+                                'request_id')
+
+        created = objects.RequestHeader.create_many(context, values_list)
+        return RequestHeaderCollection.convert_with_links(created, None,
+                                                          expand=True)
+
+    @expose.expose(RequestHeaderCollection, types.uuid_or_name, wtypes.text)
+    def get_one(self, request_ident, fields=None):
         """Retrieve information about the given bay.
 
         :param nodepool_ident: ID of a nodepool or logical name of the nodepool.
         """
 
         return self._get_requestheaders_collection(marker=None, limit=None, sort_key='id',
-                                                   sort_dir='asc', id=request_ident)
+                                                   sort_dir='asc', id=request_ident,
+                                                   fields=fields)
 
     @expose.expose(None, types.uuid_or_name, status_code=204)
     def delete(self, request_ident):
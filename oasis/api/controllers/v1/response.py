@@ -7,6 +7,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +29,9 @@ class ResponsePatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'http_api_id', 'created_at')
+
+
 class Response(base.APIBase):
     """API representation of a response.
 
@@ -53,9 +57,9 @@ class Response(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(response, url, expand=True):
+    def _convert_with_links(response, url, expand=True, fields=None):
         if not expand:
-            response.unset_fields_except(['id', 'http_api_id', 'created_at'])
+            response.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             response.links = [link.Link.make_link('self', url,
                                          'responses', response.id),
@@ -65,9 +69,14 @@ class Response(base.APIBase):
         return response
 
     @classmethod
-    def convert_with_links(cls, rpc_response, expand=True):
+    def convert_with_links(cls, rpc_response, expand=True, fields=None):
         response = Response(**rpc_response.as_dict())
-        return cls._convert_with_links(response, pecan.request.host_url, expand)
+        return cls._convert_with_links(response, pecan.request.host_url,
+                                       expand, fields)
+
+
+serializers.register(Response, objects.Response, 'responses',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class ResponseCollection(collection.Collection):
@@ -78,11 +87,14 @@ class ResponseCollection(collection.Collection):
         self._type = 'responses'
 
     @staticmethod
-    def convert_with_links(rpc_responses, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_responses, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = ResponseCollection()
-        collection.responses = [Response.convert_with_links(p, expand)
+        collection.responses = [Response.convert_with_links(p, expand, fields)
                                 for p in rpc_responses]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_responses,
+                                              **kwargs)
         return collection
 
 
@@ -91,40 +103,66 @@ class ResponsesController(rest.RestController):
     def __init__(self):
         super(ResponsesController, self).__init__()
 
+    _custom_actions = {
+        'bulk': ['POST'],
+    }
+
     def _get_responses_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None):
+                                  sort_dir, expand=False, resource_url=None,
+                                  fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.Response.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, Response, objects.Response)
+        columns = api_utils.get_columns(
+            objects.Response, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        marker_obj = api_utils.get_marker(objects.Response, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.Response.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         responses = objects.Response.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return ResponseCollection.convert_with_links(responses, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
-
-    @expose.expose(ResponseCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return ResponseCollection.stream_with_links(
+                Response, responses, limit, url=resource_url, expand=expand,
+                fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+        api_utils.set_etag(responses)
+        return ResponseCollection.respond_with_links(
+            Response, responses, limit, url=resource_url, expand=expand,
+            fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(ResponseCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None):
         """Retrieve a list of responses.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
         """
         context = pecan.request.context
-        return self._get_responses_collection(marker, limit, sort_key, sort_dir)
+        return self._get_responses_collection(marker, limit, sort_key, sort_dir,
+                                              fields=fields)
 
     @expose.expose(Response, body=Response, status_code=201)
     def post(self, response):
@@ -148,3 +186,23 @@ class ResponsesController(rest.RestController):
         # pecan.response.location = link.build_url('functions',
         #                                          function.id)
         return Response.convert_with_links(response)
+
+    @expose.expose(ResponseCollection, body=[Response],
+                   status_code=201)
+    def bulk(self, items):
+        """Create several responses in one transaction.
+
+        Every item is validated before any of them is created, so either
+        all of them are created or none is.
+
+        :param items: a list of responses within the request body.
+        :returns: the created responses, in the order they were given.
+        """
+        context = pecan.request.context
+        values_list = [item.as_dict() for item in items]
+        api_utils.validate_bulk(values_list, objects.HttpApi,
+                                'http_api_id')
+
+        created = objects.Response.create_many(context, values_list)
+        return ResponseCollection.convert_with_links(created, None,
+                                                     expand=True)
@@ -7,6 +7,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +29,9 @@ class ResponseCodePatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'status_code', 'response_id', 'created_at')
+
+
 class ResponseCode(base.APIBase):
     """API representation of a responsecode.
 
@@ -56,9 +60,9 @@ class ResponseCode(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(responsecode, url, expand=True):
+    def _convert_with_links(responsecode, url, expand=True, fields=None):
         if not expand:
-            responsecode.unset_fields_except(['id', 'status_code', 'response_id', 'created_at'])
+            responsecode.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             responsecode.links = [link.Link.make_link('self', url,
                                     'responsecodes', responsecode.id),
@@ -68,9 +72,14 @@ class ResponseCode(base.APIBase):
         return responsecode
 
     @classmethod
-    def convert_with_links(cls, rpc_responsecode, expand=True):
+    def convert_with_links(cls, rpc_responsecode, expand=True, fields=None):
         responsecode = ResponseCode(**rpc_responsecode.as_dict())
-        return cls._convert_with_links(responsecode, pecan.request.host_url, expand)
+        return cls._convert_with_links(responsecode, pecan.request.host_url,
+                                       expand, fields)
+
+
+serializers.register(ResponseCode, objects.ResponseCode, 'responsecodes',
+                     _DEFAULT_RETURN_FIELDS)
 
 
 class ResponseCodeCollection(collection.Collection):
@@ -81,11 +90,14 @@ class ResponseCodeCollection(collection.Collection):
         self._type = 'responsecodes'
 
     @staticmethod
-    def convert_with_links(rpc_responsecodes, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_responsecodes, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = ResponseCodeCollection()
-        collection.responsecodes = [ResponseCode.convert_with_links(p, expand)
+        collection.responsecodes = [ResponseCode.convert_with_links(p, expand, fields)
                                 for p in rpc_responsecodes]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_responsecodes,
+                                              **kwargs)
         return collection
 
 
@@ -94,40 +106,67 @@ class ResponseCodesController(rest.RestController):
     def __init__(self):
         super(ResponseCodesController, self).__init__()
 
+    _custom_actions = {
+        'bulk': ['POST'],
+    }
+
     def _get_responsecodes_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None):
+                                  sort_dir, expand=False, resource_url=None,
+                                  fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.ResponseCode.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, ResponseCode, objects.ResponseCode)
+        columns = api_utils.get_columns(
+            objects.ResponseCode, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        marker_obj = api_utils.get_marker(objects.ResponseCode, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.ResponseCode.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         responsecodes = objects.ResponseCode.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return ResponseCodeCollection.convert_with_links(responsecodes, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
-
-    @expose.expose(ResponseCodeCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return ResponseCodeCollection.stream_with_links(
+                ResponseCode, responsecodes, limit, url=resource_url,
+                expand=expand, fields=fields, sort_key=sort_key,
+                sort_dir=sort_dir)
+
+        api_utils.set_etag(responsecodes)
+        return ResponseCodeCollection.respond_with_links(
+            ResponseCode, responsecodes, limit, url=resource_url,
+            expand=expand, fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(ResponseCodeCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None):
         """Retrieve a list of responsecodes.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
         """
         context = pecan.request.context
-        return self._get_responsecodes_collection(marker, limit, sort_key, sort_dir)
+        return self._get_responsecodes_collection(marker, limit, sort_key, sort_dir,
+                                                  fields=fields)
 
     @expose.expose(ResponseCode, body=ResponseCode, status_code=201)
     def post(self, responsecode):
@@ -153,3 +192,23 @@ class ResponseCodesController(rest.RestController):
         # pecan.response.location = link.build_url('functions',
         #                                          function.id)
         return ResponseCode.convert_with_links(responsecode)
+
+    @expose.expose(ResponseCodeCollection, body=[ResponseCode],
+                   status_code=201)
+    def bulk(self, items):
+        """Create several response codes in one transaction.
+
+        Every item is validated before any of them is created, so either
+        all of them are created or none is.
+
+        :param items: a list of response codes within the request body.
+        :returns: the created response codes, in the order they were given.
+        """
+        context = pecan.request.context
+        values_list = [item.as_dict() for item in items]
+        api_utils.validate_bulk(values_list, objects.Response,
+                                'response_id')
+
+        created = objects.ResponseCode.create_many(context, values_list)
+        return ResponseCodeCollection.convert_with_links(created, None,
+                                                         expand=True)
@@ -7,6 +7,7 @@ from wsme import types as wtypes
 from oasis.api.controllers import base
 from oasis.api.controllers import link
 from oasis.api.controllers.v1 import collection
+from oasis.api.controllers.v1 import serializers
 from oasis.api.controllers.v1 import types
 from oasis.api import expose
 from oasis.api import utils as api_utils
@@ -28,6 +29,10 @@ class ResponseMessagePatchType(types.JsonPatchType):
         return types.JsonPatchType.internal_attrs() + internal_attrs
 
 
+_DEFAULT_RETURN_FIELDS = ('id', 'message', 'response_statuscode_id',
+                          'created_at')
+
+
 class ResponseMessage(base.APIBase):
     """API representation of a responsemessage.
 
@@ -56,9 +61,9 @@ class ResponseMessage(base.APIBase):
             setattr(self, field, kwargs.get(field, wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(responsemessage, url, expand=True):
+    def _convert_with_links(responsemessage, url, expand=True, fields=None):
         if not expand:
-            responsemessage.unset_fields_except(['id', 'message', 'response_statuscode_id', 'created_at'])
+            responsemessage.unset_fields_except(fields or _DEFAULT_RETURN_FIELDS)
 
             responsemessage.links = [link.Link.make_link('self', url,
                                     'responsemessages', responsemessage.id),
@@ -68,9 +73,14 @@ class ResponseMessage(base.APIBase):
         return responsemessage
 
     @classmethod
-    def convert_with_links(cls, rpc_responsemessage, expand=True):
+    def convert_with_links(cls, rpc_responsemessage, expand=True, fields=None):
         responsemessage = ResponseMessage(**rpc_responsemessage.as_dict())
-        return cls._convert_with_links(responsemessage, pecan.request.host_url, expand)
+        return cls._convert_with_links(responsemessage, pecan.request.host_url,
+                                       expand, fields)
+
+
+serializers.register(ResponseMessage, objects.ResponseMessage,
+                     'responsemessages', _DEFAULT_RETURN_FIELDS)
 
 
 class ResponseMessageCollection(collection.Collection):
@@ -81,11 +91,14 @@ class ResponseMessageCollection(collection.Collection):
         self._type = 'responsemessages'
 
     @staticmethod
-    def convert_with_links(rpc_responsemessages, limit, url=None, expand=False, **kwargs):
+    def convert_with_links(rpc_responsemessages, limit, url=None, expand=False,
+                           fields=None, **kwargs):
         collection = ResponseMessageCollection()
-        collection.responsemessages = [ResponseMessage.convert_with_links(p, expand)
+        collection.responsemessages = [ResponseMessage.convert_with_links(p, expand, fields)
                                 for p in rpc_responsemessages]
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, fields=fields,
+                                              rpc_items=rpc_responsemessages,
+                                              **kwargs)
         return collection
 
 
@@ -94,40 +107,67 @@ class ResponseMessagesController(rest.RestController):
     def __init__(self):
         super(ResponseMessagesController, self).__init__()
 
+    _custom_actions = {
+        'bulk': ['POST'],
+    }
+
     def _get_responsemessages_collection(self, marker, limit, sort_key,
-                                  sort_dir, expand=False, resource_url=None):
+                                  sort_dir, expand=False, resource_url=None,
+                                  fields=None):
 
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
-
-        marker_obj = None
-        if marker:
-            marker_obj = objects.ResponseMessage.get_by_id(pecan.request.context,
-                                                    marker)
+        sort_keys = api_utils.get_sort_keys(sort_key)
+        fields = api_utils.validate_fields(fields, ResponseMessage, objects.ResponseMessage)
+        columns = api_utils.get_columns(
+            objects.ResponseMessage, fields,
+            None if expand else _DEFAULT_RETURN_FIELDS, sort_keys)
+        yield_per = api_utils.get_stream_batch_size()
+
+        marker_obj = api_utils.get_marker(objects.ResponseMessage, marker, sort_keys,
+                                          sort_dir)
+
+        if api_utils.is_conditional_get():
+            page = objects.ResponseMessage.list(
+                pecan.request.context, limit, marker_obj,
+                sort_key=sort_keys, sort_dir=sort_dir,
+                columns=api_utils.VALIDATOR_FIELDS)
+            not_modified = api_utils.check_collection_not_modified(page)
+            if not_modified:
+                return not_modified
 
         responsemessages = objects.ResponseMessage.list(pecan.request.context, limit,
-                                          marker_obj, sort_key=sort_key,
-                                          sort_dir=sort_dir)
-
-        return ResponseMessageCollection.convert_with_links(responsemessages, limit,
-                                                     url=resource_url,
-                                                     expand=expand,
-                                                     sort_key=sort_key,
-                                                     sort_dir=sort_dir)
-
-    @expose.expose(ResponseMessageCollection, types.uuid, int, wtypes.text,
-                   wtypes.text)
+                                          marker_obj, sort_key=sort_keys,
+                                          sort_dir=sort_dir,
+                                          columns=columns,
+                                          yield_per=yield_per)
+
+        if yield_per:
+            return ResponseMessageCollection.stream_with_links(
+                ResponseMessage, responsemessages, limit, url=resource_url,
+                expand=expand, fields=fields, sort_key=sort_key,
+                sort_dir=sort_dir)
+
+        api_utils.set_etag(responsemessages)
+        return ResponseMessageCollection.respond_with_links(
+            ResponseMessage, responsemessages, limit, url=resource_url,
+            expand=expand, fields=fields, sort_key=sort_key, sort_dir=sort_dir)
+
+    @expose.expose(ResponseMessageCollection, wtypes.text, int, wtypes.text,
+                   wtypes.text, wtypes.text)
     def get_all(self, marker=None, limit=None, sort_key='id',
-                sort_dir='asc'):
+                sort_dir='asc', fields=None):
         """Retrieve a list of responsemessages.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param fields: a comma separated list of fields to return.
         """
         context = pecan.request.context
-        return self._get_responsemessages_collection(marker, limit, sort_key, sort_dir)
+        return self._get_responsemessages_collection(marker, limit, sort_key, sort_dir,
+                                                     fields=fields)
 
     @expose.expose(ResponseMessage, body=ResponseMessage, status_message=201)
     def post(self, responsemessage):
@@ -153,3 +193,23 @@ class ResponseMessagesController(rest.RestController):
         # pecan.response.location = link.build_url('functions',
         #                                          function.id)
         return ResponseMessage.convert_with_links(responsemessage)
+
+    @expose.expose(ResponseMessageCollection, body=[ResponseMessage],
+                   status_code=201)
+    def bulk(self, items):
+        """Create several response messages in one transaction.
+
+        Every item is validated before any of them is created, so either
+        all of them are created or none is.
+
+        :param items: a list of response messages within the request body.
+        :returns: the created response messages, in the order they were given.
+        """
+        context = pecan.request.context
+        values_list = [item.as_dict() for item in items]
+        api_utils.validate_bulk(values_list, objects.ResponseCode,
+                                'response_statuscode_id')
+
+        created = objects.ResponseMessage.create_many(context, values_list)
+        return ResponseMessageCollection.convert_with_links(created, None,
+                                                            expand=True)
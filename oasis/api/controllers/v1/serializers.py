@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Serializers of the API types, for the read paths.
+
+Building the wsme representation of an object sets every attribute
+through wsme's validating descriptors, and rendering it walks the type
+definition again. A serializer is compiled once per API type, when its
+module is loaded, and turns objects straight into the dicts wsme would
+have rendered: the exposed fields, the default fields and the link
+templates are worked out ahead, so serializing an object is a loop over
+its fields.
+
+The body is serialized by the controller and handed to the response by
+StreamingHook; wsme only renders an empty placeholder.
+"""
+
+import datetime
+import json
+
+from oslo_config import cfg
+import pecan
+
+CONF = cfg.CONF
+
+# API type -> Serializer
+_SERIALIZERS = {}
+
+
+class Serializer(object):
+    """Serializer of the objects of one API type.
+
+    :param api_cls: the API type, e.g. Function.
+    :param obj_cls: the object type it represents, e.g. objects.Function.
+    :param resource: the collection name used in links, e.g. 'functions'.
+    :param default_fields: the fields returned when the representation is
+                           not expanded.
+    :param always_links: whether links are also returned when the
+                         representation is expanded.
+    """
+
+    def __init__(self, api_cls, obj_cls, resource, default_fields,
+                 always_links=False):
+        self.api_cls = api_cls
+        # NOTE: the same fields the API type's __init__ copies.
+        self.fields = tuple(field for field in obj_cls.fields
+                            if hasattr(api_cls, field))
+        self.default_fields = tuple(field for field in self.fields
+                                    if field in default_fields)
+        self.resource = resource
+        self.links = hasattr(api_cls, 'links')
+        self.always_links = always_links
+        self._templates = {}
+
+    def _link_templates(self, host_url):
+        templates = self._templates.get(host_url)
+        if templates is None:
+            templates = ('%s/v1/%s/' % (host_url, self.resource),
+                         '%s/%s/' % (host_url, self.resource))
+            self._templates[host_url] = templates
+        return templates
+
+    def serialize(self, obj, host_url, expand=True, fields=None):
+        """Return the representation of obj, as JSON-ready values.
+
+        :param obj: the object to serialize.
+        :param host_url: the URL links are built from.
+        :param expand: whether all the fields are returned, rather than
+                       the requested or default ones.
+        :param fields: the fields to return when not expanded.
+        """
+        if expand:
+            names = self.fields
+        elif fields:
+            names = [field for field in self.fields if field in fields]
+        else:
+            names = self.default_fields
+
+        values = {}
+        for name in names:
+            if not obj.obj_attr_is_set(name):
+                continue
+            value = getattr(obj, name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            values[name] = value
+
+        if self.links and (self.always_links or not expand):
+            self_url, bookmark_url = self._link_templates(host_url)
+            values['links'] = [{'href': self_url + obj.id, 'rel': 'self'},
+                               {'href': bookmark_url + obj.id,
+                                'rel': 'bookmark'}]
+        return values
+
+
+def register(api_cls, obj_cls, resource, default_fields, always_links=False):
+    """Compile the serializer of an API type."""
+    _SERIALIZERS[api_cls] = Serializer(api_cls, obj_cls, resource,
+                                       default_fields, always_links)
+
+
+def get(api_cls):
+    """Return the serializer of an API type, or None if it is not used."""
+    if not CONF.api.fast_serializers:
+        return None
+    return _SERIALIZERS.get(api_cls)
+
+
+def set_body(values):
+    """Send values as the JSON body of the response."""
+    pecan.request.serialized_body = json.dumps(values).encode('utf-8')
+
+
+def respond(api_cls, obj):
+    """Return the representation of obj to a controller's caller.
+
+    :param api_cls: the API type the controller returns.
+    :param obj: the object to return.
+    """
+    serializer = get(api_cls)
+    if serializer is None:
+        return api_cls.convert_with_links(obj)
+    set_body(serializer.serialize(obj, pecan.request.host_url))
+    return api_cls()
@@ -12,18 +12,37 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import cProfile
+import math
+import os
+import time
 
 from oslo_config import cfg
+from oslo_log import log
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+from oslo_utils import uuidutils
 from pecan import hooks
+from webob import exc
 
+from oasis.api import rate_limit
 from oasis.common import context
+from oasis.common import metrics
+from oasis.common import policy
+from oasis.common import rpc_service
+from oasis.common import timing
 from oasis.conductor import api as conductor_api
+from oasis.db import api as db_api
 from oasis.agent import api as agent_api
+from oasis.i18n import _
+from oasis.i18n import _LI
 
 CONF = cfg.CONF
 CONF.import_opt('auth_uri', 'keystonemiddleware.auth_token',
                 group='keystone_authtoken')
 
+LOG = log.getLogger(__name__)
+
 
 class ContextHook(hooks.PecanHook):
     """Configures a request context and attaches it to the request.
@@ -80,10 +99,226 @@ class RPCHook(hooks.PecanHook):
     """Attach the rpcapi object to the request so controllers can get to it."""
 
     def before(self, state):
+        # NOTE: These objects only carry the request context. The transport
+        # and RPC clients are shared by the whole worker process and are
+        # created the first time a controller actually makes a call.
         state.request.conductor_rpcapi = conductor_api.API(context=state.request.context)
         state.request.agent_rpcapi = agent_api.AgentAPI(context=state.request.context)
 
 
+class MetricsHook(hooks.PecanHook):
+    """Count the requests served and the time spent on them."""
+
+    def before(self, state):
+        state.request.metrics_start = time.time()
+
+    def after(self, state):
+        start = getattr(state.request, 'metrics_start', None)
+        if start is None:
+            return
+        controller = getattr(state.controller, '__self__', None)
+        controller = type(controller).__name__ if controller else 'None'
+        method = state.request.method
+        metrics.API_REQUESTS.labels(
+            controller, method, str(state.response.status_int)).inc()
+        metrics.API_REQUEST_DURATION.labels(controller, method).observe(
+            time.time() - start)
+
+
+class TimingHook(hooks.PecanHook):
+    """Report where the time of a request went.
+
+    With the server_timing option set, the time spent validating the
+    token, running database queries, making RPC calls and hydrating
+    objects is returned in a Server-Timing header. 'other' is the rest of
+    the time spent in the application, mostly serialization, and 'app'
+    the total.
+
+    With the profile_dir option set, a request carrying the
+    X-Oasis-Profile header, from a user allowed by the api:profile
+    policy, is profiled and its cProfile stats dumped to profile_dir.
+    """
+
+    _PHASES = ('auth', 'db', 'rpc', 'hydrate', 'other', 'app')
+
+    def before(self, state):
+        if CONF.api.server_timing:
+            state.request.timings = timing.start()
+            state.request.timing_start = time.time()
+
+        if (CONF.api.profile_dir and
+                'X-Oasis-Profile' in state.request.headers and
+                policy.enforce(state.request.context, 'api:profile',
+                               do_raise=False)):
+            state.request.profiler = cProfile.Profile()
+            state.request.profiler.enable()
+
+    def after(self, state):
+        self._stop_profiler(state, dump=True)
+
+        timings = getattr(state.request, 'timings', None)
+        if timings is None:
+            return
+        state.request.timings = None
+        timing.stop()
+
+        start = state.request.timing_start
+        auth_start = state.request.environ.get('oasis.auth_start')
+        if auth_start is not None:
+            timings.add('auth', start - auth_start)
+        app = time.time() - start
+        other = app - sum(timings.get(phase)
+                          for phase in ('db', 'rpc', 'hydrate'))
+        timings.add('other', max(other, 0))
+        timings.add('app', app)
+        state.response.headers['Server-Timing'] = timings.to_header(
+            self._PHASES)
+
+    def on_error(self, state, e):
+        # NOTE: 'after' hooks are skipped when an unexpected exception
+        # escapes, so never leave the profiler running.
+        self._stop_profiler(state, dump=False)
+        timing.stop()
+
+    @staticmethod
+    def _stop_profiler(state, dump):
+        profiler = getattr(state.request, 'profiler', None)
+        if profiler is None:
+            return
+        state.request.profiler = None
+        profiler.disable()
+        if not dump:
+            return
+
+        request_id = (state.request.environ.get('openstack.request_id') or
+                      uuidutils.generate_uuid())
+        path = os.path.join(CONF.api.profile_dir, '%s-%s.prof' % (
+            timeutils.utcnow().strftime('%Y%m%d%H%M%S'), request_id))
+        profiler.dump_stats(path)
+        LOG.info(_LI('Profile of %(method)s %(url)s written to %(path)s'),
+                 {'method': state.request.method,
+                  'url': state.request.path_url, 'path': path})
+
+
+class DBSessionHook(hooks.PecanHook):
+    """Run each request in one database session and transaction.
+
+    The queries of a request share one pooled connection, and its writes
+    are committed together once it succeeded, or rolled back if it
+    failed. The writes made before an RPC call or cast are committed
+    before it, so they are kept even if the request fails afterwards.
+    """
+
+    def before(self, state):
+        if CONF.api.db_session_per_request:
+            dbapi = db_api.get_instance()
+            dbapi.begin_unit_of_work()
+            rpc_service.set_send_callback(dbapi.commit_unit_of_work)
+            state.request.unit_of_work = True
+
+    def after(self, state):
+        if getattr(state.request, 'unit_of_work', False):
+            state.request.unit_of_work = False
+            rpc_service.set_send_callback(None)
+            db_api.get_instance().end_unit_of_work(
+                commit=state.response.status_int < 400)
+
+    def on_error(self, state, e):
+        if getattr(state.request, 'unit_of_work', False):
+            state.request.unit_of_work = False
+            rpc_service.set_send_callback(None)
+            db_api.get_instance().end_unit_of_work(commit=False)
+
+
+class RateLimitHook(hooks.PecanHook):
+    """Admit requests within the rate limits of their project.
+
+    Each project has a token bucket per route class (read, write and
+    expensive) and a cap on the expensive requests it has in flight.
+    Requests over the limits are answered with 429 Too Many Requests and
+    a Retry-After header.
+    """
+
+    def before(self, state):
+        if not CONF.api.rate_limit_enabled:
+            return
+        project_id = state.request.context.project_id
+        if project_id is None:
+            return
+
+        route_class = rate_limit.get_route_class(state.request.method,
+                                                 state.request.path_info)
+        backend = rate_limit.get_backend()
+
+        # NOTE: the in-flight cap is checked first, so that a request it
+        # rejects does not use up a token of the bucket.
+        limit = CONF.api.rate_limit_max_inflight
+        key = None
+        if route_class == rate_limit.EXPENSIVE and limit:
+            key = '%s:inflight' % project_id
+            if not backend.acquire(key, limit):
+                self._reject(_('Too many operations in progress, at most '
+                               '%d are allowed.') % limit, 1)
+
+        rate, burst = rate_limit.get_limits(route_class)
+        if rate > 0:
+            wait = backend.consume('%s:%s' % (project_id, route_class),
+                                   rate, burst)
+            if wait:
+                if key is not None:
+                    backend.release(key)
+                self._reject(_('Rate limit exceeded for %s requests.') %
+                             route_class, wait)
+        state.request.rate_limit_inflight = key
+
+    def after(self, state):
+        key = getattr(state.request, 'rate_limit_inflight', None)
+        if key is not None:
+            rate_limit.get_backend().release(key)
+
+    @staticmethod
+    def _reject(message, retry_after):
+        error = exc.HTTPTooManyRequests(
+            headers={'Retry-After': str(int(math.ceil(retry_after)))})
+        error.content_type = 'application/json'
+        error.body = jsonutils.dump_as_bytes({'faultcode': 'Client',
+                                              'faultstring': message,
+                                              'debuginfo': None})
+        raise error
+
+
+class StreamingHook(hooks.PecanHook):
+    """Send a response body built by the controller instead of wsme.
+
+    The controllers return an empty placeholder to wsme and leave the real
+    JSON body on the request. A body serialized by the serializers of the
+    API types replaces the rendered placeholder. A collection streamed by
+    Collection.stream_with_links is a generator, which this hook swaps in
+    as the response's app_iter, so the body is written while the database
+    cursor is still being read.
+    """
+
+    def after(self, state):
+        serialized_body = getattr(state.request, 'serialized_body', None)
+        if (serialized_body is not None and
+                state.response.status_int == 200):
+            state.response.body = serialized_body
+
+        body = getattr(state.request, 'stream_body', None)
+        if body is None:
+            return
+
+        if state.response.status_int != 200:
+            # Release the database cursor held by the generator.
+            body.close()
+            return
+
+        state.response.app_iter = body
+        state.response.content_length = None
+        # Tells CoalesceMiddleware not to buffer the body.
+        state.request.environ['oasis.streamed'] = True
+
+
 class NoExceptionTracebackHook(hooks.PecanHook):
     """Workaround rpc.common: deserialize_remote_exception.
 
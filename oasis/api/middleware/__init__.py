@@ -11,10 +11,14 @@
 # under the License.
 
 from oasis.api.middleware import auth_token
+from oasis.api.middleware import coalesce
+from oasis.api.middleware import compression
 from oasis.api.middleware import parsable_error
 
 
 AuthTokenMiddleware = auth_token.AuthTokenMiddleware
+CoalesceMiddleware = coalesce.CoalesceMiddleware
+CompressionMiddleware = compression.CompressionMiddleware
 ParsableErrorMiddleware = parsable_error.ParsableErrorMiddleware
 
 __all__ = (ParsableErrorMiddleware,)
\ No newline at end of file
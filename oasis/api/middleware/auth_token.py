@@ -11,13 +11,16 @@
 # under the License.
 
 import re
+import time
 
 from keystonemiddleware import auth_token
 from oslo_log import log
 
+from oasis.api import token_cache
 from oasis.common import exception
 from oasis.common import utils
 from oasis.i18n import _
+from oasis.i18n import _LW
 
 LOG = log.getLogger(__name__)
 
@@ -29,6 +32,10 @@ class AuthTokenMiddleware(auth_token.AuthProtocol):
     for public routes in the API.
 
     """
+    # NOTE: keystonemiddleware 4.5.0 logs a cached rejected token through
+    # self._LOG, which it never sets.
+    _LOG = LOG
+
     def __init__(self, app, conf, public_api_routes=None):
         if public_api_routes is None:
             public_api_routes = []
@@ -45,7 +52,28 @@ class AuthTokenMiddleware(auth_token.AuthProtocol):
 
         super(AuthTokenMiddleware, self).__init__(app, conf)
 
+        # NOTE: keystonemiddleware's own memcached entries must be
+        # authenticated so that they cannot be forged.
+        if (token_cache.get_cache() is None and
+                self._conf_get('memcached_servers') and
+                (self._conf_get('memcache_security_strategy') or
+                 'none').lower() == 'none'):
+            LOG.warning(_LW('Tokens are cached on memcached without '
+                            'integrity protection. Set '
+                            '[keystone_authtoken]memcache_security_strategy '
+                            'to MAC or ENCRYPT.'))
+
+    def _token_cache_factory(self):
+        # NOTE: keystonemiddleware keeps validating tokens and checking
+        # revocations; only the storage of its cache is replaced.
+        cache = token_cache.get_cache()
+        if cache is None:
+            return super(AuthTokenMiddleware, self)._token_cache_factory()
+        return cache
+
     def __call__(self, env, start_response):
+        # Lets the timing hook tell how long token validation took.
+        env['oasis.auth_start'] = time.time()
         path = utils.safe_rstrip(env.get('PATH_INFO'), '/')
 
         # The information whether the API call is being performed against the
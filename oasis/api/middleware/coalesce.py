@@ -0,0 +1,271 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Middleware to serve identical concurrent GET requests with one response.
+
+With [api]coalesce_gets set, a GET request identical to one in progress
+in the same API worker waits for it and is answered with a copy of its
+status, headers and body, instead of querying the database and
+serializing the response again. Requests are identical when they have
+the same project, user, roles, path, query string and If-None-Match
+header, which is everything the policy checks and the response depend
+on.
+
+A successful response is also reused for [api]coalesce_ttl seconds after
+it completed, if that is set. It sits behind the authentication
+middleware, which sets the project, user and roles of the request.
+
+The headers describing one request only, its request id and timings, are
+not copied: the other requests are given their own request id and, with
+[api]server_timing set, the time they spent authenticating and waiting.
+
+A streamed response, such as a collection with [api]stream_collections
+set, is sent as it is produced and never shared. The requests waiting on
+it run the application themselves.
+"""
+
+import collections
+import time
+
+from eventlet.green import threading
+from oslo_config import cfg
+
+from oasis.common import metrics
+from oasis.common import timing
+
+CONF = cfg.CONF
+
+_COALESCER = None
+_COALESCER_LOCK = threading.Lock()
+
+# The headers of a response that belong to the request that produced it.
+_PER_REQUEST_HEADERS = frozenset(['x-openstack-request-id', 'server-timing'])
+
+
+class _Call(object):
+    """A response computed once for the requests waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.expires = 0
+
+
+class Coalescer(object):
+    """Run one computation per key at a time and share its result.
+
+    :param maxsize: the maximum number of completed results kept.
+    :param ttl: the seconds a result is reused for after it completed.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.leaders = 0
+        self.coalesced = 0
+        self.cached = 0
+        self._calls = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, key, compute, reusable, shareable=None):
+        """Return the result of compute for key, computing it at most once.
+
+        :param key: the key of the computation.
+        :param compute: the callable computing the result.
+        :param reusable: a callable telling whether a result may be reused
+                         once it completed.
+        :param shareable: a callable telling whether a result may be given
+                          to the computations waiting on it at all; those
+                          waiting on one that may not run compute
+                          themselves.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if (call is not None and call.done.is_set() and
+                    call.expires <= time.time()):
+                del self._calls[key]
+                call = None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                if call.done.is_set():
+                    self.cached += 1
+                    result = 'cached'
+                else:
+                    self.coalesced += 1
+                    result = 'coalesced'
+                leader = False
+
+        if not leader:
+            metrics.API_COALESCED_REQUESTS.labels(result).inc()
+            call.done.wait()
+            if call.response is None:
+                # The computation failed or its result is not shared; run
+                # it again for this request.
+                return compute()
+            return call.response
+
+        response = None
+        try:
+            response = compute()
+            if shareable is None or shareable(response):
+                call.response = response
+        finally:
+            with self._lock:
+                if (call.response is not None and self.ttl and
+                        reusable(call.response)):
+                    call.expires = time.time() + self.ttl
+                    self._evict()
+                elif self._calls.get(key) is call:
+                    del self._calls[key]
+                call.done.set()
+        metrics.API_COALESCED_REQUESTS.labels('leader').inc()
+        return response
+
+    def _evict(self):
+        """Drop the oldest completed results over maxsize."""
+        completed = [key for key, call in self._calls.items()
+                     if call.done.is_set()]
+        for key in completed[:max(len(completed) + 1 - self.maxsize, 0)]:
+            del self._calls[key]
+
+    def stats(self):
+        """Return the results kept and the coalescing counters."""
+        with self._lock:
+            return {'size': len(self._calls),
+                    'maxsize': self.maxsize,
+                    'leaders': self.leaders,
+                    'coalesced': self.coalesced,
+                    'cached': self.cached}
+
+
+def get_coalescer():
+    """Return the coalescer, or None if GET requests are not coalesced."""
+    global _COALESCER
+    if not CONF.api.coalesce_gets:
+        return None
+    if _COALESCER is None:
+        with _COALESCER_LOCK:
+            if _COALESCER is None:
+                _COALESCER = Coalescer(CONF.api.coalesce_cache_size,
+                                       CONF.api.coalesce_ttl)
+    return _COALESCER
+
+
+def get_key(environ):
+    """Return the key of a GET request, or None if it is not coalesced."""
+    project_id = environ.get('HTTP_X_PROJECT_ID')
+    user_id = environ.get('HTTP_X_USER_ID')
+    if not project_id or not user_id or 'HTTP_X_OASIS_PROFILE' in environ:
+        return None
+    roles = environ.get('HTTP_X_ROLES', '').split(',')
+    roles = tuple(sorted(set(role.strip().lower() for role in roles
+                             if role.strip())))
+    # NOTE: the user is part of the key since rules like admin_or_user
+    # match the user of the request against the resource.
+    return (project_id, user_id, roles,
+            environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', ''),
+            environ.get('QUERY_STRING', ''),
+            environ.get('HTTP_IF_NONE_MATCH'))
+
+
+class CoalesceMiddleware(object):
+    """Answer identical concurrent GET requests with one response."""
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        coalescer = None
+        if environ.get('REQUEST_METHOD') == 'GET':
+            coalescer = get_coalescer()
+        key = get_key(environ) if coalescer is not None else None
+        if key is None:
+            return self.app(environ, start_response)
+
+        start = time.time()
+        own = {}
+
+        def compute():
+            status, headers, body = self._call_app(environ)
+            own['headers'] = headers
+            shared = tuple((name, value) for name, value in headers
+                           if name.lower() not in _PER_REQUEST_HEADERS)
+            return status, shared, body
+
+        status, headers, body = coalescer.run(
+            key, compute, lambda response: response[0].startswith('200'),
+            lambda response: isinstance(response[2], bytes))
+        if 'headers' in own:
+            # The request that computed the response keeps its own headers.
+            headers = list(own['headers'])
+        else:
+            headers = list(headers) + self._own_headers(environ, start)
+        start_response(status, headers)
+        if isinstance(body, bytes):
+            return [body]
+        return body
+
+    def _own_headers(self, environ, start):
+        """Return the per request headers of a request given a copy."""
+        headers = []
+        request_id = environ.get('openstack.request_id')
+        if request_id:
+            headers.append(('X-OpenStack-Request-Id', request_id))
+        if CONF.api.server_timing:
+            timings = timing.Timings()
+            auth_start = environ.get('oasis.auth_start')
+            if auth_start is not None:
+                timings.add('auth', start - auth_start)
+            timings.add('coalesce', time.time() - start)
+            headers.append(('Server-Timing',
+                            timings.to_header(('auth', 'coalesce'))))
+        return headers
+
+    def _call_app(self, environ):
+        """Run the application and return its status, headers and body.
+
+        The body is the bytes of the response, or the application's
+        iterator if the response is streamed.
+        """
+        response = {}
+        chunks = []
+
+        def capture_start_response(status, headers, exc_info=None):
+            response['status'] = status
+            response['headers'] = headers
+            return chunks.append
+
+        app_iter = self.app(environ, capture_start_response)
+        if environ.get('oasis.streamed'):
+            # NOTE: buffering the body would hold all of it in memory,
+            # which streaming avoids.
+            return response['status'], tuple(response['headers']), app_iter
+
+        try:
+            chunks.extend(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        body = b''.join(chunks)
+        headers = [(name, value) for name, value in response['headers']
+                   if name.lower() != 'content-length']
+        headers.append(('Content-Length', str(len(body))))
+        return response['status'], tuple(headers), body
+
+    @classmethod
+    def factory(cls, global_config, **local_conf):
+        def _factory(app):
+            return cls(app)
+        return _factory
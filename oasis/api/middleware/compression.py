@@ -0,0 +1,195 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Middleware to compress response bodies with gzip or deflate.
+
+The encoding is negotiated on the Accept-Encoding request header. Bodies
+are compressed while they are sent, so streamed responses are never
+buffered in memory.
+
+It is not in the default pipeline; the compression filter of
+etc/oasis/api-paste.ini tells how to add it.
+"""
+
+import zlib
+
+from oslo_log import log
+
+from oasis.common import exception
+from oasis.common import metrics
+from oasis.i18n import _
+
+LOG = log.getLogger(__name__)
+
+# Window bits selecting the gzip and the zlib (HTTP "deflate") formats.
+_WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+_DEFAULT_MIME_TYPES = 'application/json,text/plain,text/html'
+
+
+def _parse_accept_encoding(header):
+    """Return the codings of an Accept-Encoding header with their q-value."""
+    accepted = {}
+    for item in header.split(','):
+        params = item.split(';')
+        coding = params[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            name, sep, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class CompressionMiddleware(object):
+    """Compress response bodies the client accepts compressed."""
+    def __init__(self, app, minimum_size=1024, compress_level=6,
+                 mime_types=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compress_level = compress_level
+        self.mime_types = set(mime_types or
+                              _DEFAULT_MIME_TYPES.split(','))
+
+    def _negotiate(self, environ):
+        accepted = _parse_accept_encoding(
+            environ.get('HTTP_ACCEPT_ENCODING', ''))
+        wildcard = accepted.get('*', 0.0)
+        best = None
+        best_quality = 0.0
+        for coding in ('gzip', 'deflate'):
+            quality = accepted.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def _should_compress(self, status, headers):
+        if not status.startswith('200'):
+            return False
+        content_length = None
+        for name, value in headers:
+            name = name.lower()
+            if name == 'content-encoding':
+                return False
+            elif name == 'content-type':
+                if value.split(';')[0].strip() not in self.mime_types:
+                    return False
+            elif name == 'content-length':
+                content_length = int(value)
+        # NOTE: streamed responses carry no Content-Length; they are
+        # always compressed, since only large collections are streamed.
+        return content_length is None or content_length >= self.minimum_size
+
+    def __call__(self, environ, start_response):
+        encoding = self._negotiate(environ)
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        # The ETag of a compressed body is suffixed with the encoding, so
+        # strip the suffix from If-None-Match before the application
+        # compares it with the ETag of the identity body.
+        suffix = '-%s"' % encoding
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            environ['HTTP_IF_NONE_MATCH'] = if_none_match.replace(suffix, '"')
+
+        state = {'compress': False}
+
+        def replacement_start_response(status, headers, exc_info=None):
+            """Rewrite the headers of a response that will be compressed."""
+            if exc_info is None and self._should_compress(status, headers):
+                state['compress'] = True
+                new_headers = []
+                for name, value in headers:
+                    lname = name.lower()
+                    if lname == 'content-length':
+                        continue
+                    elif lname == 'etag' and value.endswith('"'):
+                        value = value[:-1] + suffix
+                    elif lname == 'vary':
+                        continue
+                    new_headers.append((name, value))
+                new_headers.append(('Content-Encoding', encoding))
+                new_headers.append(('Vary', 'Accept-Encoding'))
+                headers = new_headers
+            elif status.startswith('304'):
+                # The client validated a compressed copy; keep its ETag.
+                headers = [(name, value[:-1] + suffix)
+                           if name.lower() == 'etag' and value.endswith('"')
+                           else (name, value)
+                           for name, value in headers]
+            return start_response(status, headers, exc_info)
+
+        app_iter = self.app(environ, replacement_start_response)
+        if not state['compress']:
+            return app_iter
+        return self._compress(app_iter, encoding)
+
+    def _compress(self, app_iter, encoding):
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED,
+                                      _WBITS[encoding])
+        bytes_in = 0
+        bytes_out = 0
+        try:
+            for chunk in app_iter:
+                bytes_in += len(chunk)
+                data = compressor.compress(chunk)
+                if data:
+                    bytes_out += len(data)
+                    yield data
+            data = compressor.flush()
+            bytes_out += len(data)
+            yield data
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+            metrics.API_COMPRESSION_BYTES_IN.labels().inc(bytes_in)
+            metrics.API_COMPRESSION_BYTES_SAVED.labels().inc(
+                bytes_in - bytes_out)
+            LOG.debug('Compressed response with %(encoding)s from '
+                      '%(in)d to %(out)d bytes',
+                      {'encoding': encoding, 'in': bytes_in,
+                       'out': bytes_out})
+
+    @classmethod
+    def factory(cls, global_config, **local_conf):
+        try:
+            minimum_size = int(local_conf.get('minimum_size', 1024))
+            compress_level = int(local_conf.get('compress_level', 6))
+        except ValueError as e:
+            msg = _('Invalid compression middleware option: %s') % e
+            LOG.error(msg)
+            raise exception.ConfigInvalid(error_msg=msg)
+        if not 1 <= compress_level <= 9:
+            msg = (_('Invalid compression level %d, must be between '
+                     '1 and 9') % compress_level)
+            LOG.error(msg)
+            raise exception.ConfigInvalid(error_msg=msg)
+        mime_types = [m.strip() for m in
+                      local_conf.get('mime_types',
+                                     _DEFAULT_MIME_TYPES).split(',')
+                      if m.strip()]
+
+        def _factory(app):
+            return cls(app, minimum_size=minimum_size,
+                       compress_level=compress_level,
+                       mime_types=mime_types)
+        return _factory
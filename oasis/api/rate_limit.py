@@ -0,0 +1,181 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Per-project admission control for the Oasis API.
+
+Requests are sorted into route classes, each with a token bucket per
+project. Expensive requests, which fan out into conductor, agent and Heat
+calls, are also capped by the number a project may have in flight.
+
+The bucket state lives in a backend loaded from the
+``oasis.api.rate_limit_backend`` entry point namespace, so that it can be
+shared by all the API workers.
+"""
+
+import abc
+import math
+import threading
+import time
+
+import memcache
+from oslo_config import cfg
+import six
+from stevedore import driver
+
+CONF = cfg.CONF
+
+READ = 'read'
+WRITE = 'write'
+EXPENSIVE = 'expensive'
+
+_WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_BACKEND = None
+
+# Seconds after which an in-flight count kept on memcached is dropped, so
+# that the counts of a worker which died with requests in flight recover.
+_INFLIGHT_TTL = 3600
+
+
+@six.add_metaclass(abc.ABCMeta)
+class RateLimitBackend(object):
+    """Base class for the storage of token buckets and in-flight counts."""
+
+    @abc.abstractmethod
+    def consume(self, key, rate, burst):
+        """Take one token from a bucket.
+
+        :param key: the bucket key.
+        :param rate: the tokens added to the bucket per second.
+        :param burst: the size of the bucket.
+        :returns: 0 if a token was taken, else the seconds until one is
+                  available.
+        """
+
+    @abc.abstractmethod
+    def acquire(self, key, limit):
+        """Count one more operation in flight, unless limit is reached.
+
+        :returns: True if the operation was counted.
+        """
+
+    @abc.abstractmethod
+    def release(self, key):
+        """Count one operation in flight less."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """Keep the buckets in the memory of the API worker.
+
+    Every worker process enforces the limits on its own, so the effective
+    rate of a deployment is the configured rate times the worker count.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, burst):
+        with self._lock:
+            now = time.time()
+            tokens, stamp = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - stamp) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1, now)
+            return 0
+
+    def acquire(self, key, limit):
+        with self._lock:
+            count = self._inflight.get(key, 0)
+            if count >= limit:
+                return False
+            self._inflight[key] = count + 1
+            return True
+
+    def release(self, key):
+        with self._lock:
+            count = self._inflight.get(key, 0) - 1
+            if count > 0:
+                self._inflight[key] = count
+            else:
+                self._inflight.pop(key, None)
+
+
+class MemcachedBackend(RateLimitBackend):
+    """Keep the buckets on the memcached servers shared by the API workers.
+
+    Every API worker and host counts against the same limits. The bucket
+    of a key is approximated by a counter per window of burst / rate
+    seconds, the time an empty bucket takes to fill: at most burst
+    requests are admitted per window. The counters are updated with the
+    atomic add and incr commands. If memcached cannot be reached, requests
+    are admitted.
+    """
+
+    def __init__(self):
+        self._client = memcache.Client(
+            CONF.api.rate_limit_memcached_servers,
+            socket_timeout=CONF.api.rate_limit_memcached_timeout)
+
+    def _incr(self, key, ttl):
+        self._client.add(key, '0', time=ttl)
+        return self._client.incr(key)
+
+    def consume(self, key, rate, burst):
+        now = time.time()
+        window = burst / float(rate)
+        slot = int(now // window)
+        count = self._incr('oasis-rate:%s:%d' % (key, slot),
+                           int(math.ceil(window)) + 1)
+        if count is None or count <= burst:
+            return 0
+        return (slot + 1) * window - now
+
+    def acquire(self, key, limit):
+        key = 'oasis-inflight:%s' % key
+        count = self._incr(key, _INFLIGHT_TTL)
+        if count is None:
+            return True
+        if count > limit:
+            self._client.decr(key)
+            return False
+        return True
+
+    def release(self, key):
+        self._client.decr('oasis-inflight:%s' % key)
+
+
+def get_backend():
+    global _BACKEND
+    if _BACKEND is None:
+        _BACKEND = driver.DriverManager('oasis.api.rate_limit_backend',
+                                        CONF.api.rate_limit_backend,
+                                        invoke_on_load=True).driver
+    return _BACKEND
+
+
+def get_route_class(method, path):
+    """Return the route class of a request."""
+    if method not in _WRITE_METHODS:
+        return READ
+    for prefix in CONF.api.rate_limit_expensive_paths:
+        if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+            return EXPENSIVE
+    return WRITE
+
+
+def get_limits(route_class):
+    """Return the (rate, burst) of the buckets of a route class."""
+    return (getattr(CONF.api, 'rate_limit_%s_rate' % route_class),
+            getattr(CONF.api, 'rate_limit_%s_burst' % route_class))
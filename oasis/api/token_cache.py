@@ -0,0 +1,200 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Cache of the tokens validated by the API.
+
+The cache takes the place of keystonemiddleware's own token cache, so the
+middleware still validates the tokens it does not find and checks the
+revocation of those it does. A validated token is cached until it
+expires, or for token_cache_ttl seconds if that is sooner; a token
+keystone rejected is remembered for token_cache_negative_ttl seconds.
+
+The entries are kept in a backend loaded from the
+``oasis.api.token_cache_backend`` entry point namespace. Keys are hashes
+of the token, so the token itself is never stored.
+"""
+
+import abc
+import collections
+import hashlib
+import hmac
+import threading
+import time
+
+import memcache
+from oslo_config import cfg
+from oslo_log import log
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+import six
+from stevedore import driver
+
+from oasis.common import exception
+from oasis.i18n import _
+from oasis.i18n import _LW
+
+CONF = cfg.CONF
+
+LOG = log.getLogger(__name__)
+
+# What keystonemiddleware caches in place of the data of a token keystone
+# rejected.
+INVALID = 'invalid'
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+@six.add_metaclass(abc.ABCMeta)
+class TokenCacheBackend(object):
+    """Base class for the storage of validated tokens."""
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Return the value cached under key, or None."""
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl):
+        """Cache value under key for ttl seconds."""
+
+
+class MemoryBackend(TokenCacheBackend):
+    """Bounded LRU cache in the memory of the API worker."""
+
+    def __init__(self):
+        self.maxsize = CONF.api.token_cache_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.time():
+                return None
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class MemcachedBackend(TokenCacheBackend):
+    """Cache shared by the API workers, on memcached servers.
+
+    Anyone who can write to memcached could otherwise store token data of
+    their choosing, so every entry carries an HMAC-SHA256 of its key and
+    value under token_cache_secret_key, and an entry with a wrong MAC is
+    handled as a miss. If memcached cannot be reached, tokens are
+    validated with keystone.
+    """
+
+    def __init__(self):
+        if not CONF.api.token_cache_secret_key:
+            raise exception.ConfigInvalid(
+                error_msg=_('[api]token_cache_secret_key is required by '
+                            'the memcached token cache.'))
+        self._secret = CONF.api.token_cache_secret_key.encode('utf-8')
+        self._client = memcache.Client(
+            CONF.api.token_cache_memcached_servers,
+            socket_timeout=CONF.api.token_cache_memcached_timeout)
+
+    def _mac(self, key, data):
+        return hmac.new(self._secret, key.encode('utf-8') + b'\n' + data,
+                        hashlib.sha256).hexdigest().encode('ascii')
+
+    def get(self, key):
+        entry = self._client.get(key)
+        if entry is None:
+            return None
+        mac, sep, data = entry.partition(b':')
+        if not hmac.compare_digest(mac, self._mac(key, data)):
+            LOG.warning(_LW('Ignored a token cache entry with an invalid '
+                            'MAC.'))
+            return None
+        return jsonutils.loads(data.decode('utf-8'))
+
+    def set(self, key, value, ttl):
+        data = jsonutils.dump_as_bytes(value)
+        self._client.set(key, self._mac(key, data) + b':' + data,
+                         time=int(ttl))
+
+
+class TokenCache(object):
+    """The token cache, as keystonemiddleware uses it.
+
+    :param backend: the TokenCacheBackend the entries are kept in.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def initialize(self, env):
+        pass
+
+    def get(self, token_id):
+        if not token_id:
+            return None
+        return self.backend.get(get_key(token_id))
+
+    def set(self, token_id, data):
+        if data == INVALID:
+            ttl = CONF.api.token_cache_negative_ttl
+        else:
+            ttl = get_ttl(data)
+        if ttl > 0:
+            self.backend.set(get_key(token_id), data, ttl)
+
+
+def get_cache():
+    """Return the token cache, or None if the cache is disabled."""
+    global _CACHE
+    if not CONF.api.token_cache_enabled:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                backend = driver.DriverManager(
+                    'oasis.api.token_cache_backend',
+                    CONF.api.token_cache_backend,
+                    invoke_on_load=True).driver
+                _CACHE = TokenCache(backend)
+    return _CACHE
+
+
+def get_key(token):
+    """Return the cache key of a token, which never stores the token."""
+    if isinstance(token, six.text_type):
+        token = token.encode('utf-8')
+    return 'oasis-token:%s' % hashlib.sha256(token).hexdigest()
+
+
+def get_ttl(data):
+    """Return the seconds a validated token may be cached for.
+
+    :param data: the token data returned by keystone, v2 or v3.
+    """
+    try:
+        if 'token' in data:
+            expires = data['token']['expires_at']
+        else:
+            expires = data['access']['token']['expires']
+        expires = timeutils.normalize_time(timeutils.parse_isotime(expires))
+    except (KeyError, TypeError, ValueError):
+        return 0
+    remaining = timeutils.delta_seconds(timeutils.utcnow(), expires)
+    return min(CONF.api.token_cache_ttl, int(remaining))
@@ -13,13 +13,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
+import collections
+import datetime
+import errno
+import hashlib
+import hmac
+import os
+
 import jsonpatch
 from oslo_config import cfg
+from oslo_serialization import jsonutils
 from oslo_utils import uuidutils
 import pecan
+import six
 import wsme
 
 from oasis.common import exception
+from oasis.common import name_cache
+from oasis.common import paths
 from oasis.common import utils
 from oasis.i18n import _
 from oasis.i18n import _LE
@@ -35,6 +47,14 @@ JSONPATCH_EXCEPTIONS = (jsonpatch.JsonPatchException,
 
 DOCKER_MINIMUM_MEMORY = 4 * 1024 * 1024
 
+_MARKER_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# The fields an ETag is computed from.
+VALIDATOR_FIELDS = ['id', 'created_at', 'updated_at']
+
+# The generated pagination marker keys, by the path they are stored at.
+_MARKER_KEYS = {}
+
 
 def validate_limit(limit):
     if limit is not None and limit <= 0:
@@ -54,6 +74,265 @@ def validate_sort_dir(sort_dir):
     return sort_dir
 
 
+def get_sort_keys(sort_key):
+    """Return the columns a collection is sorted by.
+
+    :param sort_key: a column name or a comma separated list of them.
+    :returns: the list of sort keys, always ending with 'id' so that the
+              order is total.
+    """
+    keys = [k.strip() for k in (sort_key or '').split(',') if k.strip()]
+    return [k for k in keys if k != 'id'] + ['id']
+
+
+class _Marker(object):
+    """The sort key values of the last row of the previous page."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+def _marker_key():
+    """Return the key pagination markers are signed with.
+
+    Without [api]pagination_secret a random key is generated once and
+    kept in $state_path/pagination_secret, so markers stay valid across
+    the API workers of a host and over restarts.
+    """
+    key = CONF.api.pagination_secret
+    if not key:
+        path = paths.state_path_rel('pagination_secret')
+        key = _MARKER_KEYS.get(path)
+        if key is None:
+            key = _MARKER_KEYS.setdefault(path, _load_or_create_key(path))
+        return key
+    if isinstance(key, six.text_type):
+        key = key.encode('utf-8')
+    return key
+
+
+def _load_or_create_key(path):
+    """Return the key stored at path, storing a random one if there is none.
+
+    The key is written to a file of its own which is then linked to path,
+    so the workers starting together all read the key of the first one.
+    """
+    new_path = '%s.%d' % (path, os.getpid())
+    fd = os.open(new_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, utils.generate_password(length=64).encode('ascii'))
+    finally:
+        os.close(fd)
+    try:
+        os.link(new_path, path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+    finally:
+        os.unlink(new_path)
+
+    with open(path, 'rb') as f:
+        return f.read().strip()
+
+
+def _marker_signature(payload):
+    return hmac.new(_marker_key(), payload, hashlib.sha256).hexdigest()
+
+
+def encode_marker(obj, sort_keys, sort_dir):
+    """Encode the position after obj as an opaque, signed marker.
+
+    The marker carries the sort key values of obj, so the next page can be
+    fetched with a single keyset query, even if obj has since been deleted.
+    """
+    values = []
+    for key in sort_keys:
+        value = getattr(obj, key)
+        if isinstance(value, datetime.datetime):
+            value = {'dt': value.strftime(_MARKER_TIME_FORMAT)}
+        values.append(value)
+
+    data = jsonutils.dumps({'k': sort_keys, 'd': sort_dir, 'v': values})
+    payload = base64.urlsafe_b64encode(data.encode('utf-8')).rstrip(b'=')
+    return '%s.%s' % (payload.decode('ascii'), _marker_signature(payload))
+
+
+def decode_marker(marker, sort_keys, sort_dir):
+    """Decode a marker made by encode_marker.
+
+    :returns: an object with the sort key values as attributes, usable as
+              the marker of db_utils.paginate_query.
+    :raises: ClientSideError if the marker is malformed, was not signed by
+             this service or was made for another sort order.
+    """
+    invalid = wsme.exc.ClientSideError(_("Invalid pagination marker: %s")
+                                       % marker)
+    try:
+        payload, signature = marker.encode('ascii').rsplit(b'.', 1)
+        if not hmac.compare_digest(
+                _marker_signature(payload).encode('ascii'), signature):
+            raise invalid
+        data = jsonutils.loads(base64.urlsafe_b64decode(
+            payload + b'=' * (-len(payload) % 4)).decode('utf-8'))
+        if data['k'] != sort_keys or data['d'] != sort_dir:
+            raise invalid
+
+        values = {}
+        for key, value in zip(data['k'], data['v']):
+            if isinstance(value, dict):
+                value = datetime.datetime.strptime(value['dt'],
+                                                   _MARKER_TIME_FORMAT)
+            values[key] = value
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise invalid
+    return _Marker(values)
+
+
+def get_marker(obj_cls, marker, sort_keys, sort_dir):
+    """Return the marker to paginate a collection from.
+
+    :param obj_cls: the object type being listed.
+    :param marker: a marker from a next link, or the id of the last
+                   resource of the previous page.
+    :param sort_keys: the sort keys, as returned by get_sort_keys().
+    :param sort_dir: the sort direction.
+    """
+    if not marker:
+        return None
+    if uuidutils.is_uuid_like(marker):
+        # NOTE: plain ids are still accepted as markers, at the cost of
+        # loading that row first.
+        return obj_cls.get_by_id(pecan.request.context, marker)
+    return decode_marker(marker, sort_keys, sort_dir)
+
+
+def validate_fields(fields, api_cls, obj_cls):
+    """Parse the fields requested with the ``fields`` query parameter.
+
+    :param fields: a comma separated list of field names, or None.
+    :param api_cls: the API type the fields are returned on.
+    :param obj_cls: the object type the fields are loaded into.
+    :returns: a list of field names always including 'id', or None if no
+              fields were requested.
+    :raises: InvalidParameterValue if a field is not exposed by the API.
+    """
+    if not fields:
+        return None
+
+    valid_fields = [f for f in obj_cls.fields if hasattr(api_cls, f)]
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    invalid = [f for f in requested if f not in valid_fields]
+    if invalid:
+        raise exception.InvalidParameterValue(
+            _("Field(s) %(fields)s are invalid. Valid fields are: "
+              "%(valid)s") % {'fields': ', '.join(invalid),
+                              'valid': ', '.join(sorted(valid_fields))})
+
+    if 'id' not in requested:
+        requested.insert(0, 'id')
+    return requested
+
+
+def get_columns(obj_cls, fields=None, default=None, sort_keys=None):
+    """Return the object fields to load for a collection request.
+
+    :param obj_cls: the object type being listed.
+    :param fields: the fields requested by the client, if any.
+    :param default: the fields returned when none are requested, or None
+                    to return every field.
+    :param sort_keys: the sort keys, which are always loaded so that the
+                      next page marker can be built. The VALIDATOR_FIELDS
+                      are always loaded as well.
+    :returns: a list of field names, or None to load every field.
+    """
+    fields = fields or default
+    if fields is None:
+        return None
+    fields = set(fields) | set(sort_keys or []) | set(VALIDATOR_FIELDS)
+    return [f for f in obj_cls.fields if f in fields]
+
+
+def get_stream_batch_size():
+    """Return the batch size for streamed collections, or None if disabled."""
+    if CONF.api.stream_collections:
+        return CONF.api.stream_batch_size
+    return None
+
+
+def _format_time(value):
+    # NOTE: rows read from the database carry naive datetimes, objects
+    # carry UTC aware ones; both must give the same ETag.
+    return value.strftime(_MARKER_TIME_FORMAT) if value else ''
+
+
+def make_etag(validators):
+    """Compute the strong ETag of the current GET request.
+
+    The ETag covers the request URL, since the representation depends on
+    the query string, and the id and timestamps of every row the response
+    is built from.
+
+    :param validators: (id, created_at, updated_at) tuples.
+    """
+    digest = hashlib.sha1(pecan.request.url.encode('utf-8'))
+    for obj_id, created_at, updated_at in validators:
+        digest.update(('%s|%s|%s\n' % (obj_id, _format_time(created_at),
+                                       _format_time(updated_at))
+                       ).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_validators(objs):
+    """Return the validators of a list of objects, for make_etag()."""
+    return [(obj.id, obj.created_at, obj.updated_at) for obj in objs]
+
+
+def is_conditional_get():
+    """Return whether the request carries an If-None-Match header."""
+    return 'If-None-Match' in pecan.request.headers
+
+
+def not_modified(etag):
+    """Answer a conditional GET whose If-None-Match header matches etag.
+
+    :returns: a 304 response, or None if the ETag does not match.
+    """
+    if etag not in pecan.request.if_none_match:
+        return None
+    pecan.response.etag = etag
+    return wsme.api.Response(None, status_code=304, return_type=None)
+
+
+def check_resource_not_modified(obj_cls, resource_ident):
+    """Answer a conditional GET of one resource from a cheap query.
+
+    Only the id and timestamps of the resource are read, so nothing is
+    hydrated or serialized when the client's copy is still current.
+
+    :returns: a 304 response, or None if the request has to be served.
+    """
+    if not is_conditional_get() or not uuidutils.is_uuid_like(resource_ident):
+        return None
+    validator = obj_cls.get_validator(pecan.request.context, resource_ident)
+    if validator is None:
+        return None
+    return not_modified(make_etag([validator]))
+
+
+def check_collection_not_modified(objs):
+    """Answer a conditional GET of a collection page.
+
+    :param objs: the page, loaded with VALIDATOR_FIELDS only.
+    :returns: a 304 response, or None if the request has to be served.
+    """
+    return not_modified(make_etag(get_validators(objs)))
+
+
+def set_etag(objs):
+    """Set the ETag header of a response built from objs."""
+    pecan.response.etag = make_etag(get_validators(objs))
+
+
 def validate_docker_memory(mem_str):
     """Docker require that Minimum memory limit >= 4M."""
     try:
@@ -92,11 +371,97 @@ def get_resource(resource, resource_ident):
 
     :returns: The resource.
     """
-    resource = getattr(objects, resource)
+    context = pecan.request.context
+    resource_cls = getattr(objects, resource)
 
     if uuidutils.is_uuid_like(resource_ident):
-        return resource.get_by_id(pecan.request.context, resource_ident)
-    return resource.get_by_name(pecan.request.context, resource_ident)
+        return resource_cls.get_by_id(context, resource_ident)
+
+    cache = None
+    if resource in name_cache.RESOURCES:
+        cache = name_cache.get_cache()
+    if cache is not None:
+        resource_id = cache.get(resource, context.project_id, resource_ident)
+        if resource_id is not None:
+            try:
+                obj = resource_cls.get_by_id(context, resource_id)
+            except exception.ObjectNotFound:
+                obj = None
+            # NOTE: the resource may have been renamed or destroyed by
+            # another process since it was cached.
+            if obj is not None and obj.name == resource_ident:
+                return obj
+            cache.invalidate(resource, resource_id=resource_id)
+
+    obj = resource_cls.get_by_name(context, resource_ident)
+    if cache is not None:
+        cache.set(resource, context.project_id, resource_ident, obj.id)
+    return obj
+
+
+def get_batch(obj_cls, ids, columns=None):
+    """Load the resources of a batch GET with a single query.
+
+    :param obj_cls: the object type of the resources.
+    :param ids: the UUIDs requested by the client.
+    :param columns: the fields to load, or None to load every field.
+    :returns: the objects found, in the order their ids were requested,
+              and the requested ids which were not found.
+    """
+    ids = list(collections.OrderedDict.fromkeys(ids))
+    if len(ids) > CONF.api.max_batch_ids:
+        raise wsme.exc.ClientSideError(
+            _("At most %d ids can be requested at once.") %
+            CONF.api.max_batch_ids)
+    for resource_id in ids:
+        if not uuidutils.is_uuid_like(resource_id):
+            raise wsme.exc.ClientSideError(
+                _("Invalid id %s, a UUID is expected.") % resource_id)
+
+    objs = obj_cls.list_by_ids(pecan.request.context, ids, columns=columns)
+    objs_by_id = dict((obj.id, obj) for obj in objs)
+    return ([objs_by_id[i] for i in ids if i in objs_by_id],
+            [i for i in ids if i not in objs_by_id])
+
+
+def validate_bulk(items, parent_cls=None, parent_field=None):
+    """Validate the items of a bulk create before any of them is created.
+
+    :param items: the field values of the resources to create.
+    :param parent_cls: the object type of the resource each item belongs
+                       to, if any.
+    :param parent_field: the field of the items holding the parent id.
+    :raises: ClientSideError listing the position of every invalid item.
+    """
+    if not items:
+        raise wsme.exc.ClientSideError(_("No resources to create."))
+    if len(items) > CONF.api.max_bulk_items:
+        raise wsme.exc.ClientSideError(
+            _("At most %d resources can be created at once.") %
+            CONF.api.max_bulk_items)
+    if parent_cls is None:
+        return
+
+    parent_ids = set(item.get(parent_field) for item in items
+                     if uuidutils.is_uuid_like(item.get(parent_field)))
+    found = set()
+    if parent_ids:
+        found = set(obj.id for obj in parent_cls.list_by_ids(
+            pecan.request.context, list(parent_ids), columns=['id']))
+
+    errors = []
+    for index, item in enumerate(items):
+        parent_id = item.get(parent_field)
+        if parent_id is None:
+            errors.append(_("item %(index)d: %(field)s is required.") %
+                          {'index': index, 'field': parent_field})
+        elif parent_id not in found:
+            errors.append(_("item %(index)d: %(resource)s %(id)s could not "
+                            "be found.") %
+                          {'index': index, 'id': parent_id,
+                           'resource': parent_cls.obj_name()})
+    if errors:
+        raise wsme.exc.ClientSideError(' '.join(errors))
 
 
 def get_openstack_resource(manager, resource_ident, resource_type):
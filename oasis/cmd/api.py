@@ -14,13 +14,13 @@
 
 import os
 import sys
-from wsgiref import simple_server
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_service import service
 
 from oasis.api import app as api_app
-from oasis.common import service
+from oasis.common import service as oasis_service
 from oasis.i18n import _LI
 from oasis import version
 
@@ -29,18 +29,23 @@ LOG = logging.getLogger(__name__)
 
 
 def main():
-    service.prepare_service(sys.argv)
+    oasis_service.prepare_service(sys.argv)
+
+    # NOTE: Load the application once in the parent process so the workers
+    # forked by the launcher share it copy-on-write.
     app = api_app.load_app()
 
     # Create the WSGI server and start it
     host, port = cfg.CONF.api.host, cfg.CONF.api.port
-    srv = simple_server.make_server(host, port, app)
+    server = oasis_service.WSGIService('oasis_api', app)
 
     LOG.info(_LI('Starting server in PID %s'), os.getpid())
     LOG.debug("Configuration:")
     cfg.CONF.log_opt_values(LOG, logging.DEBUG)
 
-    LOG.info(_LI('serving on http://%(host)s:%(port)s'),
-             dict(host=host, port=port))
+    LOG.info(_LI('serving on http://%(host)s:%(port)s with %(workers)s '
+                 'workers'),
+             dict(host=host, port=port, workers=server.workers))
 
-    srv.serve_forever()
+    launcher = service.launch(cfg.CONF, server, workers=server.workers)
+    launcher.wait()
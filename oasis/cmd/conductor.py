@@ -22,10 +22,13 @@ from oslo_log import log as logging
 from oslo_reports import guru_meditation_report as gmr
 from oslo_service import service
 
+from oasis.common import metrics
 from oasis.common import rpc_service
 from oasis.common import service as oasis_service
 from oasis.common import short_id
 from oasis.conductor.handlers import conductor_listener
+from oasis.conductor.handlers import function_conductor
+from oasis.conductor.handlers import job_conductor
 from oasis.conductor.handlers import nodepool_conductor
 from oasis.i18n import _LE
 from oasis.i18n import _LI
@@ -48,9 +51,18 @@ def main():
     conductor_id = short_id.generate_id()
     endpoints = [
         conductor_listener.Handler(),
+        function_conductor.Handler(),
+        job_conductor.Handler(),
         nodepool_conductor.Handler()
     ]
 
+    if cfg.CONF.conductor.metrics_port:
+        metrics.start_server(cfg.CONF.conductor.metrics_host,
+                             cfg.CONF.conductor.metrics_port)
+        LOG.info(_LI('Serving metrics on %(host)s:%(port)s'),
+                 {'host': cfg.CONF.conductor.metrics_host,
+                  'port': cfg.CONF.conductor.metrics_port})
+
     server = rpc_service.Service.create(cfg.CONF.conductor.topic,
                                         conductor_id, endpoints,
                                         binary='oasis-conductor')
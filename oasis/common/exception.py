@@ -361,3 +361,15 @@ class HttpApiAlreadyExists(Conflict):
 
 class HttpApiNotFound(ResourceNotFound):
     message = _("Httpapi %(httpapi)s could not be found.")
+
+
+class JobAlreadyExists(Conflict):
+    message = _("A job with UUID %(uuid)s already exists.")
+
+
+class JobNotFound(ResourceNotFound):
+    message = _("Job %(job)s could not be found.")
+
+
+class ResourceAlreadyExists(Conflict):
+    message = _("A %(resource)s with the same key already exists.")
@@ -0,0 +1,276 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Process-wide metrics in the Prometheus text exposition format.
+
+Metrics are kept per process, so every API worker and conductor reports
+its own values, labelled with its pid so that a scraper can sum them.
+Only the creation of a labelled child takes a lock; updates are plain
+additions, which cannot interleave between the green threads the
+services run on.
+
+The metrics are served without authentication, on a side port of their
+own, never on the API port.
+"""
+
+import bisect
+import contextlib
+import errno
+import os
+import socket
+import threading
+import time
+
+import eventlet
+from eventlet import wsgi
+import six
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds, in seconds, of the buckets of latency histograms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return (six.text_type(value).replace('\\', '\\\\')
+            .replace('\n', '\\n').replace('"', '\\"'))
+
+
+def _format_labels(names, values, extra=None):
+    pairs = ['%s="%s"' % (n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        pairs.append('%s="%s"' % extra)
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric(object):
+    """A metric family, with one child per set of label values."""
+
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Return the child of the given label values, in labelnames order."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError('%s expects labels %s' %
+                                 (self.name, ', '.join(self.labelnames)))
+            with self._lock:
+                child = self._children.setdefault(values,
+                                                  self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError()
+
+    def _render_child(self, names, values, child):
+        raise NotImplementedError()
+
+    def render(self, const_labels=()):
+        """Return the lines of the metric.
+
+        :param const_labels: (name, value) pairs of the labels added to
+                             every sample, ahead of the metric labels.
+        """
+        const_names = tuple(name for name, _value in const_labels)
+        const_values = tuple(value for _name, value in const_labels)
+        names = const_names + self.labelnames
+        lines = ['# HELP %s %s' % (self.name, self.documentation),
+                 '# TYPE %s %s' % (self.name, self.type_name)]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(names, const_values + values,
+                                            child))
+        return lines
+
+
+class _Value(object):
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def _render_child(self, names, values, child):
+        return ['%s%s %s' % (self.name,
+                             _format_labels(names, values),
+                             _format_value(child.value))]
+
+
+class Gauge(Counter):
+    """A value that goes up and down."""
+
+    type_name = 'gauge'
+
+
+class _HistogramValue(object):
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextlib.contextmanager
+    def time(self):
+        """Observe the time spent in the block, in seconds."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(time.time() - start)
+
+
+class Histogram(_Metric):
+    """Observations counted in fixed buckets."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _render_child(self, names, values, child):
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),),
+                                child.counts):
+            total += count
+            lines.append('%s_bucket%s %d' % (
+                self.name,
+                _format_labels(names, values,
+                               ('le', _format_value(bound))),
+                total))
+        labels = _format_labels(names, values)
+        lines.append('%s_sum%s %s' % (self.name, labels,
+                                      _format_value(child.sum)))
+        lines.append('%s_count%s %d' % (self.name, labels, total))
+        return lines
+
+
+class Registry(object):
+    """The metrics of the process."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        const_labels = (('pid', os.getpid()),)
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(const_labels))
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+REGISTRY = Registry()
+
+API_REQUESTS = REGISTRY.register(Counter(
+    'oasis_api_requests_total',
+    'API requests served, by controller, HTTP method and status.',
+    ('controller', 'method', 'status')))
+API_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'oasis_api_request_duration_seconds',
+    'Time spent serving API requests, by controller and HTTP method.',
+    ('controller', 'method')))
+API_COMPRESSION_BYTES_IN = REGISTRY.register(Counter(
+    'oasis_api_compression_input_bytes_total',
+    'Bytes of the response bodies compressed by the API.'))
+API_COMPRESSION_BYTES_SAVED = REGISTRY.register(Counter(
+    'oasis_api_compression_saved_bytes_total',
+    'Bytes saved by compressing response bodies.'))
+API_COALESCED_REQUESTS = REGISTRY.register(Counter(
+    'oasis_api_coalesced_requests_total',
+    'GET requests by how they were answered when coalescing: leader '
+    'requests ran the application, coalesced ones waited for an identical '
+    'request in progress and cached ones reused a recent response.',
+    ('result',)))
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    'oasis_db_query_duration_seconds',
+    'Time spent executing database statements, by statement type.',
+    ('statement',)))
+DB_CONNECTION_CHECKOUTS = REGISTRY.register(Counter(
+    'oasis_db_connection_checkouts_total',
+    'Connections checked out of the database connection pool.'))
+RPC_CALL_DURATION = REGISTRY.register(Histogram(
+    'oasis_rpc_call_duration_seconds',
+    'Time spent in outgoing RPC calls and casts, by method.',
+    ('method', 'type')))
+HEAT_CALL_DURATION = REGISTRY.register(Histogram(
+    'oasis_heat_call_duration_seconds',
+    'Time spent in Heat API calls, by operation.',
+    ('operation',)))
+
+
+def wsgi_app(environ, start_response):
+    """Serve the metrics of the process."""
+    body = REGISTRY.render()
+    start_response('200 OK', [('Content-Type', CONTENT_TYPE),
+                              ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def start_server(host, port, ports=1):
+    """Serve the metrics of the process on a side port.
+
+    The server listens on the first free port of the ports ones starting
+    at port, so that the workers of a service sharing its configuration
+    each get their own, and runs in a green thread of the calling process.
+
+    :returns: the port listened on.
+    """
+    for candidate in range(port, port + ports):
+        try:
+            sock = eventlet.listen((host, candidate))
+        except socket.error as e:
+            if e.errno != errno.EADDRINUSE or candidate == port + ports - 1:
+                raise
+            continue
+        eventlet.spawn_n(wsgi.server, sock, wsgi_app, log_output=False)
+        return sock.getsockname()[1]
@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Cache of the ids of resources looked up by name.
+
+Entries are kept per project and expire after [api]name_cache_ttl
+seconds. The database API invalidates them when it creates, renames or
+destroys a resource; writes made by another process are only seen once
+the entry expires, which is why callers must check that the resource
+they load by id still has the name they asked for.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+
+CONF = cfg.CONF
+
+# The resources whose names are cached, and invalidated by the database
+# API when they change.
+RESOURCES = ('Endpoint', 'Function', 'NodePool', 'NodePoolPolicy')
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+class NameCache(object):
+    """Bounded LRU cache from (resource, project, name) to id.
+
+    The entries are also indexed by resource id and by name, so a write
+    invalidates them without scanning the cache.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._by_id = collections.defaultdict(set)
+        self._by_name = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, resource, project_id, name):
+        key = (resource, project_id, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, resource, project_id, name, resource_id):
+        key = (resource, project_id, name)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (resource_id, time.time() + self.ttl)
+            self._by_id[(resource, resource_id)].add(key)
+            self._by_name[(resource, name)].add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, resource, resource_id=None, name=None):
+        with self._lock:
+            stale = (self._by_id.get((resource, resource_id), set()) |
+                     self._by_name.get((resource, name), set()))
+            for key in stale:
+                self._remove(key)
+
+    def _remove(self, key):
+        """Drop an entry and its index entries; the lock must be held."""
+        resource_id, expires = self._entries.pop(key)
+        for index, index_key in ((self._by_id, (key[0], resource_id)),
+                                 (self._by_name, (key[0], key[2]))):
+            keys = index[index_key]
+            keys.discard(key)
+            if not keys:
+                del index[index_key]
+
+    def stats(self):
+        """Return the cache size and its hit and miss counters."""
+        with self._lock:
+            return {'size': len(self._entries),
+                    'maxsize': self.maxsize,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+def get_cache():
+    """Return the name cache, or None if it is disabled."""
+    global _CACHE
+    if not CONF.api.name_cache_ttl:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = NameCache(CONF.api.name_cache_size,
+                                   CONF.api.name_cache_ttl)
+    return _CACHE
+
+
+def invalidate(resource, resource_id=None, name=None):
+    """Drop the cached ids of a resource that was written.
+
+    :param resource: the object name of the resource, e.g. 'Function'.
+    :param resource_id: the id of the resource.
+    :param name: the name the resource had or now has.
+    """
+    if _CACHE is not None:
+        _CACHE.invalidate(resource, resource_id=resource_id, name=name)
@@ -15,20 +15,57 @@
 
 """Policy Engine For oasis."""
 
+import collections
+import threading
+import time
+
 import decorator
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_policy import policy
 import pecan
+import six
 
 from oasis.common import exception
+from oasis.common import metrics
 
+policy_cache_opts = [
+    cfg.BoolOpt('policy_cache_enabled',
+                default=True,
+                help='If True, policy decisions are cached per rule, '
+                     'credentials and target until the policy file '
+                     'changes. Disable it to debug policy rules.'),
+    cfg.IntOpt('policy_cache_size',
+               default=1024,
+               min=1,
+               help='Maximum number of policy decisions cached by each '
+                    'process.'),
+    cfg.IntOpt('policy_reload_interval',
+               default=10,
+               min=0,
+               help='Seconds between two checks of whether the policy file '
+                    'changed, when policy decisions are cached. A value of '
+                    '0 checks it on every policy check.'),
+]
 
 _ENFORCER = None
+_DECISIONS = None
+# When enforce() next checks whether the policy file changed.
+_NEXT_RELOAD = 0
 CONF = cfg.CONF
+CONF.register_opts(policy_cache_opts)
 
 LOG = logging.getLogger(__name__)
 
+# Credentials which change on every request but which no rule checks.
+_VOLATILE_CREDENTIALS = ('auth_token', 'auth_token_info', 'auth_url',
+                         'request_id')
+
+POLICY_DECISIONS = metrics.REGISTRY.register(metrics.Counter(
+    'oasis_policy_decisions_total',
+    'Policy checks, by whether they were answered from the cache.',
+    ('result',)))
+
 
 # we can get a policy enforcer by this init.
 # oslo policy support change policy rule dynamically.
@@ -64,6 +101,108 @@ def init(policy_file=None, rules=None,
     return _ENFORCER
 
 
+class DecisionCache(object):
+    """Bounded LRU cache of policy decisions.
+
+    The cache is cleared whenever the enforcer loads a new set of rules,
+    which is the case when the policy file has been touched. Access,
+    including to the counters, is
+    serialized by a lock, which is green when eventlet has patched the
+    process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rules = None
+        self._decisions = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, rules, key, check):
+        """Return the decision for key, making it with check on a miss.
+
+        :param rules: the rules of the enforcer, which the cached
+                      decisions were made with.
+        :param key: the normalized rule, credentials and target.
+        :param check: a callable returning the decision.
+        """
+        with self._lock:
+            if self._rules is not rules:
+                self._decisions.clear()
+                self._rules = rules
+            if key in self._decisions:
+                self.hits += 1
+                POLICY_DECISIONS.labels('hit').inc()
+                result = self._decisions.pop(key)
+                self._decisions[key] = result
+                return result
+            self.misses += 1
+
+        POLICY_DECISIONS.labels('miss').inc()
+        result = check()
+        with self._lock:
+            if self._rules is rules:
+                self._decisions[key] = result
+                while len(self._decisions) > self.maxsize:
+                    self._decisions.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._decisions.clear()
+            self._rules = None
+
+    def stats(self):
+        """Return the cache size and its hit and miss counters."""
+        with self._lock:
+            return {'size': len(self._decisions),
+                    'maxsize': self.maxsize,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+def _load_rules(enforcer):
+    """Reload the rules if the policy file changed, at most so often."""
+    global _NEXT_RELOAD
+    now = time.time()
+    if now >= _NEXT_RELOAD:
+        _NEXT_RELOAD = now + CONF.policy_reload_interval
+        enforcer.load_rules()
+
+
+def _get_decision_cache():
+    global _DECISIONS
+    if _DECISIONS is None:
+        _DECISIONS = DecisionCache(CONF.policy_cache_size)
+    return _DECISIONS
+
+
+def _freeze(values, skip=()):
+    items = []
+    for key, value in six.iteritems(values):
+        if key in skip:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(value))
+        items.append((key, value))
+    items.sort(key=lambda item: item[0])
+    return tuple(items)
+
+
+def _decision_key(rule, target, credentials):
+    """Return the cache key of a check, or None if it cannot be cached."""
+    if not isinstance(rule, six.string_types):
+        return None
+    key = (rule, _freeze(target),
+           _freeze(credentials, skip=_VOLATILE_CREDENTIALS))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 def enforce(context, rule=None, target=None,
             do_raise=True, exc=None, *args, **kwargs):
 
@@ -95,8 +234,22 @@ def enforce(context, rule=None, target=None,
     if target is None:
         target = {'project_id': context.project_id,
                   'user_id': context.user_id}
-    return enforcer.enforce(rule, target, credentials,
-                            do_raise=do_raise, exc=exc, *args, **kwargs)
+    if not CONF.policy_cache_enabled:
+        return enforcer.enforce(rule, target, credentials,
+                                do_raise=do_raise, exc=exc, *args, **kwargs)
+
+    key = _decision_key(rule, target, credentials)
+    # NOTE: the cache is cleared when the rules are reloaded.
+    _load_rules(enforcer)
+    if key is None:
+        result = enforcer.enforce(rule, target, credentials)
+    else:
+        result = _get_decision_cache().get(
+            enforcer.rules, key,
+            lambda: enforcer.enforce(rule, target, credentials))
+    if do_raise and not result:
+        raise exc(*args, **kwargs)
+    return result
 
 
 def enforce_wsgi(api_name, act=None):
@@ -14,12 +14,18 @@
 
 """Common RPC service and API tools for Oasis."""
 
+import collections
+import os
+import threading
+
 import eventlet
 from oslo_config import cfg
 import oslo_messaging as messaging
 from oslo_service import service
 
+from oasis.common import metrics
 from oasis.common import rpc
+from oasis.common import timing
 from oasis.objects import base as objects_base
 from oasis.conductor import template_definition
 # from oasis.service import periodic
@@ -89,40 +95,194 @@ class Service(service.Service):
         return service_obj
 
 
+_TRANSPORT = None
+_TRANSPORT_PID = None
+_TRANSPORT_LOCK = threading.Lock()
+_SERIALIZER = rpc.RequestContextSerializer(
+    objects_base.OasisObjectSerializer())
+_CLIENTS = {}
+_LOCAL = threading.local()
+
+
+def get_transport():
+    """Return the RPC transport shared by this process.
+
+    The transport is created on first use. A process forked after that,
+    such as an API worker, builds its own so connections are never shared
+    across processes.
+    """
+    global _TRANSPORT, _TRANSPORT_PID
+    pid = os.getpid()
+    if _TRANSPORT is None or _TRANSPORT_PID != pid:
+        with _TRANSPORT_LOCK:
+            if _TRANSPORT is None or _TRANSPORT_PID != pid:
+                exmods = rpc.get_allowed_exmods()
+                _TRANSPORT = messaging.get_transport(
+                    cfg.CONF, allowed_remote_exmods=exmods,
+                    aliases=TRANSPORT_ALIASES)
+                _TRANSPORT_PID = pid
+                _CLIENTS.clear()
+    return _TRANSPORT
+
+
+def set_send_callback(callback):
+    """Set the callable run before each RPC call or cast of this thread.
+
+    The units of work of the API requests and of the RPC handlers set it
+    to commit their database writes, so that no transaction nor pooled
+    connection is held while waiting on another service, which also sees
+    the writes made so far.
+
+    :param callback: a callable without arguments, or None to unset it.
+    """
+    _LOCAL.send_callback = callback
+
+
+def _before_send():
+    callback = getattr(_LOCAL, 'send_callback', None)
+    if callback is not None:
+        callback()
+
+
+def get_client(topic, server=None, timeout=None):
+    """Return a shared RPC client for the given target.
+
+    Clients are stateless with regard to the request context, so one
+    instance per target is reused by every request in the process.
+    """
+    transport = get_transport()
+    key = (topic, server, timeout)
+    client = _CLIENTS.get(key)
+    if client is None:
+        target = messaging.Target(topic=topic, server=server)
+        client = messaging.RPCClient(transport, target,
+                                     serializer=_SERIALIZER,
+                                     timeout=timeout)
+        client = _CLIENTS.setdefault(key, client)
+    return client
+
+
+class ClientCache(object):
+    """Bounded LRU cache of RPC clients keyed by topic.
+
+    Clients never hold a request context (it is passed on every call), so
+    a cached client can safely serve any request. Access is serialized by
+    a lock, which is green when eventlet has patched the process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._transport = None
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, topic, factory):
+        """Return the client for topic, building it with factory on a miss.
+
+        :param topic: the topic the client targets.
+        :param factory: a callable returning a new client for topic.
+        """
+        transport = get_transport()
+        with self._lock:
+            if self._transport is not transport:
+                # The transport was rebuilt after a fork; the cached clients
+                # belong to the parent process.
+                self._clients.clear()
+                self._transport = transport
+
+            client = self._clients.pop(topic, None)
+            if client is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                client = factory()
+            self._clients[topic] = client
+
+            while len(self._clients) > self.maxsize:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        """Return the cache size and its hit, miss and eviction counters."""
+        with self._lock:
+            return {'size': len(self._clients),
+                    'maxsize': self.maxsize,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
 class API(object):
+    # Shared ClientCache used by change_client(); None disables caching.
+    client_cache = None
+
     def __init__(self, transport=None, topic=None, server=None,
                  timeout=None):
-        self.transport = transport
+        self._transport = transport
         self.topic = topic
         self.server = server
         self.timeout = timeout
+        self._client = None
 
-        self.serializer = rpc.RequestContextSerializer(
-            objects_base.OasisObjectSerializer())
-        if self.transport is None:
-            exmods = rpc.get_allowed_exmods()
-            self.transport = messaging.get_transport(cfg.CONF,
-                                                allowed_remote_exmods=exmods,
-                                                aliases=TRANSPORT_ALIASES)
         if self.topic is None:
             self.topic = ''
-        target = messaging.Target(topic=self.topic, server=self.server)
-        self._client = messaging.RPCClient(self.transport, target,
-                                           serializer=self.serializer,
-                                           timeout=self.timeout)
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            return get_transport()
+        return self._transport
+
+    @property
+    def serializer(self):
+        return _SERIALIZER
+
+    def _new_client(self, topic):
+        target = messaging.Target(topic=topic, server=self.server)
+        return messaging.RPCClient(self.transport, target,
+                                   serializer=self.serializer,
+                                   timeout=self.timeout)
+
+    def _make_client(self, topic):
+        if self._transport is None:
+            return get_client(topic, server=self.server,
+                              timeout=self.timeout)
+        return self._new_client(topic)
+
+    @property
+    def client(self):
+        # NOTE: The client is resolved on first use so requests that never
+        # talk to another service do not pay for it.
+        if self._client is None:
+            self._client = self._make_client(self.topic)
+        return self._client
 
     def _call(self, method, context, *args, **kwargs):
-        return self._client.call(context, method, *args, **kwargs)
+        _before_send()
+        with timing.measure('rpc'), \
+                metrics.RPC_CALL_DURATION.labels(method, 'call').time():
+            return self.client.call(context, method, *args, **kwargs)
 
     def _cast(self, method, context, *args, **kwargs):
-        self._client.cast(context, method, *args, **kwargs)
+        _before_send()
+        with timing.measure('rpc'), \
+                metrics.RPC_CALL_DURATION.labels(method, 'cast').time():
+            self.client.cast(context, method, *args, **kwargs)
 
     def change_client(self, topic):
-        target = messaging.Target(topic=topic, server=self.server)
-        self._client = messaging.RPCClient(self.transport, target,
-                                           serializer=self.serializer,
-                                           timeout=self.timeout)
+        if self.client_cache is None or self._transport is not None:
+            self._client = self._new_client(topic)
+            return
+        self._client = self.client_cache.get(
+            topic, lambda: self._new_client(topic))
 
     def echo(self, message):
         self._cast('echo', message=message)
-
@@ -14,11 +14,16 @@
 
 import socket
 
+from oslo_concurrency import processutils
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_service import service
+from oslo_service import wsgi
 
 from oasis.common import config
+from oasis.common import metrics
 from oasis.i18n import _
+from oasis.i18n import _LI
 
 
 service_opts = [
@@ -33,6 +38,8 @@ service_opts = [
 
 cfg.CONF.register_opts(service_opts)
 
+LOG = logging.getLogger(__name__)
+
 
 def prepare_service(argv=None):
     if argv is None:
@@ -42,3 +49,62 @@ def prepare_service(argv=None):
     config.set_config_defaults()
 
     logging.setup(cfg.CONF, 'oasis')
+
+
+class WSGIService(service.ServiceBase):
+    """Provides ability to launch an API from a 'paste' configuration.
+
+    The WSGI application is built before the launcher forks, so every worker
+    process shares the loaded application pages copy-on-write. Each worker
+    serves requests from a pool of green threads with HTTP keep-alive.
+    """
+
+    def __init__(self, name, app):
+        """Initialize, but do not start the WSGI server.
+
+        :param name: The name of the WSGI server given to the loader.
+        :param app: The loaded WSGI application to serve.
+        """
+        self.name = name
+        self.app = app
+        self.workers = (cfg.CONF.api.workers or
+                        processutils.get_worker_count())
+
+        # NOTE: oslo.service reads the keep-alive settings from [DEFAULT];
+        # mirror the [api] values there so oasis-api is configured in one
+        # place.
+        wsgi.register_opts(cfg.CONF)
+        cfg.CONF.set_override('wsgi_keep_alive', cfg.CONF.api.keep_alive)
+        cfg.CONF.set_override('client_socket_timeout',
+                              cfg.CONF.api.client_socket_timeout)
+
+        self.server = wsgi.Server(cfg.CONF, name, self.app,
+                                  host=cfg.CONF.api.host,
+                                  port=cfg.CONF.api.port,
+                                  pool_size=cfg.CONF.api.max_green_threads)
+
+    def start(self):
+        """Start serving this service using loaded configuration.
+
+        With [api]metrics_port set, the worker also serves its metrics on
+        a port of its own, apart from the authenticated API port.
+        """
+        self.server.start()
+        if cfg.CONF.api.metrics_port:
+            port = metrics.start_server(cfg.CONF.api.metrics_host,
+                                        cfg.CONF.api.metrics_port,
+                                        ports=self.workers)
+            LOG.info(_LI('Serving metrics on %(host)s:%(port)s'),
+                     {'host': cfg.CONF.api.metrics_host, 'port': port})
+
+    def stop(self):
+        """Stop serving this API."""
+        self.server.stop()
+
+    def wait(self):
+        """Wait for the service to stop serving this API."""
+        self.server.wait()
+
+    def reset(self):
+        """Reset server greenpool size to default."""
+        self.server.reset()
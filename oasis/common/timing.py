@@ -0,0 +1,134 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Per-request timing of the phases of an API call.
+
+A collector is bound to the current (green) thread by start() and filled
+by measure() and add() from anywhere the request goes, such as the
+database and RPC layers. Outside of a request nothing is recorded.
+"""
+
+import contextlib
+import time
+
+from eventlet.green import threading
+from sqlalchemy import event
+
+from oasis.common import metrics
+
+_LOCAL = threading.local()
+
+
+class Timings(object):
+    """The time spent in each phase of a request, and the call counts."""
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, phase, seconds):
+        self.durations[phase] = self.durations.get(phase, 0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def get(self, phase):
+        return self.durations.get(phase, 0)
+
+    def to_header(self, order):
+        """Format the timings as a Server-Timing header value.
+
+        :param order: the phases to include, in order.
+        """
+        metrics = []
+        for phase in order:
+            if phase not in self.durations:
+                continue
+            metric = '%s;dur=%.1f' % (phase, self.durations[phase] * 1000)
+            if self.counts[phase] > 1:
+                metric += ';desc="%d calls"' % self.counts[phase]
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+
+def start():
+    """Start collecting the timings of the current request."""
+    _LOCAL.timings = Timings()
+    return _LOCAL.timings
+
+
+def stop():
+    """Stop collecting and return the timings of the current request."""
+    timings = getattr(_LOCAL, 'timings', None)
+    _LOCAL.timings = None
+    return timings
+
+
+def add(phase, seconds):
+    timings = getattr(_LOCAL, 'timings', None)
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextlib.contextmanager
+def measure(phase):
+    """Add the time spent in the block to phase."""
+    if getattr(_LOCAL, 'timings', None) is None:
+        yield
+        return
+    start_time = time.time()
+    try:
+        yield
+    finally:
+        add(phase, time.time() - start_time)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    conn.info.setdefault('oasis_query_start', []).append(time.time())
+
+
+def _end_query(conn, statement):
+    starts = conn.info.get('oasis_query_start')
+    if starts:
+        elapsed = time.time() - starts.pop()
+        add('db', elapsed)
+        verb = (statement.split(None, 1) or ['UNKNOWN'])[0].upper()
+        metrics.DB_QUERY_DURATION.labels(verb).observe(elapsed)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    _end_query(conn, statement)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None:
+        _end_query(conn, exception_context.statement or '')
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.DB_CONNECTION_CHECKOUTS.labels().inc()
+
+
+def instrument_engine(engine):
+    """Time the statements executed on engine.
+
+    The durations go to the 'db' phase of the current request and to the
+    database query histogram. The connections checked out of its pool are
+    counted too.
+    """
+    if not event.contains(engine, 'before_cursor_execute',
+                          _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+        event.listen(engine, 'checkout', _checkout)
@@ -36,6 +36,36 @@ class API(rpc_service.API):
         return self._call('nodepool_update', nodepool_id=nodepool_id,
                           context=self.context)
 
+    # Asynchronous Function Operations
+    #
+    # These cast the operation together with the id of a deployment job.
+    # The conductor runs it on an agent of the nodepool, see
+    # oasis.conductor.handlers.function_conductor, and reports its outcome
+    # with job_report().
+    def function_create_async(self, job_id, nodepool_id, function_id, rule,
+                              body, methods):
+        self._cast('function_create_async', job_id=job_id,
+                   nodepool_id=nodepool_id, function_id=function_id,
+                   rule=rule, body=body, methods=methods,
+                   context=self.context)
+
+    def function_update_async(self, job_id, nodepool_id, function_id, rule,
+                              body, methods):
+        self._cast('function_update_async', job_id=job_id,
+                   nodepool_id=nodepool_id, function_id=function_id,
+                   rule=rule, body=body, methods=methods,
+                   context=self.context)
+
+    def function_delete_async(self, job_id, nodepool_id, function_id):
+        self._cast('function_delete_async', job_id=job_id,
+                   nodepool_id=nodepool_id, function_id=function_id,
+                   context=self.context)
+
+    # Job Operations
+    def job_report(self, job_id, host, status, status_reason=None):
+        self._cast('job_report', job_id=job_id, host=host, status=status,
+                   status_reason=status_reason, context=self.context)
+
 
 class ListenerAPI(rpc_service.API):
     def __init__(self, context=None, topic=None, server=None, timeout=None):
@@ -25,6 +25,13 @@ SERVICE_OPTS = [
                default=4,
                help=('RPC timeout for the conductor liveness check that is '
                      'used for bay locking.')),
+    cfg.PortOpt('metrics_port',
+                help='Port on which the conductor serves its metrics in the '
+                     'Prometheus text format at any path. The metrics are '
+                     'not served when unset.'),
+    cfg.IPOpt('metrics_host',
+              default='127.0.0.1',
+              help='The listen IP of the conductor metrics server.'),
 ]
 
 opt_group = cfg.OptGroup(
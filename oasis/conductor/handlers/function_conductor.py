@@ -0,0 +1,68 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import six
+
+from oasis.agent import api as agent_api
+from oasis.conductor import api as conductor_api
+from oasis.conductor import utils as conductor_utils
+from oasis.i18n import _LE
+from oasis.objects import fields
+
+CONF = cfg.CONF
+CONF.import_opt('host', 'oasis.common.service')
+
+LOG = logging.getLogger(__name__)
+
+
+class Handler(object):
+    """Run the asynchronous function operations and report on their jobs.
+
+    The API casts an operation here with the id of its deployment job, and
+    returns right away. The operation is run by a call to an agent of the
+    function's nodepool, and its outcome reported on the job.
+    """
+
+    def __init__(self):
+        super(Handler, self).__init__()
+
+    @conductor_utils.unit_of_work
+    def function_create_async(self, context, job_id, nodepool_id, **kwargs):
+        '''Create a function and report the outcome on job_id.'''
+        self._run_job(context, job_id, 'function_create', nodepool_id,
+                      **kwargs)
+
+    @conductor_utils.unit_of_work
+    def function_update_async(self, context, job_id, nodepool_id, **kwargs):
+        '''Update a function and report the outcome on job_id.'''
+        self._run_job(context, job_id, 'function_update', nodepool_id,
+                      **kwargs)
+
+    @conductor_utils.unit_of_work
+    def function_delete_async(self, context, job_id, nodepool_id, **kwargs):
+        '''Delete a function and report the outcome on job_id.'''
+        self._run_job(context, job_id, 'function_delete', nodepool_id,
+                      **kwargs)
+
+    def _run_job(self, context, job_id, operation, nodepool_id, **kwargs):
+        agent = agent_api.AgentAPI(context=context)
+        try:
+            getattr(agent, operation)(nodepool_id, **kwargs)
+        except Exception as e:
+            LOG.exception(_LE('Deployment job %s failed.'), job_id)
+            status, status_reason = fields.JobStatus.FAILED, six.text_type(e)
+        else:
+            status, status_reason = fields.JobStatus.COMPLETE, None
+        conductor_api.API(context=context).job_report(
+            job_id, CONF.host, status, status_reason)
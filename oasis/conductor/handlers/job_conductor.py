@@ -0,0 +1,57 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_log import log as logging
+
+from oasis.common import exception
+from oasis.conductor import utils as conductor_utils
+from oasis.i18n import _LW
+from oasis import objects
+from oasis.objects import fields
+
+LOG = logging.getLogger(__name__)
+
+
+class Handler(object):
+    """Collect the results of asynchronous function deployments."""
+
+    def __init__(self):
+        super(Handler, self).__init__()
+
+    @conductor_utils.unit_of_work
+    def job_report(self, context, job_id, host, status, status_reason=None):
+        '''Record the outcome of a deployment job on one node.
+
+        Called once an operation cast by the API in asynchronous mode has
+        been handled. The function of a delete job is destroyed when the
+        job completes.
+        '''
+        LOG.debug('job_report')
+        try:
+            job = objects.Job.get_by_id(context, job_id)
+        except exception.JobNotFound:
+            LOG.warning(_LW('Got a report from %(host)s for the unknown '
+                            'job %(job)s.'), {'host': host, 'job': job_id})
+            return None
+
+        job.add_result(host, status, status_reason)
+        if (job.action == fields.JobAction.DELETE and
+                job.status == fields.JobStatus.COMPLETE):
+            self._destroy_function(context, job)
+        return job
+
+    def _destroy_function(self, context, job):
+        try:
+            function = objects.Function.get_by_id(context, job.function_id)
+        except exception.FunctionNotFound:
+            return
+        function.destroy()
@@ -23,6 +23,7 @@ import six
 
 from oasis.common import clients
 from oasis.common import exception
+from oasis.common import metrics
 from oasis.common import short_id
 from oasis.common import utils
 from oasis.i18n import _
@@ -91,7 +92,8 @@ def _create_stack(context, osc, nodepool, nodepool_create_timeout):
         'files': tpl_files,
         'timeout_mins': heat_timeout
     }
-    created_stack = osc.heat().stacks.create(**fields)
+    with metrics.HEAT_CALL_DURATION.labels('stacks.create').time():
+        created_stack = osc.heat().stacks.create(**fields)
 
     return created_stack
 
@@ -107,7 +109,8 @@ def _update_stack(context, osc, nodepool, scale_manager=None):
         'files': tpl_files
     }
 
-    return osc.heat().stacks.update(nodepool.stack_id, **fields)
+    with metrics.HEAT_CALL_DURATION.labels('stacks.update').time():
+        return osc.heat().stacks.update(nodepool.stack_id, **fields)
 
 
 class Handler(object):
@@ -137,6 +140,7 @@ class Handler(object):
         osc.keystone().delete_trustee(bay.trustee_user_id)
 
     # Function Operations
+    @conductor_utils.unit_of_work
     def nodepool_create(self, context, nodepool, nodepool_create_timeout):
         LOG.debug('nodepool_create')
         osc = clients.OpenStackClients(context)
@@ -156,11 +160,13 @@ class Handler(object):
         # self._poll_and_check(osc, nodepool)
         return nodepool
 
+    @conductor_utils.unit_of_work
     def nodepool_update(self, context, nodepool):
         LOG.debug('nodepool_update')
 
         osc = clients.OpenStackClients(context)
-        stack = osc.heat().stacks.get(nodepool.stack_id)
+        with metrics.HEAT_CALL_DURATION.labels('stacks.get').time():
+            stack = osc.heat().stacks.get(nodepool.stack_id)
         allow_update_status = (
             nodepool_status.CREATE_COMPLETE,
             nodepool_status.UPDATE_COMPLETE,
@@ -187,6 +193,7 @@ class Handler(object):
 
         return nodepool
 
+    @conductor_utils.unit_of_work
     def nodepool_delete(self, context, uuid):
         LOG.debug('nodepool_delete')
 
@@ -204,7 +211,8 @@ class Handler(object):
         #
         # If the exception is unhandled, the original exception will be raised.
         try:
-            osc.heat().stacks.delete(stack_id)
+            with metrics.HEAT_CALL_DURATION.labels('stacks.delete').time():
+                osc.heat().stacks.delete(stack_id)
         except exc.HTTPNotFound:
             LOG.info(_LI('The stack %s was not be found during bay'
                          ' deletion.'), stack_id)
@@ -237,7 +245,9 @@ class HeatPoller(object):
     def poll_and_check(self):
         # TODO(yuanying): temporary implementation to update api_address,
         # node_addresses and bay status
-        stack = self.openstack_client.heat().stacks.get(self.nodepool.stack_id)
+        with metrics.HEAT_CALL_DURATION.labels('stacks.get').time():
+            stack = self.openstack_client.heat().stacks.get(
+                self.nodepool.stack_id)
         self.attempts += 1
         # poll_and_check is detached and polling long time to check status,
         # so another user/client can call delete bay/stack.
@@ -22,6 +22,7 @@ import six
 from oasis.common import paths
 from oasis.common import clients
 from oasis.common import exception
+from oasis.common import metrics
 from oasis.i18n import _
 from oasis.i18n import _LW
 
@@ -213,7 +214,8 @@ class BaseTemplateDefinition(TemplateDefinition):
         :return: A user token
         """
         if hasattr(bay, 'stack_id'):
-            stack = osc.heat().stacks.get(bay.stack_id)
+            with metrics.HEAT_CALL_DURATION.labels('stacks.get').time():
+                stack = osc.heat().stacks.get(bay.stack_id)
             return stack.parameters['user_token']
         else:
             return context.auth_token
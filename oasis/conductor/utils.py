@@ -1,5 +1,35 @@
+import functools
+
+from oslo_utils import excutils
+
+from oasis.common import rpc_service
+from oasis.db import api as db_api
 from oasis.objects import nodepool_policy
 
 
 def retrieve_nodepool_policy(context, nodepool):
     return nodepool_policy.NodePoolPolicy.get_by_id(context, nodepool.nodepool_policy_id)
+
+
+def unit_of_work(func):
+    """Run an RPC handler in one database session and transaction.
+
+    The writes of the handler are committed when it returns, or rolled
+    back if it raises. Those made before an RPC call or cast are
+    committed before it, and are kept.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        dbapi = db_api.get_instance()
+        dbapi.begin_unit_of_work()
+        rpc_service.set_send_callback(dbapi.commit_unit_of_work)
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                rpc_service.set_send_callback(None)
+                dbapi.end_unit_of_work(commit=False)
+        rpc_service.set_send_callback(None)
+        dbapi.end_unit_of_work()
+        return result
+    return wrapper
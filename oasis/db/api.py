@@ -38,10 +38,92 @@ class Connection(object):
     def __init__(self):
         """Constructor."""
 
+    @abc.abstractmethod
+    def begin_unit_of_work(self):
+        """Open the session and transaction of a request or RPC handler.
+
+        Until end_unit_of_work() is called, the calls made from the current
+        thread share one session, hence one pooled connection, and their
+        writes are committed together. Each write runs in a savepoint of
+        the transaction.
+        """
+
+    @abc.abstractmethod
+    def commit_unit_of_work(self):
+        """Commit the writes of the unit of work made so far.
+
+        The unit of work goes on in a new transaction, which only takes a
+        pooled connection again when it is next used. This is called
+        before each RPC call or cast, so that other services see the
+        writes and no connection is held while waiting on them.
+        """
+
+    @abc.abstractmethod
+    def end_unit_of_work(self, commit=True):
+        """Close the session of the unit of work, if there is one.
+
+        :param commit: whether its writes are committed, rather than
+                       rolled back.
+        """
+
+    @abc.abstractmethod
+    def get_validator(self, context, resource, resource_id):
+        """Return the id and timestamps of a row without loading it.
+
+        :param context: The security context
+        :param resource: The model name, e.g. 'Function'.
+        :param resource_id: The id of the row.
+        :returns: An (id, created_at, updated_at) tuple, or None.
+        """
+
+    @abc.abstractmethod
+    def get_resource_list_by_ids(self, context, resource, ids, columns=None,
+                                 key='id'):
+        """Return the rows with the given ids with a single query.
+
+        :param context: The security context
+        :param resource: The model name, e.g. 'Function'.
+        :param ids: The ids of the rows.
+        :param columns: The columns to load, or None to load all of them.
+        :param key: The column holding the ids, e.g. 'endpoint_id' to
+                    load the rows of some endpoints.
+        :returns: A list of rows, in no particular order.
+        """
+
+    @abc.abstractmethod
+    def create_resource_bulk(self, resource, values_list):
+        """Create rows with a single statement, in one transaction.
+
+        :param resource: The model name, e.g. 'HttpApi'.
+        :param values_list: A list of dicts of the values of each row. A
+                            uuid is generated for the rows without an id.
+        :returns: A list of the created rows, in the order of values_list.
+        """
+
+    @abc.abstractmethod
+    def upsert_resource_bulk(self, context, resource, values_list):
+        """Create rows, or update those whose id exists, in one transaction.
+
+        Only the given values of an existing row are updated, and never
+        its project and user. Existing rows must belong to the project of
+        the context, or to no project with an admin context.
+
+        :param context: The security context.
+        :param resource: The model name, e.g. 'HttpApi'.
+        :param values_list: A list of dicts of the values of each row. A
+                            uuid is generated for the rows without an id,
+                            which are always created.
+        :returns: A list of the ids of the rows, in the order of
+                  values_list.
+        :raises: ResourceNotFound if the id of another project's row is
+                 given.
+        """
+
     ############## EndPoint APIs ################
     @abc.abstractmethod
     def get_endpoint_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         """Get matching endpoints.
 
         Return a list of the specified columns for all bays that match the
@@ -56,6 +138,11 @@ class Connection(object):
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
                          (asc, desc)
+        :param columns: List of column names to load. Defaults to None,
+                        which loads every column.
+        :param yield_per: If set, return an iterator reading this many rows
+                          at a time from a server-side cursor instead of a
+                          list.
         :returns: A list of tuples of the specified columns.
         """
 
@@ -64,6 +151,31 @@ class Connection(object):
         """Create a new endpoint.
         """
 
+    @abc.abstractmethod
+    def create_endpoint_definition(self, values):
+        """Create an endpoint and all of its http apis in one transaction.
+
+        :param values: A dict of the endpoint values, with its http apis
+                       nested under 'http_apis'. An http api may nest a
+                       'request' with 'headers', and a 'response' with
+                       'status_codes', each with 'messages'.
+        :returns: The same nested structure, holding the values of the
+                  created rows. Their ids are generated.
+        """
+
+    @abc.abstractmethod
+    def get_endpoint_graph(self, context, ids):
+        """Return endpoints with all of their http apis.
+
+        The graphs are loaded in a fixed number of queries, whatever the
+        number of endpoints.
+
+        :param context: The security context
+        :param ids: The ids of the endpoints.
+        :returns: A list of the endpoints, in no particular order, in the
+                  nested structure create_endpoint_definition() returns.
+        """
+
     @abc.abstractmethod
     def get_endpoint_by_id(self, context, endpoint_id):
         """Return a endpoint.
@@ -108,6 +220,10 @@ class Connection(object):
     def create_request(self, values):
         """Create a new Request."""
 
+    @abc.abstractmethod
+    def get_request_list(self, context):
+        """Get matching requests."""
+
     @abc.abstractmethod
     def get_request_by_id(self, context, httpapi_id):
         """Get matching request."""
@@ -134,6 +250,10 @@ class Connection(object):
     def create_response(self, values):
         """Create a new Response."""
 
+    @abc.abstractmethod
+    def get_response_list(self, context):
+        """Get matching responses."""
+
     @abc.abstractmethod
     def create_response_code(self, values):
         """Create a new Response Code."""
@@ -153,7 +273,8 @@ class Connection(object):
     ##############Function APIs #############
     @abc.abstractmethod
     def get_function_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         """Get matching functions.
 
         Return a list of the specified columns for all bays that match the
@@ -168,6 +289,11 @@ class Connection(object):
         :param sort_key: Attribute by which results should be sorted.
         :param sort_dir: direction in which results should be sorted.
                          (asc, desc)
+        :param columns: List of column names to load. Defaults to None,
+                        which loads every column.
+        :param yield_per: If set, return an iterator reading this many rows
+                          at a time from a server-side cursor instead of a
+                          list.
         :returns: A list of tuples of the specified columns.
         """
 
@@ -238,7 +364,8 @@ class Connection(object):
 
     @abc.abstractmethod
     def get_nodepool_policy_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         """Get matching Nodepool Policies"""
 
     @abc.abstractmethod
@@ -252,7 +379,8 @@ class Connection(object):
     ############# NodePool APIs###############
     @abc.abstractmethod
     def get_nodepool_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         """Get matching Nodepools"""
 
     def get_nodepool_by_id(self, context, nodepool_id):
@@ -269,3 +397,57 @@ class Connection(object):
     @abc.abstractmethod
     def destory_nodepool(self, id):
         """Delete nodepool"""
+
+    ################# Job APIs ##################
+    @abc.abstractmethod
+    def get_job_list(self, context, filters=None, limit=None,
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
+        """Get matching deployment jobs.
+
+        :param context: The security context
+        :param filters: Filters to apply. Defaults to None.
+        :param limit: Maximum number of jobs to return.
+        :param marker: the last item of the previous page; we return the next
+                       result set.
+        :param sort_key: Attribute by which results should be sorted.
+        :param sort_dir: direction in which results should be sorted.
+                         (asc, desc)
+        :param columns: List of column names to load. Defaults to None,
+                        which loads every column.
+        :param yield_per: If set, return an iterator reading this many rows
+                          at a time from a server-side cursor instead of a
+                          list.
+        :returns: A list of jobs.
+        """
+
+    @abc.abstractmethod
+    def get_job_by_id(self, context, job_id):
+        """Return a deployment job.
+
+        :param context: The security context
+        :param job_id: The id of a job.
+        :returns: A job.
+        """
+
+    @abc.abstractmethod
+    def create_job(self, values):
+        """Create a new deployment job."""
+
+    @abc.abstractmethod
+    def update_job(self, job_id, values):
+        """Update properties of a deployment job."""
+
+    @abc.abstractmethod
+    def add_job_result(self, job_id, result):
+        """Record the result reported by one node for a deployment job.
+
+        The job fails as soon as one node reports a failure, and completes
+        once as many nodes as its expected_reports reported success. It
+        stays pending until then.
+
+        :param job_id: The id of a job.
+        :param result: A dict with the 'host', 'status' and 'status_reason'
+                       reported by the node.
+        :returns: A job.
+        """
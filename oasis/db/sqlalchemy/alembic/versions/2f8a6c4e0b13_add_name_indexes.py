@@ -0,0 +1,36 @@
+"""Add indexes on the function and endpoint names
+
+Revision ID: 2f8a6c4e0b13
+Revises: 9c4d2e7a1f30
+Create Date: 2026-10-17 16:05:12.481930
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '2f8a6c4e0b13'
+down_revision = '9c4d2e7a1f30'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+# NOTE: functions and endpoints are looked up by name in every project, so
+# the (project_id, name) indexes cannot serve those lookups.
+INDEXES = [
+    ('function', ('name',)),
+    ('endpoint', ('name',)),
+]
+
+
+def _index_name(table, columns):
+    return 'ix_%s_%s' % (table, '_'.join(columns))
+
+
+def upgrade():
+    for table, columns in INDEXES:
+        op.create_index(_index_name(table, columns), table, list(columns))
+
+
+def downgrade():
+    for table, columns in reversed(INDEXES):
+        op.drop_index(_index_name(table, columns), table_name=table)
@@ -0,0 +1,38 @@
+"""Add job table
+
+Revision ID: 3d1c0a9e7b52
+Revises: f37ffbefe5de
+Create Date: 2016-11-21 14:02:11.512803
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3d1c0a9e7b52'
+down_revision = 'f37ffbefe5de'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        'job',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=True),
+        sa.Column('user_id', sa.String(length=36), nullable=True),
+        sa.Column('function_id', sa.String(length=36), nullable=True),
+        sa.Column('nodepool_id', sa.String(length=36), nullable=True),
+        sa.Column('action', sa.String(length=20), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('status_reason', sa.Text(), nullable=True),
+        sa.Column('results', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('job')
@@ -0,0 +1,68 @@
+"""Add indexes on the tenant and relationship columns
+
+Revision ID: 6b2e4f1d9a07
+Revises: 3d1c0a9e7b52
+Create Date: 2026-10-17 10:12:40.318527
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '6b2e4f1d9a07'
+down_revision = '3d1c0a9e7b52'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+# (table, columns) of the indexes. The resources are listed by project
+# and ordered by id, looked up by project and name, and joined on the
+# ids of their parent.
+INDEXES = [
+    ('function', ('project_id', 'id')),
+    ('function', ('project_id', 'name')),
+    ('function', ('endpoint_id',)),
+    ('function', ('nodepool_id',)),
+    ('endpoint', ('project_id', 'id')),
+    ('endpoint', ('project_id', 'name')),
+    ('http_api', ('endpoint_id',)),
+    ('request', ('http_api_id',)),
+    ('request_header', ('request_id',)),
+    ('response', ('http_api_id',)),
+    ('response_statuscode', ('response_id',)),
+    ('response_error_message', ('response_statuscode_id',)),
+    ('nodepool_policy', ('project_id', 'id')),
+    ('nodepool_policy', ('project_id', 'name')),
+    ('nodepool', ('project_id', 'id')),
+    ('nodepool', ('project_id', 'name')),
+    ('nodepool', ('function_id',)),
+    ('nodepool', ('nodepool_policy_id',)),
+    ('job', ('project_id', 'id')),
+    ('job', ('function_id',)),
+    ('job', ('nodepool_id',)),
+]
+
+
+def _index_name(table, columns):
+    return 'ix_%s_%s' % (table, '_'.join(columns))
+
+
+def upgrade():
+    # NOTE: MySQL cannot index a TEXT column without a prefix length. The
+    # API already limits endpoint names to 255 characters.
+    with op.batch_alter_table('endpoint') as batch_op:
+        batch_op.alter_column('name', existing_type=sa.Text(),
+                              type_=sa.String(length=255),
+                              existing_nullable=True)
+
+    for table, columns in INDEXES:
+        op.create_index(_index_name(table, columns), table, list(columns))
+
+
+def downgrade():
+    for table, columns in reversed(INDEXES):
+        op.drop_index(_index_name(table, columns), table_name=table)
+
+    with op.batch_alter_table('endpoint') as batch_op:
+        batch_op.alter_column('name', existing_type=sa.String(length=255),
+                              type_=sa.Text(), existing_nullable=True)
@@ -0,0 +1,25 @@
+"""Add the number of reports a job expects
+
+Revision ID: 9c4d2e7a1f30
+Revises: 6b2e4f1d9a07
+Create Date: 2026-10-17 14:20:31.604412
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9c4d2e7a1f30'
+down_revision = '6b2e4f1d9a07'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('job', sa.Column('expected_reports', sa.Integer(),
+                                   nullable=True))
+
+
+def downgrade():
+    op.drop_column('job', 'expected_reports')
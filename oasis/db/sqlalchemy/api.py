@@ -12,19 +12,29 @@
 
 """SQLAlchemy storage backend."""
 
+import collections
+
+from eventlet.green import threading
 from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_db.sqlalchemy import utils as db_utils
 from oslo_utils import timeutils
+import six
+from sqlalchemy.ext import compiler
+from sqlalchemy import orm
 from sqlalchemy.orm.exc import MultipleResultsFound
 from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.sql import expression
 
 from oasis.common import exception
+from oasis.common import name_cache
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api
 from oasis.db.sqlalchemy import models
 from oasis.i18n import _
+from oasis.objects import fields
 
 import pecan
 
@@ -33,11 +43,19 @@ CONF = cfg.CONF
 
 _FACADE = None
 
+# The session of the unit of work of the current (green) thread.
+_LOCAL = threading.local()
+
+# The most rows sent in one statement by the bulk methods, which keeps
+# the statements of very large batches under the packet size limits.
+_BULK_CHUNK_SIZE = 500
+
 
 def _create_facade_lazily():
     global _FACADE
     if _FACADE is None:
         _FACADE = db_session.EngineFacade.from_config(CONF)
+        timing.instrument_engine(_FACADE.get_engine())
     return _FACADE
 
 
@@ -47,10 +65,26 @@ def get_engine():
 
 
 def get_session(**kwargs):
+    """Return the session of the current unit of work, or a new one."""
+    session = getattr(_LOCAL, 'session', None)
+    if session is not None and not kwargs:
+        return session
     facade = _create_facade_lazily()
     return facade.get_session(**kwargs)
 
 
+def transaction(session):
+    """Begin a transaction, or a savepoint within the unit of work.
+
+    A write that fails within a unit of work only rolls back to its
+    savepoint, so the writes made before it are kept and the session
+    can still be used.
+    """
+    if session.transaction is not None:
+        return session.begin_nested()
+    return session.begin()
+
+
 def get_backend():
     """The backend is this module itself."""
     return Connection()
@@ -84,28 +118,195 @@ def add_identity_filter(query, value):
 
 
 def _paginate_query(model, limit=None, marker=None, sort_key=None,
-                    sort_dir=None, query=None):
+                    sort_dir=None, query=None, columns=None, yield_per=None):
     if not query:
         query = model_query(model)
-    sort_keys = ['id']
-    if sort_key and sort_key not in sort_keys:
-        sort_keys.insert(0, sort_key)
+    if columns:
+        # NOTE: only the requested columns are selected; the primary key is
+        # always loaded. Callers must not touch the other attributes, or
+        # each of them will be lazy-loaded with an extra query per row.
+        query = query.options(orm.load_only(*columns))
+    # NOTE: sort_key may be a list of columns. 'id' always comes last so
+    # that the order, and therefore keyset pagination, is total.
+    if isinstance(sort_key, six.string_types):
+        sort_key = [key.strip() for key in sort_key.split(',')]
+    sort_keys = [key for key in sort_key or [] if key and key != 'id']
+    sort_keys.append('id')
     try:
         query = db_utils.paginate_query(query, model, limit, sort_keys,
                                         marker=marker, sort_dir=sort_dir)
     except db_exc.InvalidSortKey:
         raise exception.InvalidParameterValue(
             _('The sort_key value "%(key)s" is an invalid field for sorting')
-            % {'key': sort_key})
+            % {'key': ','.join(sort_keys)})
+    if yield_per:
+        # NOTE: yield_per() also turns on stream_results, so the rows are
+        # read through a server-side cursor instead of being buffered.
+        # They are read while the response is sent, after the unit of
+        # work of the request ended, so through a session of their own.
+        session = _create_facade_lazily().get_session()
+        return _stream_rows(query.with_session(session).yield_per(yield_per),
+                            session)
     return query.all()
 
 
+def _stream_rows(query, session):
+    """Yield the rows of a query, then close the session it runs in.
+
+    The session, and the connection it holds, are released when the rows
+    are exhausted, or as soon as the generator is closed.
+    """
+    try:
+        for row in query:
+            yield row
+    finally:
+        session.close()
+
+
+def _new_row(model, values, created_at):
+    """Return the values of a new row, with a value for every column."""
+    row = dict((column.name, values.get(column.name))
+               for column in model.__table__.columns)
+    row['id'] = row['id'] or utils.generate_uuid()
+    row['created_at'] = created_at
+    return row
+
+
+def _insert_rows(session, model, rows, statement=None):
+    # NOTE: every row has the same keys, so the insert is sent as a single
+    # executemany() per chunk instead of one statement per row.
+    if statement is None:
+        statement = model.__table__.insert()
+    for start in six.moves.range(0, len(rows), _BULK_CHUNK_SIZE):
+        session.execute(statement, rows[start:start + _BULK_CHUNK_SIZE])
+
+
+class Upsert(expression.Insert):
+    """An INSERT which updates the rows whose primary key already exists.
+
+    :param table: the table to insert into.
+    :param update_columns: the columns set from the inserted values on the
+                           rows already there.
+    """
+
+    def __init__(self, table, update_columns):
+        super(Upsert, self).__init__(table)
+        self.update_columns = update_columns
+
+
+@compiler.compiles(Upsert)
+def _compile_upsert(upsert, sql_compiler, **kw):
+    raise exception.OasisException(
+        _('Upserts are not supported on %s.') % sql_compiler.dialect.name)
+
+
+@compiler.compiles(Upsert, 'mysql')
+def _compile_mysql_upsert(upsert, sql_compiler, **kw):
+    columns = [sql_compiler.preparer.quote(column)
+               for column in upsert.update_columns]
+    return '%s ON DUPLICATE KEY UPDATE %s' % (
+        sql_compiler.visit_insert(upsert, **kw),
+        ', '.join('%s = VALUES(%s)' % (column, column)
+                  for column in columns))
+
+
+@compiler.compiles(Upsert, 'sqlite')
+@compiler.compiles(Upsert, 'postgresql')
+def _compile_on_conflict_upsert(upsert, sql_compiler, **kw):
+    # NOTE: ON CONFLICT ... DO UPDATE needs PostgreSQL 9.5 or SQLite
+    # 3.24.0 or later; older SQLite libraries would fail on the syntax.
+    dialect = sql_compiler.dialect
+    if (dialect.name == 'sqlite' and
+            dialect.dbapi.sqlite_version_info < (3, 24, 0)):
+        raise exception.OasisException(
+            _('Upserts need SQLite 3.24.0 or later, not %s.') %
+            dialect.dbapi.sqlite_version)
+    quote = sql_compiler.preparer.quote
+    keys = [quote(column.name) for column in upsert.table.primary_key]
+    return '%s ON CONFLICT (%s) DO UPDATE SET %s' % (
+        sql_compiler.visit_insert(upsert, **kw), ', '.join(keys),
+        ', '.join('%s = excluded.%s' % (quote(column), quote(column))
+                  for column in upsert.update_columns))
+
+
+def _job_status(results, expected_reports):
+    """Return the status and status reason of a job from its results.
+
+    A job fails as soon as one node reported a failure, and completes
+    once expected_reports nodes reported success.
+    """
+    failed = [r for r in results
+              if r.get('status') == fields.JobStatus.FAILED]
+    if failed:
+        return fields.JobStatus.FAILED, failed[0].get('status_reason')
+    completed = [r for r in results
+                 if r.get('status') == fields.JobStatus.COMPLETE]
+    if len(completed) >= (expected_reports or 1):
+        return fields.JobStatus.COMPLETE, None
+    return fields.JobStatus.PENDING, None
+
+
+def _row_values(row):
+    return dict((key, value) for key, value in row.as_dict().items()
+                if value is not None)
+
+
+def _endpoint_graph(endpoint):
+    """Return an endpoint row and its loaded graph as nested dicts."""
+    values = _row_values(endpoint)
+    values['http_apis'] = []
+    for http_api in endpoint.http_apis:
+        http_api_values = _row_values(http_api)
+        values['http_apis'].append(http_api_values)
+
+        if http_api.request is not None:
+            request = _row_values(http_api.request)
+            request['headers'] = [_row_values(header)
+                                  for header in http_api.request.headers]
+            http_api_values['request'] = request
+
+        if http_api.response is not None:
+            response = _row_values(http_api.response)
+            response['status_codes'] = []
+            for code in http_api.response.status_codes:
+                code_values = _row_values(code)
+                code_values['messages'] = [_row_values(message)
+                                           for message in code.messages]
+                response['status_codes'].append(code_values)
+            http_api_values['response'] = response
+    return values
+
+
 class Connection(api.Connection):
     """SqlAlchemy connection."""
 
     def __init__(self):
         pass
 
+    def begin_unit_of_work(self):
+        session = _create_facade_lazily().get_session()
+        session.begin()
+        _LOCAL.session = session
+
+    def commit_unit_of_work(self):
+        session = getattr(_LOCAL, 'session', None)
+        if session is not None:
+            session.commit()
+            session.begin()
+
+    def end_unit_of_work(self, commit=True):
+        session = getattr(_LOCAL, 'session', None)
+        if session is None:
+            return
+        _LOCAL.session = None
+        try:
+            if commit:
+                session.commit()
+            else:
+                session.rollback()
+        finally:
+            session.close()
+
     def _add_tenant_filters(self, context, query):
         if context.is_admin and context.all_tenants:
             return query
@@ -117,6 +318,176 @@ class Connection(api.Connection):
 
         return query
 
+    def get_validator(self, context, resource, resource_id):
+        model = getattr(models, resource)
+        query = model_query(model.id, model.created_at, model.updated_at)
+        if hasattr(model, 'project_id'):
+            query = self._add_tenant_filters(context, query)
+        return query.filter(model.id == resource_id).first()
+
+    def get_resource_list_by_ids(self, context, resource, ids, columns=None,
+                                 key='id'):
+        model = getattr(models, resource)
+        query = model_query(model)
+        if hasattr(model, 'project_id'):
+            query = self._add_tenant_filters(context, query)
+        if columns:
+            query = query.options(orm.load_only(*columns))
+        return query.filter(getattr(model, key).in_(ids)).all()
+
+    def create_resource_bulk(self, resource, values_list):
+        model = getattr(models, resource)
+        now = timeutils.utcnow()
+        rows = [_new_row(model, values, now) for values in values_list]
+
+        session = get_session()
+        try:
+            with transaction(session):
+                _insert_rows(session, model, rows)
+        except db_exc.DBDuplicateEntry:
+            raise exception.ResourceAlreadyExists(resource=resource)
+        if resource in name_cache.RESOURCES:
+            for row in rows:
+                name_cache.invalidate(resource, name=row.get('name'))
+        return [model(**row) for row in rows]
+
+    def _check_writable_ids(self, context, session, model, ids):
+        """Raise ResourceNotFound if a row of ids is not the context's.
+
+        The rows of a resource without a project may only be written by
+        an admin. The rows found are locked until the transaction ends.
+        """
+        for start in six.moves.range(0, len(ids), _BULK_CHUNK_SIZE):
+            chunk = ids[start:start + _BULK_CHUNK_SIZE]
+            query = model_query(model.id, session=session).filter(
+                model.id.in_(chunk))
+            existing = set(row.id for row in query.with_lockmode('update'))
+            if not existing:
+                continue
+            if hasattr(model, 'project_id'):
+                query = self._add_tenant_filters(context, query)
+                writable = set(row.id for row in query)
+            elif context.is_admin:
+                writable = existing
+            else:
+                writable = set()
+            for resource_id in chunk:
+                if resource_id in existing - writable:
+                    raise exception.ResourceNotFound(name=model.__name__,
+                                                     id=resource_id)
+
+    def upsert_resource_bulk(self, context, resource, values_list):
+        model = getattr(models, resource)
+        now = timeutils.utcnow()
+        columns = set(column.name for column in model.__table__.columns)
+
+        # NOTE: the rows of one statement must have the same keys, and
+        # only the given values are updated, so the rows are sent in
+        # groups of the same columns.
+        groups = collections.OrderedDict()
+        ids = []
+        given_ids = []
+        for values in values_list:
+            row = dict((key, value) for key, value in values.items()
+                       if key in columns)
+            if row.get('id'):
+                given_ids.append(row['id'])
+            else:
+                row['id'] = utils.generate_uuid()
+            row['created_at'] = now
+            row['updated_at'] = now
+            ids.append(row['id'])
+            groups.setdefault(frozenset(row), []).append(row)
+
+        session = get_session()
+        with transaction(session):
+            self._check_writable_ids(context, session, model, given_ids)
+            for keys, rows in groups.items():
+                # NOTE: the owner of an existing row is kept.
+                update_columns = sorted(keys - set(['id', 'created_at',
+                                                    'project_id',
+                                                    'user_id']))
+                _insert_rows(session, model, rows,
+                             Upsert(model.__table__, update_columns))
+        if resource in name_cache.RESOURCES:
+            for rows in groups.values():
+                for row in rows:
+                    name_cache.invalidate(resource, resource_id=row['id'],
+                                          name=row.get('name'))
+        return ids
+
+    def create_endpoint_definition(self, values):
+        now = timeutils.utcnow()
+        rows = collections.OrderedDict(
+            (model, []) for model in (models.Endpoint, models.HttpApi,
+                                      models.Request, models.RequestHeader,
+                                      models.Response,
+                                      models.ResponseStatusCode,
+                                      models.ResponseErrorMessage))
+
+        def add(model, values, **parent):
+            row = _new_row(model, dict(values, id=None, **parent), now)
+            rows[model].append(row)
+            return dict((key, value) for key, value in row.items()
+                        if value is not None)
+
+        endpoint = add(models.Endpoint, values)
+        endpoint['http_apis'] = []
+        for http_api_values in values.get('http_apis') or []:
+            http_api = add(models.HttpApi, http_api_values,
+                           endpoint_id=endpoint['id'])
+            endpoint['http_apis'].append(http_api)
+
+            request_values = http_api_values.get('request')
+            if request_values is not None:
+                request = add(models.Request, request_values,
+                              http_api_id=http_api['id'])
+                request['headers'] = [
+                    add(models.RequestHeader, header,
+                        request_id=request['id'])
+                    for header in request_values.get('headers') or []]
+                http_api['request'] = request
+
+            response_values = http_api_values.get('response')
+            if response_values is not None:
+                response = add(models.Response, response_values,
+                               http_api_id=http_api['id'])
+                response['status_codes'] = []
+                for code_values in response_values.get('status_codes') or []:
+                    code = add(models.ResponseStatusCode, code_values,
+                               response_id=response['id'])
+                    code['messages'] = [
+                        add(models.ResponseErrorMessage, message,
+                            response_statuscode_id=code['id'])
+                        for message in code_values.get('messages') or []]
+                    response['status_codes'].append(code)
+                http_api['response'] = response
+
+        session = get_session()
+        try:
+            with transaction(session):
+                for model, model_rows in rows.items():
+                    _insert_rows(session, model, model_rows)
+        except db_exc.DBDuplicateEntry:
+            raise exception.ResourceAlreadyExists(resource='Endpoint')
+        name_cache.invalidate('Endpoint', name=endpoint.get('name'))
+        return endpoint
+
+    def get_endpoint_graph(self, context, ids):
+        # NOTE: one query per level of the graph, whatever the number of
+        # endpoints: the http apis are loaded with their request and
+        # response joined, then the headers, status codes and messages.
+        http_apis = orm.subqueryload(models.Endpoint.http_apis)
+        query = model_query(models.Endpoint).options(
+            http_apis.joinedload(models.HttpApi.request)
+            .subqueryload(models.Request.headers),
+            http_apis.joinedload(models.HttpApi.response)
+            .subqueryload(models.Response.status_codes)
+            .subqueryload(models.ResponseStatusCode.messages))
+        query = self._add_tenant_filters(context, query)
+        query = query.filter(models.Endpoint.id.in_(ids))
+        return [_endpoint_graph(endpoint) for endpoint in query.all()]
+
     def _add_funtions_filters(self, query, filters):
         if filters is None:
             filters = {}
@@ -138,12 +509,14 @@ class Connection(api.Connection):
 
 ################# EndPoint APIs ##################
     def get_endpoint_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.Endpoint)
         query = self._add_tenant_filters(context, query)
         # query = self._add_funtions_filters(query, filters)
         return _paginate_query(models.Endpoint, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def create_endpoint(self, values):
         # ensure defaults are present for new endpoint
@@ -156,6 +529,7 @@ class Connection(api.Connection):
             endpoint.save()
         except db_exc.DBDuplicateEntry:
             raise exception.EndpointAlreadyExists(uuid=values['uuid'])
+        name_cache.invalidate('Endpoint', name=values.get('name'))
         return endpoint
 
     def get_endpoint_by_id(self, context, endpoint_id):
@@ -182,10 +556,11 @@ class Connection(api.Connection):
     def destroy_endpoint(self, id):
         """Delete endpoint policy"""
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.Endpoint, session=session)
             query = add_identity_filter(query, id)
             query.delete()
+        name_cache.invalidate('Endpoint', resource_id=id)
 
 
 ############## HttpApis APIs #############
@@ -197,11 +572,13 @@ class Connection(api.Connection):
         return query
 
     def get_httpapi_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.HttpApi)
         query = self._add_httpapis_filters(query, filters)
         return _paginate_query(models.HttpApi, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def get_httpapi_by_id(self, context, endpoint_id):
         query = model_query(models.HttpApi)
@@ -221,7 +598,7 @@ class Connection(api.Connection):
     def destroy_httpapi(self, httpapi_id):
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.HttpApi, session=session)
             query = add_identity_filter(query, httpapi_id)
             query.delete()
@@ -268,6 +645,16 @@ class Connection(api.Connection):
         except NoResultFound:
             raise exception.HttpApiNotFound(http_api_id=httpapi_id)
 
+    def get_request_list(self, context, filters=None, limit=None,
+                         marker=None, sort_key=None, sort_dir=None,
+                         columns=None, yield_per=None):
+        query = model_query(models.Request)
+        if filters and 'http_api_id' in filters:
+            query = query.filter_by(http_api_id=filters['http_api_id'])
+        return _paginate_query(models.Request, limit, marker,
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
+
 ################ Request Header APIs ###############
     def _add_request_header_filters(self, query, filters):
         if filters is None:
@@ -312,17 +699,19 @@ class Connection(api.Connection):
         """Delete request_header"""
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.RequestHeader, session=session)
             query = add_identity_filter(query, header_id)
             query.delete()
 
     def get_request_header_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.RequestHeader)
         query = self._add_request_header_filters(query, filters)
         return _paginate_query(models.RequestHeader, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def create_response(self, values):
         # ensure defaults are present for new endpoint
@@ -337,6 +726,16 @@ class Connection(api.Connection):
             raise exception.EndpointAlreadyExists(uuid=values['uuid'])
         return response
 
+    def get_response_list(self, context, filters=None, limit=None,
+                          marker=None, sort_key=None, sort_dir=None,
+                          columns=None, yield_per=None):
+        query = model_query(models.Response)
+        if filters and 'http_api_id' in filters:
+            query = query.filter_by(http_api_id=filters['http_api_id'])
+        return _paginate_query(models.Response, limit, marker,
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
+
     def create_response_code(self, values):
         # ensure defaults are present for new endpoint
         if not values.get('id'):
@@ -364,24 +763,30 @@ class Connection(api.Connection):
         return response_message
 
     def get_response_message_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.ResponseErrorMessage)
         return _paginate_query(models.ResponseErrorMessage, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def get_response_code_list(self, context, filters=None, limit=None,
-                     marker=None, sort_key=None, sort_dir=None):
+                     marker=None, sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.ResponseStatusCode)
         return _paginate_query(models.ResponseStatusCode, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def get_function_list(self, context, filters=None, limit=None, marker=None,
-                     sort_key=None, sort_dir=None):
+                     sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.Function)
         # query = self._add_tenant_filters(context, query)
         query = self._add_funtions_filters(query, filters)
         return _paginate_query(models.Function, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def create_function(self, values):
         # ensure defaults are present for new funtions
@@ -394,6 +799,7 @@ class Connection(api.Connection):
             function.save()
         except db_exc.DBDuplicateEntry:
             raise exception.FunctionAlreadyExists(uuid=values['uuid'])
+        name_cache.invalidate('Function', name=values.get('name'))
         return function
 
     def get_function_by_id(self, context, function_id):
@@ -426,7 +832,7 @@ class Connection(api.Connection):
             #     query.delete()
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.Function, session=session)
             query = add_identity_filter(query, function_id)
 
@@ -437,6 +843,7 @@ class Connection(api.Connection):
 
             destroy_function_resources(session, function_ref['id'])
             query.delete()
+        name_cache.invalidate('Function', resource_id=function_ref['id'])
 
     def update_function(self, function_id, values):
         # NOTE(dtantsur): this can lead to very strange errors
@@ -448,7 +855,7 @@ class Connection(api.Connection):
 
     def _do_update_function(self, function_id, values):
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.Function, session=session)
             query = add_identity_filter(query, function_id)
             try:
@@ -460,6 +867,8 @@ class Connection(api.Connection):
                 values['updated_at'] = timeutils.utcnow()
 
             ref.update(values)
+        name_cache.invalidate('Function', resource_id=ref.id,
+                              name=values.get('name'))
         return ref
 
     def _add_nodepool_policy_filters(self, query, filters):
@@ -480,12 +889,14 @@ class Connection(api.Connection):
         return query
 
     def get_nodepool_policy_list(self, context, filters=None, limit=None, marker=None,
-                     sort_key=None, sort_dir=None):
+                     sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.NodePoolPolicy)
         query = self._add_tenant_filters(context, query)
         query = self._add_nodepool_policy_filters(query, filters)
         return _paginate_query(models.NodePoolPolicy, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def get_nodepool_policy_by_id(self, context, nodepool_policy_id):
         query = model_query(models.NodePoolPolicy)
@@ -519,11 +930,12 @@ class Connection(api.Connection):
             nodepool_policy.save()
         except db_exc.DBDuplicateEntry:
             raise exception.NodePoolPolicyAlreadyExists(uuid=values['id'])
+        name_cache.invalidate('NodePoolPolicy', name=values.get('name'))
         return nodepool_policy
 
     def _do_update_nodepool_policy(self, nodepool_policy_id, values):
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.NodePoolPolicy, session=session)
             query = add_identity_filter(query, nodepool_policy_id)
             try:
@@ -534,6 +946,8 @@ class Connection(api.Connection):
             values['updated_at'] = timeutils.utcnow()
 
             ref.update(values)
+        name_cache.invalidate('NodePoolPolicy', resource_id=ref.id,
+                              name=values.get('name'))
         return ref
 
     def update_nodepool_policy(self, id, values):
@@ -553,7 +967,7 @@ class Connection(api.Connection):
             #     query.delete()
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.NodePoolPolicy, session=session)
             query = add_identity_filter(query, id)
 
@@ -564,6 +978,7 @@ class Connection(api.Connection):
 
             # destroy_function_resources(session, function_ref['id'])
             query.delete()
+        name_cache.invalidate('NodePoolPolicy', resource_id=function_ref['id'])
 
     def _add_nodepool_filters(self, query, filters):
         if filters is None:
@@ -583,12 +998,14 @@ class Connection(api.Connection):
         return query
 
     def get_nodepool_list(self, context, filters=None, limit=None, marker=None,
-                     sort_key=None, sort_dir=None):
+                     sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
         query = model_query(models.NodePool)
         query = self._add_tenant_filters(context, query)
         # query = self._add_nodepool_filters(query, filters)
         return _paginate_query(models.NodePool, limit, marker,
-                               sort_key, sort_dir, query)
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
 
     def get_nodepool_by_id(self, context, nodepool_id):
         query = model_query(models.NodePool)
@@ -610,6 +1027,7 @@ class Connection(api.Connection):
             nodepool.save()
         except db_exc.DBDuplicateEntry:
             raise exception.NodePoolAlreadyExists(uuid=values['id'])
+        name_cache.invalidate('NodePool', name=values.get('name'))
         return nodepool
 
     def destroy_nodepool(self, id):
@@ -621,7 +1039,7 @@ class Connection(api.Connection):
             #     query.delete()
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.NodePool, session=session)
             query = add_identity_filter(query, id)
 
@@ -632,6 +1050,7 @@ class Connection(api.Connection):
 
             # destroy_function_resources(session, function_ref['id'])
             query.delete()
+        name_cache.invalidate('NodePool', resource_id=function_ref['id'])
 
     def update_nodepool(self, id, values):
         # NOTE(dtantsur): this can lead to very strange errors
@@ -643,7 +1062,7 @@ class Connection(api.Connection):
 
     def _do_update_nodepool(self, nodepool_id, values):
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.NodePool, session=session)
             query = add_identity_filter(query, nodepool_id)
             try:
@@ -654,6 +1073,8 @@ class Connection(api.Connection):
             values['updated_at'] = timeutils.utcnow()
 
             ref.update(values)
+        name_cache.invalidate('NodePool', resource_id=ref.id,
+                              name=values.get('name'))
         return ref
 
     def destory_nodepool(self, id):
@@ -665,7 +1086,7 @@ class Connection(api.Connection):
             #     query.delete()
 
         session = get_session()
-        with session.begin():
+        with transaction(session):
             query = model_query(models.NodePool, session=session)
             query = add_identity_filter(query, id)
 
@@ -676,3 +1097,91 @@ class Connection(api.Connection):
 
             # destroy_function_resources(session, function_ref['id'])
             query.delete()
+        name_cache.invalidate('NodePool', resource_id=function_ref['id'])
+
+################# Job APIs ##################
+    def _add_jobs_filters(self, query, filters):
+        if filters is None:
+            filters = {}
+
+        possible_filters = ["function_id", "nodepool_id", "action", "status"]
+        filter_names = set(filters).intersection(possible_filters)
+        filter_dict = {filter_name: filters[filter_name]
+                       for filter_name in filter_names}
+
+        return query.filter_by(**filter_dict)
+
+    def get_job_list(self, context, filters=None, limit=None, marker=None,
+                     sort_key=None, sort_dir=None,
+                     columns=None, yield_per=None):
+        query = model_query(models.Job)
+        query = self._add_tenant_filters(context, query)
+        query = self._add_jobs_filters(query, filters)
+        return _paginate_query(models.Job, limit, marker,
+                               sort_key, sort_dir, query,
+                               columns, yield_per)
+
+    def get_job_by_id(self, context, job_id):
+        query = model_query(models.Job)
+        query = self._add_tenant_filters(context, query)
+        query = query.filter_by(id=job_id)
+        try:
+            return query.one()
+        except NoResultFound:
+            raise exception.JobNotFound(job=job_id)
+
+    def create_job(self, values):
+        if not values.get('id'):
+            values['id'] = utils.generate_uuid()
+
+        job = models.Job()
+        job.update(values)
+        try:
+            job.save()
+        except db_exc.DBDuplicateEntry:
+            raise exception.JobAlreadyExists(uuid=values['id'])
+        return job
+
+    def update_job(self, job_id, values):
+        if 'id' in values:
+            msg = _("Cannot overwrite ID for an existing Job.")
+            raise exception.InvalidParameterValue(err=msg)
+
+        session = get_session()
+        with transaction(session):
+            query = model_query(models.Job, session=session)
+            query = add_identity_filter(query, job_id)
+            try:
+                ref = query.with_lockmode('update').one()
+            except NoResultFound:
+                raise exception.JobNotFound(job=job_id)
+
+            values['updated_at'] = timeutils.utcnow()
+
+            ref.update(values)
+        return ref
+
+    def add_job_result(self, job_id, result):
+        session = get_session()
+        with transaction(session):
+            query = model_query(models.Job, session=session)
+            query = add_identity_filter(query, job_id)
+            try:
+                ref = query.with_lockmode('update').one()
+            except NoResultFound:
+                raise exception.JobNotFound(job=job_id)
+
+            # NOTE: Nodes report concurrently, so the merge happens under
+            # the row lock. A later report from the same host replaces its
+            # previous one.
+            results = [r for r in (ref.results or [])
+                       if r.get('host') != result.get('host')]
+            results.append(result)
+
+            status, status_reason = _job_status(results,
+                                                ref.expected_reports)
+            ref.update({'results': results,
+                        'status': status,
+                        'status_reason': status_reason,
+                        'updated_at': timeutils.utcnow()})
+        return ref
@@ -25,6 +25,7 @@ from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Integer
+from sqlalchemy import orm
 from sqlalchemy import schema
 from sqlalchemy import String
 from sqlalchemy import Text
@@ -32,12 +33,14 @@ from sqlalchemy.types import TypeDecorator, TEXT
 from oasis.common import config
 
 
-def table_args():
+def table_args(*indexes):
+    """Return the __table_args__ of a model with the given indexes."""
+    kwargs = {}
     engine_name = urlparse.urlparse(cfg.CONF.database.connection).scheme
     if engine_name == 'mysql':
-        return {'mysql_engine': cfg.CONF.database.mysql_engine,
-                'mysql_charset': "utf8"}
-    return None
+        kwargs = {'mysql_engine': cfg.CONF.database.mysql_engine,
+                  'mysql_charset': "utf8"}
+    return indexes + (kwargs,)
 
 
 class JsonEncodedType(TypeDecorator):
@@ -90,7 +93,8 @@ class OasisBase(models.TimestampMixin, models.ModelBase):
         if session is None:
             session = db_api.get_session()
 
-        super(OasisBase, self).save(session)
+        with db_api.transaction(session):
+            super(OasisBase, self).save(session)
 
 Base = declarative_base(cls=OasisBase)
 UUID4 = uuidutils.generate_uuid
@@ -105,8 +109,12 @@ class Function(Base, TimestampMixin):
     """Represents a Function."""
 
     __tablename__ = 'function'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_function_project_id_id', 'project_id', 'id'),
+        schema.Index('ix_function_project_id_name', 'project_id', 'name'),
+        schema.Index('ix_function_name', 'name'),
+        schema.Index('ix_function_endpoint_id', 'endpoint_id'),
+        schema.Index('ix_function_nodepool_id', 'nodepool_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     project_id = Column(String(36))
@@ -126,41 +134,59 @@ class Function(Base, TimestampMixin):
 
 class Endpoint(Base, TimestampMixin):
     __tablename__ = 'endpoint'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_endpoint_project_id_id', 'project_id', 'id'),
+        schema.Index('ix_endpoint_project_id_name', 'project_id', 'name'),
+        schema.Index('ix_endpoint_name', 'name')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
-    name = Column(Text)
+    name = Column(String(255))
     desc = Column(Text)
     url = Column(String(255))
     project_id = Column(String(36))
     user_id = Column(String(36))
 
+    http_apis = orm.relationship(
+        'HttpApi', primaryjoin='Endpoint.id == foreign(HttpApi.endpoint_id)',
+        order_by='HttpApi.id', viewonly=True)
+
 
 class HttpApi(Base, TimestampMixin):
     __tablename__ = 'http_api'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_http_api_endpoint_id', 'endpoint_id')
     )
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     method = Column(String(10))
     endpoint_id = Column(String(36))
 
+    request = orm.relationship(
+        'Request', primaryjoin='HttpApi.id == foreign(Request.http_api_id)',
+        uselist=False, viewonly=True)
+    response = orm.relationship(
+        'Response', primaryjoin='HttpApi.id == foreign(Response.http_api_id)',
+        uselist=False, viewonly=True)
+
 
 class Request(Base, TimestampMixin):
     __tablename__ = 'request'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_request_http_api_id', 'http_api_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     http_api_id = Column(String(36))
 
+    headers = orm.relationship(
+        'RequestHeader',
+        primaryjoin='Request.id == foreign(RequestHeader.request_id)',
+        order_by='RequestHeader.id', viewonly=True)
+
 
 class RequestHeader(Base, TimestampMixin):
     __tablename__ = 'request_header'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_request_header_request_id', 'request_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     name = Column(String(255))
@@ -170,27 +196,39 @@ class RequestHeader(Base, TimestampMixin):
 
 class Response(Base, TimestampMixin):
     __tablename__ = 'response'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_response_http_api_id', 'http_api_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     http_api_id = Column(String(36))
 
+    status_codes = orm.relationship(
+        'ResponseStatusCode',
+        primaryjoin='Response.id == foreign(ResponseStatusCode.response_id)',
+        order_by='ResponseStatusCode.id', viewonly=True)
+
 
 class ResponseStatusCode(Base, TimestampMixin):
     __tablename__ = 'response_statuscode'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_response_statuscode_response_id', 'response_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     status_code = Column(String(3))
     response_id = Column(String(36))
 
+    messages = orm.relationship(
+        'ResponseErrorMessage',
+        primaryjoin='ResponseStatusCode.id == '
+                    'foreign(ResponseErrorMessage.response_statuscode_id)',
+        order_by='ResponseErrorMessage.id', viewonly=True)
+
 
 class ResponseErrorMessage(Base, TimestampMixin):
     __tablename__ = 'response_error_message'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_response_error_message_response_statuscode_id',
+                     'response_statuscode_id')
     )
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
     message = Column(String(255))
@@ -199,8 +237,10 @@ class ResponseErrorMessage(Base, TimestampMixin):
 
 class NodePoolPolicy(Base, TimestampMixin):
     __tablename__ = 'nodepool_policy'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_nodepool_policy_project_id_id', 'project_id', 'id'),
+        schema.Index('ix_nodepool_policy_project_id_name',
+                     'project_id', 'name')
     )
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -223,8 +263,11 @@ class NodePoolPolicy(Base, TimestampMixin):
 
 class NodePool(Base, TimestampMixin):
     __tablename__ = 'nodepool'
-    __table_args__ = (
-        table_args()
+    __table_args__ = table_args(
+        schema.Index('ix_nodepool_project_id_id', 'project_id', 'id'),
+        schema.Index('ix_nodepool_project_id_name', 'project_id', 'name'),
+        schema.Index('ix_nodepool_function_id', 'function_id'),
+        schema.Index('ix_nodepool_nodepool_policy_id', 'nodepool_policy_id')
     )
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -239,3 +282,23 @@ class NodePool(Base, TimestampMixin):
     status_reason = Column(Text)
 
 
+class Job(Base, TimestampMixin):
+    """Represents an asynchronous function deployment job."""
+
+    __tablename__ = 'job'
+    __table_args__ = table_args(
+        schema.Index('ix_job_project_id_id', 'project_id', 'id'),
+        schema.Index('ix_job_function_id', 'function_id'),
+        schema.Index('ix_job_nodepool_id', 'nodepool_id')
+    )
+
+    id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
+    project_id = Column(String(36))
+    user_id = Column(String(36))
+    function_id = Column(String(36))
+    nodepool_id = Column(String(36))
+    action = Column(String(20))
+    status = Column(String(20))
+    status_reason = Column(Text)
+    results = Column(JSONEncodedList)
+    expected_reports = Column(Integer())
@@ -17,6 +17,7 @@ from oasis.objects import nodepool
 from oasis.objects import nodepool_policy
 from oasis.objects import endpoint
 from oasis.objects import httpapi
+from oasis.objects import job
 from oasis.objects import request
 from oasis.objects import requestheader
 from oasis.objects import response
@@ -28,6 +29,7 @@ Function = function.Function
 NodePool = nodepool.NodePool
 NodePoolPolicy = nodepool_policy.NodePoolPolicy
 HttpApi = httpapi.HttpApi
+Job = job.Job
 Request = request.Request
 RequestHeader = requestheader.RequestHeader
 Response = response.Response
@@ -37,6 +39,7 @@ ResponseMessage = responsemessage.ResponseMessage
 __all__ = (Function,
            Endpoint,
            HttpApi,
+           Job,
            Request,
            RequestHeader,
            Response,
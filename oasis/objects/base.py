@@ -39,11 +39,80 @@ class OasisObject(ovoo_base.VersionedObject):
     OBJ_SERIAL_NAMESPACE = 'oasis_object'
     OBJ_PROJECT_NAMESPACE = 'oasis'
 
+    # The name of the database model of the object, when it is not the
+    # name of the object.
+    db_model = None
+
+    @classmethod
+    def db_model_name(cls):
+        return cls.db_model or cls.obj_name()
+
     def as_dict(self):
         return {k: getattr(self, k)
                 for k in self.fields
                 if self.obj_attr_is_set(k)}
 
+    @classmethod
+    def get_validator(cls, context, obj_id):
+        """Return the id and timestamps of a record without loading it.
+
+        :param context: Security context.
+        :param obj_id: the id of the record.
+        :returns: an (id, created_at, updated_at) tuple, or None if there
+                  is no such record.
+        """
+        return cls.dbapi.get_validator(context, cls.db_model_name(), obj_id)
+
+    @classmethod
+    def list_by_ids(cls, context, ids, columns=None, key='id'):
+        """Return the objects with the given ids, in no particular order.
+
+        :param context: Security context.
+        :param ids: the ids of the objects.
+        :param columns: the fields to load, or None to load every field.
+        :param key: the field holding the ids, e.g. 'endpoint_id' to load
+                    the objects of some endpoints.
+        """
+        db_objects = cls.dbapi.get_resource_list_by_ids(
+            context, cls.db_model_name(), ids, columns=columns, key=key)
+        return cls._from_db_object_list(db_objects, cls, context, columns)
+
+    @classmethod
+    def create_many(cls, context, values_list):
+        """Create records in the DB in a single transaction.
+
+        :param context: Security context.
+        :param values_list: the field values of each record.
+        :returns: the created objects, in the order of values_list.
+        """
+        db_objects = cls.dbapi.create_resource_bulk(cls.db_model_name(),
+                                                    values_list)
+        return cls._from_db_object_list(db_objects, cls, context)
+
+    @classmethod
+    def upsert_many(cls, context, values_list):
+        """Create records, or update those whose id exists, in one transaction.
+
+        :param context: Security context.
+        :param values_list: the field values of each record. Only the given
+                            fields of an existing record are updated, and
+                            it must belong to the project of the context.
+        :returns: the ids of the records, in the order of values_list.
+        """
+        return cls.dbapi.upsert_resource_bulk(context, cls.db_model_name(),
+                                              values_list)
+
+    @classmethod
+    def _from_db_object_iter(cls, context, db_objects, columns=None):
+        """Lazily converts database entities to formal objects."""
+        try:
+            for db_object in db_objects:
+                yield cls._from_db_object(cls(context), db_object, columns)
+        finally:
+            # Releases the database cursor of a stream closed early.
+            if hasattr(db_objects, 'close'):
+                db_objects.close()
+
 
 class OasisObjectDictCompat(ovoo_base.VersionedObjectDictCompat):
     pass
@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -23,9 +24,9 @@ class Endpoint(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
     }
 
     @staticmethod
-    def _from_db_object(endpoint, db_endpoint):
+    def _from_db_object(endpoint, db_endpoint, columns=None):
         """Converts a database entity to a formal object."""
-        for field in endpoint.fields:
+        for field in columns or endpoint.fields:
             if field != 'endpoint':
                 endpoint[field] = db_endpoint[field]
 
@@ -37,9 +38,11 @@ class Endpoint(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
         return endpoint
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [Endpoint._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [Endpoint._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, endpoint_id):
@@ -95,7 +98,8 @@ class Endpoint(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of Endpoint objects.
 
         :param context: Security context.
@@ -103,6 +107,9 @@ class Endpoint(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -110,8 +117,35 @@ class Endpoint(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return Endpoint._from_db_object_list(db_endpoints, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_endpoints, columns)
+        return Endpoint._from_db_object_list(db_endpoints, cls, context,
+                                             columns)
+
+    @base.remotable_classmethod
+    def create_definition(cls, context, definition):
+        """Create an endpoint and all of its http apis in one transaction.
+
+        :param context: Security context.
+        :param definition: a dict of the endpoint fields, nesting the http
+                           apis and their requests and responses.
+        :returns: the created definition, as nested dicts with their ids.
+        """
+        return cls.dbapi.create_endpoint_definition(definition)
+
+    @base.remotable_classmethod
+    def get_definitions(cls, context, ids):
+        """Return endpoints with all of their http apis.
+
+        :param context: Security context.
+        :param ids: the ids of the endpoints.
+        :returns: a list of definitions, as nested dicts, of the endpoints
+                  visible to the context.
+        """
+        return cls.dbapi.get_endpoint_graph(context, ids)
 
     @base.remotable
     def create(self, context=None):
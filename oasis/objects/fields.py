@@ -54,6 +54,30 @@ class FunctionStatus(fields.Enum):
             valid_values=FunctionStatus.ALL)
 
 
+class JobStatus(fields.Enum):
+    ALL = (
+        PENDING, COMPLETE, FAILED,
+    ) = (
+        'PENDING', 'COMPLETE', 'FAILED',
+    )
+
+    def __init__(self):
+        super(JobStatus, self).__init__(
+            valid_values=JobStatus.ALL)
+
+
+class JobAction(fields.Enum):
+    ALL = (
+        CREATE, UPDATE, DELETE,
+    ) = (
+        'create', 'update', 'delete',
+    )
+
+    def __init__(self):
+        super(JobAction, self).__init__(
+            valid_values=JobAction.ALL)
+
+
 class ListOfDictsField(fields.AutoTypedField):
     AUTO_TYPE = fields.List(fields.Dict(fields.FieldType()))
 
@@ -61,3 +85,10 @@ class ListOfDictsField(fields.AutoTypedField):
 class NodePoolStatusField(fields.BaseEnumField):
     AUTO_TYPE = NodePoolStatus()
 
+
+class JobStatusField(fields.BaseEnumField):
+    AUTO_TYPE = JobStatus()
+
+
+class JobActionField(fields.BaseEnumField):
+    AUTO_TYPE = JobAction()
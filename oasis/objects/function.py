@@ -16,6 +16,7 @@
 from oslo_versionedobjects import fields
 
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -48,9 +49,9 @@ class Function(base.OasisPersistentObject, base.OasisObject,
     }
 
     @staticmethod
-    def _from_db_object(function, db_function):
+    def _from_db_object(function, db_function, columns=None):
         """Converts a database entity to a formal object."""
-        for field in function.fields:
+        for field in columns or function.fields:
             if field != 'function':
                 function[field] = db_function[field]
 
@@ -62,9 +63,11 @@ class Function(base.OasisPersistentObject, base.OasisObject,
         return function
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [Function._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [Function._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
 
     @base.remotable_classmethod
     def get(cls, context, function_id):
@@ -119,7 +122,8 @@ class Function(base.OasisPersistentObject, base.OasisObject,
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of Function objects.
 
         :param context: Security context.
@@ -131,6 +135,9 @@ class Function(base.OasisPersistentObject, base.OasisObject,
                         'node_count', 'stack_id', 'api_address',
                         'node_addresses', 'project_id', 'user_id',
                         'status'(should be a status list), 'master_count'.
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
         :returns: a list of :class:`Function` object.
 
         """
@@ -138,8 +145,13 @@ class Function(base.OasisPersistentObject, base.OasisObject,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return Function._from_db_object_list(db_functions, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_functions, columns)
+        return Function._from_db_object_list(db_functions, cls, context,
+                                             columns)
 
     @base.remotable
     def create(self, context=None):
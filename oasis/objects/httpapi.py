@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -21,9 +22,9 @@ class HttpApi(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
     }
 
     @staticmethod
-    def _from_db_object(httpapi, db_httpapi):
+    def _from_db_object(httpapi, db_httpapi, columns=None):
         """Converts a database entity to a formal object."""
-        for field in httpapi.fields:
+        for field in columns or httpapi.fields:
             if field != 'httpapi':
                 httpapi[field] = db_httpapi[field]
 
@@ -35,9 +36,11 @@ class HttpApi(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
         return httpapi
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [HttpApi._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [HttpApi._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, httpapi_id):
@@ -96,7 +99,8 @@ class HttpApi(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of HttpApi objects.
 
         :param context: Security context.
@@ -104,6 +108,9 @@ class HttpApi(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -111,8 +118,13 @@ class HttpApi(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
                                                  marker=marker,
                                                  sort_key=sort_key,
                                                  sort_dir=sort_dir,
-                                                 filters=filters)
-        return HttpApi._from_db_object_list(db_httpapis, cls, context)
+                                                 filters=filters,
+                                                 columns=columns,
+                                                 yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_httpapis, columns)
+        return HttpApi._from_db_object_list(db_httpapis, cls, context,
+                                            columns)
 
     @base.remotable
     def create(self, context=None):
@@ -0,0 +1,159 @@
+# coding=utf-8
+#
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_versionedobjects import fields
+
+from oasis.common import timing
+from oasis.db import api as dbapi
+from oasis.objects import base
+from oasis.objects import fields as m_fields
+
+
+@base.OasisObjectRegistry.register
+class Job(base.OasisPersistentObject, base.OasisObject,
+          base.OasisObjectDictCompat):
+    # Version 1.0: Initial version
+    # Version 1.1: Added expected_reports field
+    VERSION = '1.1'
+
+    dbapi = dbapi.get_instance()
+
+    fields = {
+        'id': fields.StringField(),
+        'project_id': fields.StringField(nullable=True),
+        'user_id': fields.StringField(nullable=True),
+        'function_id': fields.StringField(nullable=True),
+        'nodepool_id': fields.StringField(nullable=True),
+        'action': m_fields.JobActionField(nullable=True),
+        'status': m_fields.JobStatusField(nullable=True),
+        'status_reason': fields.StringField(nullable=True),
+        'results': m_fields.ListOfDictsField(nullable=True),
+        'expected_reports': fields.IntegerField(nullable=True),
+    }
+
+    @staticmethod
+    def _from_db_object(job, db_job, columns=None):
+        """Converts a database entity to a formal object."""
+        for field in columns or job.fields:
+            job[field] = db_job[field]
+
+        job.obj_reset_changes()
+        return job
+
+    @staticmethod
+    def _from_db_object_list(db_objects, cls, context, columns=None):
+        """Converts a list of database entities to a list of formal objects."""
+        with timing.measure('hydrate'):
+            return [Job._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
+
+    @base.remotable_classmethod
+    def get_by_id(cls, context, job_id):
+        """Find a job based on its id and return a Job object.
+
+        :param job_id: the id of a job.
+        :param context: Security context
+        :returns: a :class:`Job` object.
+        """
+        db_job = cls.dbapi.get_job_by_id(context, job_id)
+        job = Job._from_db_object(cls(context), db_job)
+        return job
+
+    @base.remotable_classmethod
+    def list(cls, context, limit=None, marker=None,
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
+        """Return a list of Job objects.
+
+        :param context: Security context.
+        :param limit: maximum number of resources to return in a single result.
+        :param marker: pagination marker for large data sets.
+        :param sort_key: column to sort results by.
+        :param sort_dir: direction to sort. "asc" or "desc".
+        :param filters: filter dict, can includes 'function_id',
+                        'nodepool_id', 'action' and 'status'.
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
+        :returns: a list of :class:`Job` object.
+
+        """
+        db_jobs = cls.dbapi.get_job_list(context, limit=limit,
+                                         marker=marker,
+                                         sort_key=sort_key,
+                                         sort_dir=sort_dir,
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_jobs, columns)
+        return Job._from_db_object_list(db_jobs, cls, context,
+                                        columns)
+
+    @base.remotable
+    def create(self, context=None):
+        """Create a Job record in the DB.
+
+        :param context: Security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context)
+
+        """
+        values = self.obj_get_changes()
+        db_job = self.dbapi.create_job(values)
+        self._from_db_object(self, db_job)
+
+    @base.remotable
+    def save(self, context=None):
+        """Save updates to this Job.
+
+        Updates will be made column by column based on the result
+        of self.what_changed().
+
+        :param context: Security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context)
+        """
+        updates = self.obj_get_changes()
+        self.dbapi.update_job(self.id, updates)
+
+        self.obj_reset_changes()
+
+    @base.remotable
+    def add_result(self, host, status, status_reason=None, context=None):
+        """Record the result one node reported for this Job.
+
+        :param host: the node that ran the deployment.
+        :param status: the status reported by the node.
+        :param status_reason: an optional explanation of the status.
+        :param context: Security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context)
+        """
+        result = {'host': host, 'status': status}
+        # NOTE: the values of the results may not be None.
+        if status_reason is not None:
+            result['status_reason'] = status_reason
+        db_job = self.dbapi.add_job_result(self.id, result)
+        self._from_db_object(self, db_job)
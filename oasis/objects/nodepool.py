@@ -17,6 +17,7 @@ from oslo_versionedobjects import fields
 from oasis.objects import fields as m_fields
 
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -45,9 +46,9 @@ class NodePool(base.OasisPersistentObject, base.OasisObject,
     }
 
     @staticmethod
-    def _from_db_object(nodepool, db_nodepool):
+    def _from_db_object(nodepool, db_nodepool, columns=None):
         """Converts a database entity to a formal object."""
-        for field in nodepool.fields:
+        for field in columns or nodepool.fields:
             if field != 'nodepool':
                 nodepool[field] = db_nodepool[field]
 
@@ -59,9 +60,11 @@ class NodePool(base.OasisPersistentObject, base.OasisObject,
         return nodepool
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [NodePool._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [NodePool._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
 
     @base.remotable_classmethod
     def get(cls, context, nodepool_id):
@@ -118,7 +121,8 @@ class NodePool(base.OasisPersistentObject, base.OasisObject,
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of NodePool objects.
 
         :param context: Security context.
@@ -130,6 +134,9 @@ class NodePool(base.OasisPersistentObject, base.OasisObject,
                         'node_count', 'stack_id', 'api_address',
                         'node_addresses', 'project_id', 'user_id',
                         'status'(should be a status list), 'master_count'.
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
         :returns: a list of :class:`NodePool` object.
 
         """
@@ -137,8 +144,13 @@ class NodePool(base.OasisPersistentObject, base.OasisObject,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return NodePool._from_db_object_list(db_nodepools, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_nodepools, columns)
+        return NodePool._from_db_object_list(db_nodepools, cls, context,
+                                             columns)
 
     @base.remotable
     def create(self, context=None):
@@ -16,6 +16,7 @@
 from oslo_versionedobjects import fields
 
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -50,9 +51,9 @@ class NodePoolPolicy(base.OasisPersistentObject, base.OasisObject,
     }
 
     @staticmethod
-    def _from_db_object(nodepool_policy, db_nodepool_policy):
+    def _from_db_object(nodepool_policy, db_nodepool_policy, columns=None):
         """Converts a database entity to a formal object."""
-        for field in nodepool_policy.fields:
+        for field in columns or nodepool_policy.fields:
             if field != 'nodepool_policy':
                 nodepool_policy[field] = db_nodepool_policy[field]
 
@@ -64,9 +65,11 @@ class NodePoolPolicy(base.OasisPersistentObject, base.OasisObject,
         return nodepool_policy
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [NodePoolPolicy._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [NodePoolPolicy._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
 
     @base.remotable_classmethod
     def get(cls, context, nodepool_policy_id):
@@ -121,7 +124,8 @@ class NodePoolPolicy(base.OasisPersistentObject, base.OasisObject,
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of NodePool objects.
 
         :param context: Security context.
@@ -133,6 +137,9 @@ class NodePoolPolicy(base.OasisPersistentObject, base.OasisObject,
                         'node_count', 'stack_id', 'api_address',
                         'node_addresses', 'project_id', 'user_id',
                         'status'(should be a status list), 'master_count'.
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
         :returns: a list of :class:`NodePool` object.
 
         """
@@ -140,8 +147,13 @@ class NodePoolPolicy(base.OasisPersistentObject, base.OasisObject,
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return NodePoolPolicy._from_db_object_list(db_nodepool_policies, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_nodepool_policies, columns)
+        return NodePoolPolicy._from_db_object_list(db_nodepool_policies, cls, context,
+                                                   columns)
 
     @base.remotable
     def create(self, context=None):
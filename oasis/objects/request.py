@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -19,9 +20,9 @@ class Request(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
     }
 
     @staticmethod
-    def _from_db_object(request, db_request):
+    def _from_db_object(request, db_request, columns=None):
         """Converts a database entity to a formal object."""
-        for field in request.fields:
+        for field in columns or request.fields:
             if field != 'request':
                 request[field] = db_request[field]
 
@@ -33,9 +34,11 @@ class Request(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
         return request
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [Request._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [Request._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, request_id):
@@ -90,7 +93,8 @@ class Request(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of Request objects.
 
         :param context: Security context.
@@ -98,6 +102,9 @@ class Request(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -105,8 +112,13 @@ class Request(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDict
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return Request._from_db_object_list(db_requests, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_requests, columns)
+        return Request._from_db_object_list(db_requests, cls, context,
+                                            columns)
 
     @base.remotable
     def create(self, context=None):
@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -23,9 +24,9 @@ class RequestHeader(base.OasisPersistentObject, base.OasisObject, base.OasisObje
     }
 
     @staticmethod
-    def _from_db_object(requestheader, db_requestheader):
+    def _from_db_object(requestheader, db_requestheader, columns=None):
         """Converts a database entity to a formal object."""
-        for field in requestheader.fields:
+        for field in columns or requestheader.fields:
             if field != 'requestheader':
                 requestheader[field] = db_requestheader[field]
 
@@ -37,9 +38,11 @@ class RequestHeader(base.OasisPersistentObject, base.OasisObject, base.OasisObje
         return requestheader
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [RequestHeader._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [RequestHeader._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, requestheader_id):
@@ -98,7 +101,8 @@ class RequestHeader(base.OasisPersistentObject, base.OasisObject, base.OasisObje
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of RequestHeader objects.
 
         :param context: Security context.
@@ -106,6 +110,9 @@ class RequestHeader(base.OasisPersistentObject, base.OasisObject, base.OasisObje
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -113,8 +120,13 @@ class RequestHeader(base.OasisPersistentObject, base.OasisObject, base.OasisObje
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return RequestHeader._from_db_object_list(db_requestheaders, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_requestheaders, columns)
+        return RequestHeader._from_db_object_list(db_requestheaders, cls, context,
+                                                  columns)
 
     @base.remotable
     def create(self, context=None):
@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -19,9 +20,9 @@ class Response(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
     }
 
     @staticmethod
-    def _from_db_object(response, db_response):
+    def _from_db_object(response, db_response, columns=None):
         """Converts a database entity to a formal object."""
-        for field in response.fields:
+        for field in columns or response.fields:
             if field != 'response':
                 response[field] = db_response[field]
 
@@ -33,9 +34,11 @@ class Response(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
         return response
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [Response._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [Response._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, response_id):
@@ -90,7 +93,8 @@ class Response(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of Response objects.
 
         :param context: Security context.
@@ -98,6 +102,9 @@ class Response(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -105,8 +112,13 @@ class Response(base.OasisPersistentObject, base.OasisObject, base.OasisObjectDic
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return Response._from_db_object_list(db_responses, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_responses, columns)
+        return Response._from_db_object_list(db_responses, cls, context,
+                                             columns)
 
     @base.remotable
     def create(self, context=None):
@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -12,6 +13,7 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
     VERSION = '1.0'
 
     dbapi = dbapi.get_instance()
+    db_model = 'ResponseStatusCode'
 
     fields = {
         'id': fields.StringField(),
@@ -20,9 +22,9 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
     }
 
     @staticmethod
-    def _from_db_object(responsecode, db_responsecode):
+    def _from_db_object(responsecode, db_responsecode, columns=None):
         """Converts a database entity to a formal object."""
-        for field in responsecode.fields:
+        for field in columns or responsecode.fields:
             if field != 'responsecode':
                 responsecode[field] = db_responsecode[field]
 
@@ -34,9 +36,11 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
         return responsecode
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [ResponseCode._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [ResponseCode._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, responsecode_id):
@@ -91,7 +95,8 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of ResponseCode objects.
 
         :param context: Security context.
@@ -99,6 +104,9 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -106,8 +114,13 @@ class ResponseCode(base.OasisPersistentObject, base.OasisObject, base.OasisObjec
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return ResponseCode._from_db_object_list(db_responsecodes, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_responsecodes, columns)
+        return ResponseCode._from_db_object_list(db_responsecodes, cls, context,
+                                                 columns)
 
     @base.remotable
     def create(self, context=None):
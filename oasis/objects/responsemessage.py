@@ -1,4 +1,5 @@
 from oasis.common import exception
+from oasis.common import timing
 from oasis.common import utils
 from oasis.db import api as dbapi
 from oasis.objects import base
@@ -12,6 +13,7 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
     VERSION = '1.0'
 
     dbapi = dbapi.get_instance()
+    db_model = 'ResponseErrorMessage'
 
     fields = {
         'id': fields.StringField(),
@@ -20,9 +22,9 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
     }
 
     @staticmethod
-    def _from_db_object(responsemessage, db_responsemessage):
+    def _from_db_object(responsemessage, db_responsemessage, columns=None):
         """Converts a database entity to a formal object."""
-        for field in responsemessage.fields:
+        for field in columns or responsemessage.fields:
             if field != 'responsemessage':
                 responsemessage[field] = db_responsemessage[field]
 
@@ -34,9 +36,11 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
         return responsemessage
 
     @staticmethod
-    def _from_db_object_list(db_objects, cls, context):
+    def _from_db_object_list(db_objects, cls, context, columns=None):
         """Converts a list of database entities to a list of formal objects."""
-        return [ResponseMessage._from_db_object(cls(context), obj) for obj in db_objects]
+        with timing.measure('hydrate'):
+            return [ResponseMessage._from_db_object(cls(context), obj, columns)
+                    for obj in db_objects]
     
     @base.remotable_classmethod
     def get(cls, context, responsemessage_id):
@@ -91,7 +95,8 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
 
     @base.remotable_classmethod
     def list(cls, context, limit=None, marker=None,
-             sort_key=None, sort_dir=None, filters=None):
+             sort_key=None, sort_dir=None, filters=None,
+             columns=None, yield_per=None):
         """Return a list of ResponseMessage objects.
 
         :param context: Security context.
@@ -99,6 +104,9 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
         :param marker: pagination marker for large data sets.
         :param sort_key: column to sort results by.
         :param sort_dir: direction to sort. "asc" or "desc".
+        :param columns: fields to load, or None to load all of them.
+        :param yield_per: if set, return an iterator reading this many rows
+                          at a time instead of a list.
 
         """
 
@@ -106,8 +114,13 @@ class ResponseMessage(base.OasisPersistentObject, base.OasisObject, base.OasisOb
                                          marker=marker,
                                          sort_key=sort_key,
                                          sort_dir=sort_dir,
-                                         filters=filters)
-        return ResponseMessage._from_db_object_list(db_responsemessages, cls, context)
+                                         filters=filters,
+                                         columns=columns,
+                                         yield_per=yield_per)
+        if yield_per:
+            return cls._from_db_object_iter(context, db_responsemessages, columns)
+        return ResponseMessage._from_db_object_list(db_responsemessages, cls, context,
+                                                    columns)
 
     @base.remotable
     def create(self, context=None):
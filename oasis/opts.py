@@ -15,9 +15,11 @@
 
 import itertools
 
+import oasis.agent.config
 import oasis.api.app
 import oasis.common.clients
 import oasis.common.exception
+import oasis.common.policy
 import oasis.common.service
 import oasis.conductor.config
 import oasis.conductor.handlers.nodepool_conductor
@@ -32,7 +34,9 @@ def list_opts():
                          oasis.common.utils.UTILS_OPTS,
                          oasis.common.rpc_service.periodic_opts,
                          oasis.common.service.service_opts,
+                         oasis.common.policy.policy_cache_opts,
                          )),
+        ('agent', oasis.agent.config.AGENT_SERVICE_OPTS),
         ('api', oasis.api.app.API_SERVICE_OPTS),
         ('conductor', oasis.conductor.config.SERVICE_OPTS),
         ('database', oasis.db.sql_opts),
@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Base classes for the oasis tests."""
+
+import os
+
+import fixtures
+from oslo_config import cfg
+from oslo_config import fixture as config_fixture
+from oslotest import base
+
+from oasis.common import context as oasis_context
+from oasis.common import name_cache
+from oasis.db import api as db_api
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis.db.sqlalchemy import models
+
+CONF = cfg.CONF
+CONF.import_group('api', 'oasis.api.app')
+
+
+class TestCase(base.BaseTestCase):
+    """Test case base class for all unit tests."""
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.useFixture(config_fixture.Config(CONF))
+        CONF([], project='oasis', default_config_files=[])
+        # Keeps the state written by the code under test, such as the
+        # generated pagination marker key, out of the source tree.
+        self.config(state_path=self.useFixture(fixtures.TempDir()).path)
+        self.context = oasis_context.RequestContext(
+            auth_token='auth_token', project_id='fake_project',
+            user_id='fake_user')
+
+    def config(self, **kw):
+        """Override config options for a test."""
+        group = kw.pop('group', None)
+        for k, v in kw.items():
+            CONF.set_override(k, v, group)
+
+
+class DbTestCase(TestCase):
+    """Test case running against a fresh sqlite database."""
+
+    def setUp(self):
+        super(DbTestCase, self).setUp()
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'oasis.sqlite')
+        self.config(connection='sqlite:///%s' % path, group='database')
+
+        self._reset_facade()
+        self.addCleanup(self._reset_facade)
+        models.Base.metadata.create_all(sqla_api.get_engine())
+        self.dbapi = db_api.get_instance()
+
+    @staticmethod
+    def _reset_facade():
+        sqla_api._FACADE = None
+        sqla_api._LOCAL.session = None
+        name_cache._CACHE = None
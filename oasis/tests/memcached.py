@@ -0,0 +1,123 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A local stand-in for memcached, for the tests of the shared backends.
+
+It speaks the get, set, add, incr, decr and delete commands of the
+memcached text protocol, and keeps the entries in a dict.
+"""
+
+import threading
+import time
+
+import fixtures
+from six.moves import socketserver
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            words = line.split()
+            if not words:
+                continue
+            command = getattr(self, '_do_' + words[0].decode('ascii'),
+                              None)
+            if command is None:
+                self.wfile.write(b'ERROR\r\n')
+            else:
+                self.wfile.write(command(*words[1:]))
+            self.wfile.flush()
+
+    def _get(self, key):
+        entry = self.server.entries.get(key)
+        if entry is None:
+            return None
+        flags, expires, value = entry
+        if expires and expires <= time.time():
+            del self.server.entries[key]
+            return None
+        return entry
+
+    def _do_get(self, *keys):
+        response = b''
+        for key in keys:
+            entry = self._get(key)
+            if entry is not None:
+                flags, expires, value = entry
+                response += b'VALUE %s %s %d\r\n%s\r\n' % (key, flags,
+                                                           len(value), value)
+        return response + b'END\r\n'
+
+    def _store(self, key, flags, exptime, length, *noreply):
+        value = self.rfile.read(int(length) + 2)[:-2]
+        exptime = int(exptime)
+        self.server.entries[key] = (flags, exptime and time.time() + exptime,
+                                    value)
+        return b'STORED\r\n'
+
+    def _do_set(self, key, flags, exptime, length, *noreply):
+        return self._store(key, flags, exptime, length)
+
+    def _do_add(self, key, flags, exptime, length, *noreply):
+        if self._get(key) is not None:
+            self.rfile.read(int(length) + 2)
+            return b'NOT_STORED\r\n'
+        return self._store(key, flags, exptime, length)
+
+    def _change(self, key, delta):
+        entry = self._get(key)
+        if entry is None:
+            return b'NOT_FOUND\r\n'
+        flags, expires, value = entry
+        value = str(max(int(value) + delta, 0)).encode('ascii')
+        self.server.entries[key] = (flags, expires, value)
+        return value + b'\r\n'
+
+    def _do_incr(self, key, delta, *noreply):
+        return self._change(key, int(delta))
+
+    def _do_decr(self, key, delta, *noreply):
+        return self._change(key, -int(delta))
+
+    def _do_delete(self, key, *noreply):
+        if self.server.entries.pop(key, None) is None:
+            return b'NOT_FOUND\r\n'
+        return b'DELETED\r\n'
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MemcachedFixture(fixtures.Fixture):
+    """Serve the memcached protocol on a free local port.
+
+    The server is at self.address, as host:port, and its entries in
+    self.entries, keyed by the bytes of their key.
+    """
+
+    def setUp(self):
+        super(MemcachedFixture, self).setUp()
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.entries = self.entries = {}
+        self.address = '%s:%d' % self.server.server_address
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
@@ -0,0 +1,51 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Helpers for the benchmarks.
+
+The benchmarks run with the unit tests, so they are kept short and only
+assert on what does not depend on the speed of the machine, or on wide
+margins. Their timings are attached to the test results as details and
+shown by testr on failure, or with testr last --subunit | subunit2pyunit.
+"""
+
+import timeit
+
+from testtools import content
+
+
+class BenchmarkMixin(object):
+    """Time callables and report the timings of a test."""
+
+    def setUp(self):
+        super(BenchmarkMixin, self).setUp()
+        self._timings = []
+        self.addDetail('timings', content.Content(
+            content.UTF8_TEXT, lambda: [('\n'.join(self._timings) +
+                                         '\n').encode('utf-8')]))
+
+    def measure(self, name, func, number, repeat=3):
+        """Return the best time of one call of func, in seconds.
+
+        :param name: the name of the timing in the report.
+        :param func: the callable to time, taking no arguments.
+        :param number: the number of calls timed together.
+        :param repeat: the number of times the calls are timed.
+        """
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        per_call = best / number
+        self.report('%s: %.1f us per call' % (name, per_call * 1e6))
+        return per_call
+
+    def report(self, line):
+        """Add a line to the report of the test."""
+        self._timings.append(line)
@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark of the per-request RPC overhead of the API."""
+
+import mock
+from oslo_config import cfg
+import oslo_messaging as messaging
+from oslo_messaging import conffixture
+
+from oasis.api import hooks
+from oasis.common import rpc
+from oasis.common import rpc_service
+from oasis.objects import base as objects_base
+from oasis.tests import base
+from oasis.tests.performance import base as perf_base
+
+
+class _Holder(object):
+    """A bare pecan state or request."""
+
+
+class TestRPCHookOverhead(perf_base.BenchmarkMixin, base.TestCase):
+
+    REQUESTS = 200
+
+    def setUp(self):
+        super(TestRPCHookOverhead, self).setUp()
+        self.useFixture(conffixture.ConfFixture(cfg.CONF))
+        cfg.CONF.import_opt('topic', 'oasis.conductor.config',
+                            group='conductor')
+        cfg.CONF.import_opt('topic', 'oasis.agent.config', group='agent')
+        for name, value in (('_TRANSPORT', None), ('_TRANSPORT_PID', None),
+                            ('_CLIENTS', {})):
+            patcher = mock.patch.object(rpc_service, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.hook = hooks.RPCHook()
+
+    def _state(self):
+        state = _Holder()
+        state.request = _Holder()
+        state.request.context = self.context
+        return state
+
+    def _per_request_clients(self):
+        # What RPCHook.before did for every request before the transport
+        # and clients were shared: a transport, a serializer and a client
+        # for each of the conductor and agent APIs.
+        for topic in (cfg.CONF.conductor.topic, cfg.CONF.agent.topic):
+            transport = messaging.get_transport(
+                cfg.CONF, aliases=rpc_service.TRANSPORT_ALIASES)
+            serializer = rpc.RequestContextSerializer(
+                objects_base.OasisObjectSerializer())
+            messaging.RPCClient(transport, messaging.Target(topic=topic),
+                                serializer=serializer)
+
+    def _hook_without_rpc(self):
+        self.hook.before(self._state())
+
+    def _hook_with_rpc(self):
+        state = self._state()
+        self.hook.before(state)
+        state.request.conductor_rpcapi.client
+
+    def test_one_transport_per_process(self):
+        with mock.patch.object(messaging, 'get_transport',
+                               wraps=messaging.get_transport) as get:
+            for i in range(self.REQUESTS):
+                self._hook_with_rpc()
+        self.assertEqual(1, get.call_count)
+        self.assertEqual(1, len(rpc_service._CLIENTS))
+
+    def test_per_request_overhead(self):
+        before = self.measure('per-request transport and clients',
+                              self._per_request_clients, self.REQUESTS)
+        without_rpc = self.measure('shared, request without RPC',
+                                   self._hook_without_rpc, self.REQUESTS)
+        with_rpc = self.measure('shared, request resolving a client',
+                                self._hook_with_rpc, self.REQUESTS)
+        self.assertLess(without_rpc, before)
+        self.assertLess(with_rpc, before)
@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmark of the compiled serializers against wsme."""
+
+import json
+
+from oslo_utils import timeutils
+from wsme.rest import json as wsme_json
+
+from oasis.api.controllers.v1 import function as function_api
+from oasis.api.controllers.v1 import serializers
+from oasis.common import utils
+from oasis import objects
+from oasis.tests import base
+from oasis.tests.performance import base as perf_base
+
+HOST_URL = 'http://localhost:9417'
+
+
+class TestSerializers(perf_base.BenchmarkMixin, base.TestCase):
+
+    ITEMS = 200
+
+    def setUp(self):
+        super(TestSerializers, self).setUp()
+        now = timeutils.utcnow()
+        self.functions = [
+            objects.Function(self.context, id=utils.generate_uuid(),
+                             name='function-%d' % i,
+                             project_id=self.context.project_id,
+                             user_id=self.context.user_id,
+                             status='CREATE_COMPLETE',
+                             body='def main(request):\n    return request\n',
+                             desc='Function %d' % i,
+                             endpoint_id=utils.generate_uuid(),
+                             nodepool_id=utils.generate_uuid(),
+                             stack_id=utils.generate_uuid(),
+                             created_at=now, updated_at=now)
+            for i in range(self.ITEMS)]
+        self.serializer = serializers.get(function_api.Function)
+
+    def _wsme(self, function, expand, fields=None):
+        api_cls = function_api.Function
+        item = api_cls._convert_with_links(
+            api_cls(**function.as_dict()), HOST_URL, expand, fields)
+        return wsme_json.tojson(api_cls, item)
+
+    def _serialize_wsme(self, expand):
+        return json.dumps({'functions': [self._wsme(function, expand)
+                                         for function in self.functions]})
+
+    def _serialize_fast(self, expand):
+        return json.dumps({'functions': [
+            self.serializer.serialize(function, HOST_URL, expand)
+            for function in self.functions]})
+
+    def test_same_representation(self):
+        function = self.functions[0]
+        for expand, fields in ((True, None), (False, None),
+                               (False, ['id', 'name', 'body'])):
+            self.assertEqual(
+                self._wsme(function, expand, fields),
+                self.serializer.serialize(function, HOST_URL, expand,
+                                          fields))
+
+    def test_collection(self):
+        for expand in (False, True):
+            wsme_time = self.measure(
+                'wsme, %d functions, expand=%s' % (self.ITEMS, expand),
+                lambda: self._serialize_wsme(expand), 1)
+            fast_time = self.measure(
+                'serializer, %d functions, expand=%s' % (self.ITEMS, expand),
+                lambda: self._serialize_fast(expand), 1)
+            self.report('speedup: %.1fx' % (wsme_time / fast_time))
+            self.assertLess(fast_time, wsme_time)
@@ -0,0 +1,107 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Memory use of streamed collection responses.
+
+Python 2 has no tracemalloc, so memory is measured as the number of live
+objects tracked by the garbage collector. Every row held in memory, as a
+database entity, an object or an API type, adds several of them.
+"""
+
+import gc
+import json
+
+from oasis.api.controllers.v1 import function as function_api
+from oasis.api.controllers.v1 import serializers
+from oasis.common import utils
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis.db.sqlalchemy import models
+from oasis import objects
+from oasis.tests import base
+from oasis.tests.performance import base as perf_base
+
+HOST_URL = 'http://localhost:9417'
+
+
+class TestStreamingMemory(perf_base.BenchmarkMixin, base.DbTestCase):
+
+    BATCH_SIZE = 100
+    # The rows of a batch are all alive while it is streamed; beyond that,
+    # the objects alive must not depend on the number of rows.
+    SLACK = 15 * BATCH_SIZE
+
+    def setUp(self):
+        super(TestStreamingMemory, self).setUp()
+        self.rows = 0
+
+    def _create_functions(self, count):
+        rows = [{'id': utils.generate_uuid(),
+                 'project_id': self.context.project_id,
+                 'user_id': self.context.user_id,
+                 'name': 'function-%d' % i,
+                 'status': 'CREATE_COMPLETE',
+                 'body': 'def main(request):\n    return request\n'}
+                for i in range(self.rows, count)]
+        if rows:
+            with sqla_api.get_engine().begin() as connection:
+                connection.execute(models.Function.__table__.insert(), rows)
+        self.rows = max(self.rows, count)
+
+    def _stream(self, limit):
+        rpc_items = objects.Function.list(self.context, limit=limit,
+                                          yield_per=self.BATCH_SIZE)
+        return function_api.FunctionCollection._iter_json(
+            'functions', function_api.Function, rpc_items, limit, HOST_URL,
+            'functions', False, None,
+            serializers.get(function_api.Function),
+            sort_key='id', sort_dir='asc')
+
+    def _peak_growth(self, limit):
+        """Return the most objects alive while streaming limit rows."""
+        body = self._stream(limit)
+        gc.collect()
+        baseline = peak = len(gc.get_objects())
+        for i, chunk in enumerate(body):
+            # NOTE: an item and its separator are two chunks.
+            if i % (2 * self.BATCH_SIZE) == 1:
+                peak = max(peak, len(gc.get_objects()))
+        growth = peak - baseline
+        self.report('%d rows: %d more objects alive at peak'
+                    % (limit, growth))
+        return growth
+
+    def test_body(self):
+        self._create_functions(20)
+        body = json.loads(b''.join(self._stream(10)).decode('utf-8'))
+        self.assertEqual(10, len(body['functions']))
+        ids = [function['id'] for function in body['functions']]
+        self.assertEqual(sorted(ids), ids)
+        self.assertIn('%s/v1/functions?' % HOST_URL, body['next'])
+        self.assertIn('limit=10', body['next'])
+
+    def test_flat_memory(self):
+        self._create_functions(10)
+        small = self._peak_growth(10)
+        self._create_functions(10000)
+        large = self._peak_growth(10000)
+        self.assertLess(large, small + self.SLACK)
+
+    def test_list_memory_grows(self):
+        # The measure sees the rows held by a collection built in memory.
+        self._create_functions(10000)
+        gc.collect()
+        baseline = len(gc.get_objects())
+        functions = objects.Function.list(self.context, limit=10000)
+        growth = len(gc.get_objects()) - baseline
+        self.report('10000 rows listed: %d more objects alive' % growth)
+        self.assertEqual(10000, len(functions))
+        self.assertGreater(growth, 10000)
@@ -0,0 +1,50 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from keystonemiddleware import auth_token
+import mock
+
+from oasis.api.middleware import auth_token as oasis_auth_token
+from oasis.tests import base
+
+
+class TestAuthTokenMiddleware(base.TestCase):
+
+    def _make(self, **conf):
+        app = mock.Mock(return_value=['public'])
+        return oasis_auth_token.AuthTokenMiddleware(
+            app, conf, public_api_routes=['/', '/v1'])
+
+    def test_keystonemiddleware_validates_tokens(self):
+        # Token validation, its cache and the revocation checks are left
+        # to keystonemiddleware.
+        self.assertIs(auth_token.AuthProtocol.fetch_token.__func__,
+                      oasis_auth_token.AuthTokenMiddleware.fetch_token.__func__)
+
+    @mock.patch.object(oasis_auth_token, 'LOG')
+    def test_unprotected_memcached_cache_warns(self, log):
+        self._make(memcached_servers='127.0.0.1:11211')
+        self.assertTrue(log.warning.called)
+
+    @mock.patch.object(oasis_auth_token, 'LOG')
+    def test_protected_memcached_cache(self, log):
+        self._make(memcached_servers='127.0.0.1:11211',
+                   memcache_security_strategy='ENCRYPT',
+                   memcache_secret_key='secret')
+        self._make()
+        self.assertFalse(log.warning.called)
+
+    def test_public_route(self):
+        middleware = self._make()
+        env = {'PATH_INFO': '/v1/'}
+        self.assertEqual(['public'], middleware(env, mock.Mock()))
+        self.assertTrue(env['is_public_api'])
@@ -0,0 +1,204 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+from eventlet.green import threading
+
+from oasis.api.middleware import coalesce
+from oasis.common import metrics
+from oasis.tests import base
+
+
+def _environ(**kwargs):
+    environ = {'REQUEST_METHOD': 'GET',
+               'PATH_INFO': '/v1/functions',
+               'QUERY_STRING': 'limit=10',
+               'HTTP_X_PROJECT_ID': 'fake_project',
+               'HTTP_X_USER_ID': 'fake_user',
+               'HTTP_X_ROLES': 'member'}
+    environ.update(kwargs)
+    return environ
+
+
+class FakeApp(object):
+    """An application blocking until released, which counts its calls."""
+
+    def __init__(self, status='200 OK', streamed=False):
+        self.status = status
+        self.streamed = streamed
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, environ, start_response):
+        self.calls += 1
+        self.release.wait()
+        start_response(self.status, [
+            ('Content-Type', 'application/json'),
+            ('X-OpenStack-Request-Id', environ['openstack.request_id']),
+            ('Server-Timing', 'app;dur=1.0')])
+        if self.streamed:
+            environ['oasis.streamed'] = True
+            return iter([b'{"functions": [', b']}'])
+        return [b'{"functions": []}']
+
+
+class TestCoalesceMiddleware(base.TestCase):
+
+    def setUp(self):
+        super(TestCoalesceMiddleware, self).setUp()
+        self.config(coalesce_gets=True, coalesce_ttl=0, group='api')
+        self.addCleanup(setattr, coalesce, '_COALESCER', None)
+        coalesce._COALESCER = None
+        self.app = FakeApp()
+        self.middleware = coalesce.CoalesceMiddleware(self.app)
+        self.requests = 0
+
+    def _get(self, **kwargs):
+        self.requests += 1
+        environ = _environ(**kwargs)
+        environ['openstack.request_id'] = 'req-%d' % self.requests
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        app_iter = self.middleware(environ, start_response)
+        response['app_iter'] = app_iter
+        response['body'] = b''.join(app_iter)
+        return response
+
+    def _get_concurrently(self, *environs):
+        threads = [eventlet.spawn(self._get, **environ)
+                   for environ in environs]
+        # Let every request reach the application or the coalescer.
+        eventlet.sleep(0)
+        self.app.release.set()
+        return [thread.wait() for thread in threads]
+
+    def _counters(self):
+        return dict((result, metrics.API_COALESCED_REQUESTS.labels(
+            result).value) for result in ('leader', 'coalesced', 'cached'))
+
+    def test_concurrent_requests_coalesced(self):
+        counters = self._counters()
+        leader, first, second = self._get_concurrently({}, {}, {})
+        self.assertEqual(1, self.app.calls)
+        for response in (leader, first, second):
+            self.assertEqual('200 OK', response['status'])
+            self.assertEqual(b'{"functions": []}', response['body'])
+            self.assertEqual(str(len(response['body'])),
+                             response['headers']['Content-Length'])
+        stats = coalesce.get_coalescer().stats()
+        self.assertEqual((1, 2, 0), (stats['leaders'], stats['coalesced'],
+                                     stats['cached']))
+        self.assertEqual(counters['leader'] + 1,
+                         self._counters()['leader'])
+        self.assertEqual(counters['coalesced'] + 2,
+                         self._counters()['coalesced'])
+
+    def test_per_request_headers(self):
+        self.config(server_timing=True, group='api')
+        leader, other = self._get_concurrently({}, {})
+        self.assertEqual('req-1', leader['headers']['X-OpenStack-Request-Id'])
+        self.assertEqual('app;dur=1.0', leader['headers']['Server-Timing'])
+        self.assertEqual('req-2', other['headers']['X-OpenStack-Request-Id'])
+        self.assertIn('coalesce;dur=', other['headers']['Server-Timing'])
+        self.assertNotIn('app;dur', other['headers']['Server-Timing'])
+
+    def test_server_timing_disabled(self):
+        leader, other = self._get_concurrently({}, {})
+        self.assertEqual('req-2', other['headers']['X-OpenStack-Request-Id'])
+        self.assertNotIn('Server-Timing', other['headers'])
+
+    def test_other_users_not_coalesced(self):
+        self._get_concurrently({}, {'HTTP_X_USER_ID': 'other_user'})
+        self.assertEqual(2, self.app.calls)
+
+    def test_response_cached(self):
+        self.config(coalesce_ttl=60, group='api')
+        self.app.release.set()
+        counters = self._counters()
+        first = self._get()
+        second = self._get()
+        self.assertEqual(1, self.app.calls)
+        self.assertEqual(first['body'], second['body'])
+        self.assertEqual('req-2', second['headers']['X-OpenStack-Request-Id'])
+        self.assertEqual(1, coalesce.get_coalescer().stats()['cached'])
+        self.assertEqual(counters['cached'] + 1, self._counters()['cached'])
+
+    def test_response_not_cached_without_ttl(self):
+        self.app.release.set()
+        self._get()
+        self._get()
+        self.assertEqual(2, self.app.calls)
+
+    def test_error_not_cached(self):
+        self.config(coalesce_ttl=60, group='api')
+        self.app.status = '500 Internal Server Error'
+        self.app.release.set()
+        self._get()
+        self._get()
+        self.assertEqual(2, self.app.calls)
+
+    def test_streamed_response_not_shared(self):
+        self.app.streamed = True
+        leader, other = self._get_concurrently({}, {})
+        self.assertEqual(2, self.app.calls)
+        for response in (leader, other):
+            self.assertEqual(b'{"functions": []}', response['body'])
+            # The body was passed through instead of being buffered.
+            self.assertNotIsInstance(response['app_iter'], list)
+            self.assertNotIn('Content-Length', response['headers'])
+        self.assertEqual('req-2', other['headers']['X-OpenStack-Request-Id'])
+
+    def test_not_get_passed_through(self):
+        self.app.release.set()
+        self._get(REQUEST_METHOD='POST')
+        self._get(REQUEST_METHOD='POST')
+        self.assertEqual(2, self.app.calls)
+        self.assertEqual(0, coalesce.get_coalescer().stats()['leaders'])
+
+    def test_disabled(self):
+        self.config(coalesce_gets=False, group='api')
+        self.app.release.set()
+        self._get()
+        self._get()
+        self.assertEqual(2, self.app.calls)
+
+
+class TestGetKey(base.TestCase):
+
+    def test_identical_requests(self):
+        self.assertEqual(coalesce.get_key(_environ()),
+                         coalesce.get_key(_environ(HTTP_X_ROLES=' Member')))
+
+    def test_user_in_key(self):
+        self.assertNotEqual(
+            coalesce.get_key(_environ()),
+            coalesce.get_key(_environ(HTTP_X_USER_ID='other_user')))
+
+    def test_request_in_key(self):
+        key = coalesce.get_key(_environ())
+        for name, value in (('HTTP_X_PROJECT_ID', 'other_project'),
+                            ('HTTP_X_ROLES', 'admin'),
+                            ('PATH_INFO', '/v1/endpoints'),
+                            ('QUERY_STRING', 'limit=20'),
+                            ('HTTP_IF_NONE_MATCH', '"etag"')):
+            self.assertNotEqual(key, coalesce.get_key(_environ(
+                **{name: value})), name)
+
+    def test_not_coalesced(self):
+        self.assertIsNone(coalesce.get_key(_environ(HTTP_X_PROJECT_ID='')))
+        self.assertIsNone(coalesce.get_key(_environ(HTTP_X_USER_ID='')))
+        self.assertIsNone(coalesce.get_key(_environ(
+            HTTP_X_OASIS_PROFILE='1')))
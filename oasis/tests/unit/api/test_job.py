@@ -0,0 +1,30 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from wsme.rest import json as wsme_json
+
+from oasis.api.controllers.v1 import job as job_api
+from oasis.objects import fields
+from oasis.tests import base
+
+
+class TestJob(base.TestCase):
+
+    def test_results_rendered(self):
+        job = job_api.Job.sample()
+        rendered = wsme_json.tojson(job_api.Job, job)
+        self.assertEqual([{'host': 'node-1',
+                           'status': fields.JobStatus.COMPLETE}],
+                         rendered['results'])
+        self.assertEqual(1, rendered['expected_reports'])
+        self.assertEqual(['self', 'bookmark'],
+                         [link['rel'] for link in rendered['links']])
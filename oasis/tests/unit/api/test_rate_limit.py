@@ -0,0 +1,151 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import fixtures
+import mock
+from webob import exc
+
+from oasis.api import hooks
+from oasis.api import rate_limit
+from oasis.tests import base
+
+
+class FakeMemcacheClient(object):
+    """The add, incr and decr commands of a memcached server."""
+
+    def __init__(self):
+        self.values = {}
+
+    def add(self, key, value, time=0):
+        if key in self.values:
+            return False
+        self.values[key] = int(value)
+        return True
+
+    def incr(self, key):
+        if key not in self.values:
+            return None
+        self.values[key] += 1
+        return self.values[key]
+
+    def decr(self, key):
+        if key not in self.values:
+            return None
+        self.values[key] = max(self.values[key] - 1, 0)
+        return self.values[key]
+
+
+class _BackendTests(object):
+
+    def test_consume(self):
+        self.assertEqual(0, self.backend.consume('p:read', 1.0, 2))
+        self.assertEqual(0, self.backend.consume('p:read', 1.0, 2))
+        wait = self.backend.consume('p:read', 1.0, 2)
+        self.assertTrue(0 < wait <= 2)
+        # The buckets of other keys are untouched.
+        self.assertEqual(0, self.backend.consume('q:read', 1.0, 2))
+
+    def test_inflight(self):
+        self.assertTrue(self.backend.acquire('p:inflight', 2))
+        self.assertTrue(self.backend.acquire('p:inflight', 2))
+        self.assertFalse(self.backend.acquire('p:inflight', 2))
+        self.backend.release('p:inflight')
+        self.assertTrue(self.backend.acquire('p:inflight', 2))
+        self.assertFalse(self.backend.acquire('p:inflight', 2))
+
+
+class TestMemoryBackend(_BackendTests, base.TestCase):
+
+    def setUp(self):
+        super(TestMemoryBackend, self).setUp()
+        self.backend = rate_limit.MemoryBackend()
+
+
+class TestGetBackend(base.TestCase):
+
+    def test_entry_points(self):
+        self.useFixture(fixtures.MockPatch('memcache.Client'))
+        for name, cls in (('memory', rate_limit.MemoryBackend),
+                          ('memcached', rate_limit.MemcachedBackend)):
+            self.useFixture(fixtures.MockPatchObject(rate_limit, '_BACKEND',
+                                                     None))
+            self.config(rate_limit_backend=name, group='api')
+            self.assertIsInstance(rate_limit.get_backend(), cls)
+
+
+class TestMemcachedBackend(_BackendTests, base.TestCase):
+
+    def setUp(self):
+        super(TestMemcachedBackend, self).setUp()
+        self.client = FakeMemcacheClient()
+        self.useFixture(fixtures.MockPatch('memcache.Client',
+                                           return_value=self.client))
+        self.backend = rate_limit.MemcachedBackend()
+
+    def test_shared(self):
+        other = rate_limit.MemcachedBackend()
+        self.assertTrue(self.backend.acquire('p:inflight', 1))
+        self.assertFalse(other.acquire('p:inflight', 1))
+
+    def test_unreachable(self):
+        self.client.add = mock.Mock(return_value=False)
+        self.client.incr = mock.Mock(return_value=None)
+        self.assertEqual(0, self.backend.consume('p:read', 1.0, 1))
+        self.assertEqual(0, self.backend.consume('p:read', 1.0, 1))
+        self.assertTrue(self.backend.acquire('p:inflight', 1))
+
+
+class TestRateLimitHook(base.TestCase):
+
+    def setUp(self):
+        super(TestRateLimitHook, self).setUp()
+        self.config(rate_limit_enabled=True, rate_limit_max_inflight=1,
+                    rate_limit_expensive_rate=1.0,
+                    rate_limit_expensive_burst=1, group='api')
+        self.backend = rate_limit.MemoryBackend()
+        self.useFixture(fixtures.MockPatchObject(rate_limit, '_BACKEND',
+                                                 self.backend))
+        self.hook = hooks.RateLimitHook()
+
+    def _state(self):
+        state = mock.Mock()
+        state.request.context = self.context
+        state.request.method = 'POST'
+        state.request.path_info = '/v1/functions'
+        return state
+
+    def test_admitted(self):
+        state = self._state()
+        self.hook.before(state)
+        self.assertEqual('fake_project:inflight',
+                         state.request.rate_limit_inflight)
+        self.hook.after(state)
+        self.assertEqual({}, self.backend._inflight)
+
+    def test_inflight_cap_does_not_take_a_token(self):
+        first = self._state()
+        self.backend.acquire('fake_project:inflight', 1)
+        self.assertRaises(exc.HTTPTooManyRequests, self.hook.before, first)
+        self.backend.release('fake_project:inflight')
+
+        # The rejected request left the token for this one.
+        second = self._state()
+        self.hook.before(second)
+        self.hook.after(second)
+
+    def test_rate_limit_releases_the_inflight_slot(self):
+        self.backend.consume('fake_project:expensive', 1.0, 1)
+        state = self._state()
+        e = self.assertRaises(exc.HTTPTooManyRequests, self.hook.before,
+                              state)
+        self.assertEqual('1', e.headers['Retry-After'])
+        self.assertEqual({}, self.backend._inflight)
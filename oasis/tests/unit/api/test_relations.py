@@ -0,0 +1,142 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from sqlalchemy import event
+import wsme
+
+from oasis.api.controllers.v1 import function as function_api
+from oasis.api.controllers.v1 import relations
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis import objects
+from oasis.tests import base
+
+
+class TestParse(base.TestCase):
+
+    def test_nothing_expanded(self):
+        self.assertIsNone(relations.parse('Function', None))
+        self.assertIsNone(relations.parse('Function', ''))
+
+    def test_tree(self):
+        self.assertEqual(
+            {'endpoint': {},
+             'httpapis': {'request': {'headers': {}}, 'response': {}}},
+            relations.parse('Function', 'endpoint, httpapis.request.headers,'
+                                        'httpapis.response'))
+
+    def test_unknown_relation(self):
+        for expand in ('unknown', 'endpoint.unknown', 'httpapis.headers'):
+            self.assertRaises(wsme.exc.ClientSideError, relations.parse,
+                              'Function', expand)
+
+    def test_depth(self):
+        self.config(max_expand_depth=2, group='api')
+        relations.parse('Endpoint', 'httpapis.request')
+        self.assertRaises(wsme.exc.ClientSideError, relations.parse,
+                          'Endpoint', 'httpapis.request.headers')
+
+    def test_columns(self):
+        tree = relations.parse('Function', 'endpoint,nodepool')
+        self.assertIsNone(relations.get_columns('Function', None, tree))
+        self.assertEqual(['id', 'name'],
+                         relations.get_columns('Function', ['id', 'name'],
+                                               None))
+        columns = relations.get_columns('Function', ['id', 'endpoint_id'],
+                                        tree)
+        self.assertEqual(['id', 'endpoint_id'], columns[:2])
+        self.assertEqual(['endpoint_id', 'id', 'nodepool_id'],
+                         sorted(columns))
+
+
+class TestEmbed(base.DbTestCase):
+
+    def setUp(self):
+        super(TestEmbed, self).setUp()
+        request = mock.patch('pecan.request').start()
+        self.addCleanup(mock.patch.stopall)
+        request.context = self.context
+        request.host_url = 'http://localhost'
+        self.endpoints = [self._create_endpoint(name, 'fake_project')
+                          for name in ('e1', 'e2')]
+        self.hidden = self._create_endpoint('e3', 'other_project')
+
+    def _create_endpoint(self, name, project_id):
+        return self.dbapi.create_endpoint_definition({
+            'name': name, 'url': '/' + name, 'project_id': project_id,
+            'http_apis': [
+                {'method': 'GET',
+                 'request': {'headers': [{'name': 'Accept',
+                                          'value': 'application/json'}]}},
+                {'method': 'POST'}]})
+
+    def _create_functions(self, endpoints):
+        for index, endpoint in enumerate(endpoints):
+            self.dbapi.create_function({
+                'name': 'f%d' % index, 'endpoint_id': endpoint['id'],
+                'project_id': 'fake_project', 'user_id': 'fake_user'})
+        return sorted(objects.Function.list(self.context),
+                      key=lambda function: function.name)
+
+    def _embed(self, functions, expand):
+        api_items = [function_api.Function.convert_with_links(function)
+                     for function in functions]
+        statements = []
+        engine = sqla_api.get_engine()
+
+        def capture(conn, cursor, statement, *args):
+            # NOTE: oslo.db pings each connection it checks out.
+            if statement != 'SELECT 1':
+                statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            relations.embed('Function', api_items, functions,
+                            relations.parse('Function', expand))
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        return api_items, len(statements)
+
+    def test_embedded(self):
+        functions = self._create_functions(self.endpoints)
+        api_items, queries = self._embed(
+            functions, 'endpoint,httpapis.request.headers')
+        for function, endpoint in zip(api_items, self.endpoints):
+            self.assertEqual(endpoint['id'], function.endpoint.id)
+            self.assertEqual(['GET', 'POST'],
+                             sorted(http_api.method
+                                    for http_api in function.httpapis))
+            [get] = [http_api for http_api in function.httpapis
+                     if http_api.method == 'GET']
+            self.assertEqual(['Accept'], [header.name for header
+                                          in get.request.headers])
+        # One query per relation and the endpoint visibility check,
+        # whatever the number of functions.
+        self.assertEqual(5, queries)
+        _, single = self._embed(functions[:1],
+                                'endpoint,httpapis.request.headers')
+        self.assertEqual(queries, single)
+
+    def test_hidden_endpoint_not_embedded(self):
+        [function] = self._create_functions([self.hidden])
+        [api_item], _ = self._embed([function], 'endpoint,httpapis')
+        self.assertEqual(wsme.Unset, api_item.endpoint)
+        self.assertEqual([], api_item.httpapis)
+
+    def test_no_relation(self):
+        self.dbapi.create_function({
+            'name': 'f', 'project_id': 'fake_project',
+            'user_id': 'fake_user'})
+        functions = objects.Function.list(self.context)
+        [api_item], queries = self._embed(functions, 'endpoint,nodepool')
+        self.assertEqual(0, queries)
+        self.assertEqual(wsme.Unset, api_item.endpoint)
@@ -0,0 +1,192 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+from keystonemiddleware.auth_token import _exceptions as ksm_exceptions
+import mock
+from oslo_utils import timeutils
+
+from oasis.api.middleware import auth_token
+from oasis.api import token_cache
+from oasis.common import exception
+from oasis.tests import base
+from oasis.tests import memcached
+
+
+def _v3_token(seconds):
+    expires = timeutils.utcnow() + datetime.timedelta(seconds=seconds)
+    return {'token': {'expires_at': timeutils.isotime(expires),
+                      'project': {'id': 'fake_project'}}}
+
+
+class TestTokenCache(base.TestCase):
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        self.backend = token_cache.MemoryBackend()
+        self.cache = token_cache.TokenCache(self.backend)
+
+    def test_ttl_bounded_by_expiry(self):
+        self.config(token_cache_ttl=300, group='api')
+        self.assertTrue(55 <= token_cache.get_ttl(_v3_token(60)) <= 60)
+        self.assertEqual(300, token_cache.get_ttl(_v3_token(3600)))
+        self.assertTrue(token_cache.get_ttl(_v3_token(-10)) <= 0)
+
+    def test_ttl_of_v2_token(self):
+        expires = timeutils.utcnow() + datetime.timedelta(seconds=60)
+        data = {'access': {'token': {'expires': timeutils.isotime(expires)}}}
+        self.assertTrue(55 <= token_cache.get_ttl(data) <= 60)
+
+    def test_ttl_without_expiry(self):
+        self.assertEqual(0, token_cache.get_ttl({'token': {}}))
+
+    def test_key_hides_token(self):
+        key = token_cache.get_key(u'a-token')
+        self.assertNotIn('a-token', key)
+        self.assertEqual(key, token_cache.get_key(b'a-token'))
+
+    def test_valid_token_cached(self):
+        data = _v3_token(3600)
+        self.cache.set('a-token', data)
+        self.assertEqual(data, self.cache.get('a-token'))
+        self.assertIsNone(self.cache.get('another-token'))
+
+    def test_expired_token_not_cached(self):
+        self.cache.set('a-token', _v3_token(-10))
+        self.assertIsNone(self.cache.get('a-token'))
+
+    @mock.patch('time.time')
+    def test_invalid_token_cached(self, mock_time):
+        self.config(token_cache_negative_ttl=10, group='api')
+        mock_time.return_value = 1000.0
+        self.cache.set('bad-token', token_cache.INVALID)
+        self.assertEqual(token_cache.INVALID, self.cache.get('bad-token'))
+        mock_time.return_value = 1011.0
+        self.assertIsNone(self.cache.get('bad-token'))
+
+    def test_negative_cache_disabled(self):
+        self.config(token_cache_negative_ttl=0, group='api')
+        self.cache.set('bad-token', token_cache.INVALID)
+        self.assertIsNone(self.cache.get('bad-token'))
+
+    def test_memory_backend_bounded(self):
+        self.backend.maxsize = 2
+        for key in ('a', 'b', 'c'):
+            self.backend.set(key, key, 60)
+        self.assertIsNone(self.backend.get('a'))
+        self.assertEqual('c', self.backend.get('c'))
+
+
+class TestMemcachedBackend(base.TestCase):
+
+    def setUp(self):
+        super(TestMemcachedBackend, self).setUp()
+        self.memcached = self.useFixture(memcached.MemcachedFixture())
+        self.config(token_cache_memcached_servers=[self.memcached.address],
+                    token_cache_secret_key='secret', group='api')
+        self.backend = token_cache.MemcachedBackend()
+
+    def test_shared(self):
+        data = _v3_token(3600)
+        self.backend.set('oasis-token:a', data, 60)
+        self.assertEqual(data, token_cache.MemcachedBackend().get(
+            'oasis-token:a'))
+        self.assertIsNone(self.backend.get('oasis-token:b'))
+
+    def test_forged_entry_ignored(self):
+        self.backend.set('oasis-token:a', _v3_token(3600), 60)
+        flags, expires, entry = self.memcached.entries[b'oasis-token:a']
+        mac, sep, data = entry.partition(b':')
+        forged = data.replace(b'fake_project', b'admin_project')
+        self.memcached.entries[b'oasis-token:a'] = (flags, expires,
+                                                    mac + b':' + forged)
+        self.assertIsNone(self.backend.get('oasis-token:a'))
+
+    def test_entry_of_another_key_ignored(self):
+        self.backend.set('oasis-token:a', _v3_token(3600), 60)
+        self.memcached.entries[b'oasis-token:b'] = (
+            self.memcached.entries[b'oasis-token:a'])
+        self.assertIsNone(self.backend.get('oasis-token:b'))
+
+    def test_other_secret_ignored(self):
+        self.backend.set('oasis-token:a', _v3_token(3600), 60)
+        self.config(token_cache_secret_key='other', group='api')
+        self.assertIsNone(
+            token_cache.MemcachedBackend().get('oasis-token:a'))
+
+    def test_secret_required(self):
+        self.config(token_cache_secret_key=None, group='api')
+        self.assertRaises(exception.ConfigInvalid,
+                          token_cache.MemcachedBackend)
+
+    def test_unreachable_server_is_a_miss(self):
+        self.config(token_cache_memcached_servers=['127.0.0.1:1'],
+                    group='api')
+        backend = token_cache.MemcachedBackend()
+        backend.set('oasis-token:a', _v3_token(3600), 60)
+        self.assertIsNone(backend.get('oasis-token:a'))
+
+
+class TestAuthTokenCache(base.TestCase):
+
+    def setUp(self):
+        super(TestAuthTokenCache, self).setUp()
+        self.config(token_cache_enabled=True, group='api')
+        self.addCleanup(setattr, token_cache, '_CACHE', None)
+        token_cache._CACHE = None
+
+    def _make(self, **conf):
+        middleware = auth_token.AuthTokenMiddleware(mock.Mock(), conf)
+        middleware._identity_server = mock.Mock()
+        middleware._revocations = mock.Mock()
+        return middleware
+
+    def test_uses_token_cache(self):
+        middleware = self._make()
+        self.assertIs(token_cache.get_cache(), middleware._token_cache)
+
+    def test_disabled(self):
+        self.config(token_cache_enabled=False, group='api')
+        middleware = self._make()
+        self.assertNotIsInstance(middleware._token_cache,
+                                 token_cache.TokenCache)
+
+    def test_validated_token_cached(self):
+        middleware = self._make()
+        data = _v3_token(3600)
+        middleware._identity_server.verify_token.return_value = data
+        self.assertEqual(data, middleware.fetch_token('a-token'))
+        self.assertEqual(data, middleware.fetch_token('a-token'))
+        middleware._identity_server.verify_token.assert_called_once_with(
+            'a-token')
+
+    def test_revocation_checked_for_cached_token(self):
+        middleware = self._make(check_revocations_for_cached=True)
+        middleware._identity_server.verify_token.return_value = (
+            _v3_token(3600))
+        middleware.fetch_token('a-token')
+        middleware._revocations.check.side_effect = (
+            ksm_exceptions.InvalidToken())
+        self.assertRaises(ksm_exceptions.InvalidToken,
+                          middleware.fetch_token, 'a-token')
+
+    def test_rejected_token_cached(self):
+        middleware = self._make()
+        middleware._identity_server.verify_token.side_effect = (
+            ksm_exceptions.InvalidToken())
+        self.assertRaises(ksm_exceptions.InvalidToken,
+                          middleware.fetch_token, 'bad-token')
+        self.assertRaises(ksm_exceptions.InvalidToken,
+                          middleware.fetch_token, 'bad-token')
+        self.assertEqual(
+            1, middleware._identity_server.verify_token.call_count)
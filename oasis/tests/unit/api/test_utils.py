@@ -0,0 +1,326 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import stat
+
+import fixtures
+import iso8601
+import mock
+import webob
+import wsme
+
+from oasis.api import utils
+from oasis.common import exception
+from oasis.common import name_cache
+from oasis import objects
+from oasis.tests import base
+
+
+class FakeRow(object):
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class TestPaginationMarker(base.TestCase):
+
+    def setUp(self):
+        super(TestPaginationMarker, self).setUp()
+        self.row = FakeRow(id=42, name='fn',
+                           created_at=datetime.datetime(2016, 5, 1, 12, 30,
+                                                        15, 250))
+        self.sort_keys = ['created_at', 'name', 'id']
+        self.addCleanup(utils._MARKER_KEYS.clear)
+
+    def _encode(self):
+        return utils.encode_marker(self.row, self.sort_keys, 'desc')
+
+    def test_round_trip(self):
+        marker = utils.decode_marker(self._encode(), self.sort_keys, 'desc')
+        self.assertEqual(42, marker.id)
+        self.assertEqual('fn', marker.name)
+        self.assertEqual(self.row.created_at, marker.created_at)
+
+    def test_tampered_payload(self):
+        payload, signature = self._encode().split('.')
+        other = utils.encode_marker(FakeRow(id=43, name='fn',
+                                            created_at=self.row.created_at),
+                                    self.sort_keys, 'desc')
+        marker = '%s.%s' % (other.split('.')[0], signature)
+        self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                          marker, self.sort_keys, 'desc')
+
+    def test_malformed(self):
+        for marker in ('', 'abc', 'abc.def', u'\xe9.abc'):
+            self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                              marker, self.sort_keys, 'desc')
+
+    def test_other_sort_order(self):
+        marker = self._encode()
+        self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                          marker, self.sort_keys, 'asc')
+        self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                          marker, ['name', 'id'], 'desc')
+
+    def test_secret(self):
+        self.config(pagination_secret='secret', group='api')
+        marker = self._encode()
+        self.assertEqual(42, utils.decode_marker(marker, self.sort_keys,
+                                                 'desc').id)
+
+        self.config(pagination_secret='another secret', group='api')
+        self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                          marker, self.sort_keys, 'desc')
+
+    def test_generated_key(self):
+        state_path = self.useFixture(fixtures.TempDir()).path
+        self.config(state_path=state_path)
+        key = utils._marker_key()
+        marker = self._encode()
+        path = os.path.join(state_path, 'pagination_secret')
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+        self.assertEqual(['pagination_secret'], os.listdir(state_path))
+
+        # The key is kept, so markers survive restarts.
+        utils._MARKER_KEYS.clear()
+        self.assertEqual(key, utils._marker_key())
+        self.assertEqual(42, utils.decode_marker(marker, self.sort_keys,
+                                                 'desc').id)
+
+        self.config(state_path=self.useFixture(fixtures.TempDir()).path)
+        self.assertNotEqual(key, utils._marker_key())
+        self.assertRaises(wsme.exc.ClientSideError, utils.decode_marker,
+                          marker, self.sort_keys, 'desc')
+
+
+class TestGetBatch(base.TestCase):
+
+    def setUp(self):
+        super(TestGetBatch, self).setUp()
+        self.ids = ['2ad1ebb7-7b46-4f7d-9a84-39d1a9e1c6a4',
+                    '5e2b0a1c-58f4-4b5a-a4b6-6c2cd3a0e8d1',
+                    'c4a1c5fb-1c1e-4d0f-9d40-1e5e03c0f7b2']
+        patcher = mock.patch.object(objects.Function, 'list_by_ids')
+        self.list_by_ids = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_by_ids.return_value = [mock.Mock(id=self.ids[2]),
+                                         mock.Mock(id=self.ids[0])]
+        patcher = mock.patch('pecan.request')
+        patcher.start().context = self.context
+        self.addCleanup(patcher.stop)
+
+    def test_single_query(self):
+        objs, missing = utils.get_batch(objects.Function,
+                                        self.ids + [self.ids[0]],
+                                        columns=['id'])
+        # The objects are in the requested order, each one once.
+        self.assertEqual([self.ids[0], self.ids[2]],
+                         [obj.id for obj in objs])
+        self.assertEqual([self.ids[1]], missing)
+        self.list_by_ids.assert_called_once_with(
+            self.context, self.ids, columns=['id'])
+
+    def test_invalid_id(self):
+        self.assertRaises(wsme.exc.ClientSideError, utils.get_batch,
+                          objects.Function, [self.ids[0], 'fn'])
+        self.assertFalse(self.list_by_ids.called)
+
+    def test_size(self):
+        self.config(max_batch_ids=2, group='api')
+        self.assertRaises(wsme.exc.ClientSideError, utils.get_batch,
+                          objects.Function, self.ids)
+        # Duplicates do not count.
+        utils.get_batch(objects.Function, self.ids[:2] * 2)
+
+
+class TestValidateBulk(base.TestCase):
+
+    def setUp(self):
+        super(TestValidateBulk, self).setUp()
+        self.parent_id = '2ad1ebb7-7b46-4f7d-9a84-39d1a9e1c6a4'
+        self.missing_id = '5e2b0a1c-58f4-4b5a-a4b6-6c2cd3a0e8d1'
+        patcher = mock.patch.object(objects.Endpoint, 'list_by_ids')
+        self.list_by_ids = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_by_ids.return_value = [mock.Mock(id=self.parent_id)]
+        patcher = mock.patch('pecan.request')
+        patcher.start().context = self.context
+        self.addCleanup(patcher.stop)
+
+    def test_valid(self):
+        utils.validate_bulk([{'endpoint_id': self.parent_id}] * 3,
+                            objects.Endpoint, 'endpoint_id')
+        # The parents are looked up once.
+        self.list_by_ids.assert_called_once_with(
+            self.context, [self.parent_id], columns=['id'])
+
+    def test_every_invalid_item_listed(self):
+        items = [{'endpoint_id': self.parent_id},
+                 {'endpoint_id': self.missing_id},
+                 {'endpoint_id': None}]
+        e = self.assertRaises(wsme.exc.ClientSideError, utils.validate_bulk,
+                              items, objects.Endpoint, 'endpoint_id')
+        self.assertIn('item 1: Endpoint %s could not be found.'
+                      % self.missing_id, e.msg)
+        self.assertIn('item 2: endpoint_id is required.', e.msg)
+        self.assertNotIn('item 0', e.msg)
+
+    def test_size(self):
+        self.config(max_bulk_items=2, group='api')
+        self.assertRaises(wsme.exc.ClientSideError, utils.validate_bulk, [])
+        self.assertRaises(wsme.exc.ClientSideError, utils.validate_bulk,
+                          [{}] * 3)
+        utils.validate_bulk([{}] * 2)
+
+
+class TestGetResource(base.DbTestCase):
+
+    def setUp(self):
+        super(TestGetResource, self).setUp()
+        self.config(name_cache_ttl=60, group='api')
+        patcher = mock.patch('pecan.request')
+        patcher.start().context = self.context
+        self.addCleanup(patcher.stop)
+        self.function = self._create_function('fn')
+
+    def _create_function(self, name):
+        return self.dbapi.create_function({
+            'name': name, 'project_id': self.context.project_id,
+            'user_id': self.context.user_id})
+
+    def test_by_id(self):
+        with mock.patch.object(objects.Function, 'get_by_name') as by_name:
+            obj = utils.get_resource('Function', self.function.id)
+        self.assertEqual(self.function.id, obj.id)
+        self.assertFalse(by_name.called)
+
+    def test_name_cached(self):
+        self.assertEqual(self.function.id,
+                         utils.get_resource('Function', 'fn').id)
+        with mock.patch.object(objects.Function, 'get_by_name') as by_name:
+            obj = utils.get_resource('Function', 'fn')
+        self.assertEqual(self.function.id, obj.id)
+        self.assertFalse(by_name.called)
+        stats = name_cache.get_cache().stats()
+        self.assertEqual((1, 1), (stats['hits'], stats['misses']))
+
+    def test_cache_disabled(self):
+        self.config(name_cache_ttl=0, group='api')
+        utils.get_resource('Function', 'fn')
+        self.assertIsNone(name_cache.get_cache())
+
+    def test_renamed(self):
+        utils.get_resource('Function', 'fn')
+        self.dbapi.update_function(self.function.id, {'name': 'renamed'})
+        other = self._create_function('fn')
+        self.assertEqual(other.id, utils.get_resource('Function', 'fn').id)
+
+    def test_renamed_by_another_process(self):
+        utils.get_resource('Function', 'fn')
+        # The entry of this process is not invalidated by the writes.
+        with mock.patch.object(name_cache, 'invalidate'):
+            self.dbapi.update_function(self.function.id, {'name': 'renamed'})
+            other = self._create_function('fn')
+        self.assertEqual(other.id, utils.get_resource('Function', 'fn').id)
+
+    def test_destroyed_by_another_process(self):
+        utils.get_resource('Function', 'fn')
+        with mock.patch.object(name_cache, 'invalidate'):
+            self.dbapi.destroy_function(self.function.id)
+        self.assertRaises(exception.FunctionNotFound, utils.get_resource,
+                          'Function', 'fn')
+        self.assertEqual(0, name_cache.get_cache().stats()['size'])
+
+
+class TestETag(base.TestCase):
+
+    def setUp(self):
+        super(TestETag, self).setUp()
+        self.validator = ('27e3153e-d5bf-4b7e-b517-fb518e17f34c',
+                          datetime.datetime(2016, 5, 1, 12, 30, 15),
+                          None)
+        self.response = webob.Response()
+        patcher = mock.patch('pecan.response', self.response)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._request('/v1/functions')
+
+    def _request(self, url, etag=None):
+        headers = {'If-None-Match': '"%s"' % etag} if etag else {}
+        request = webob.Request.blank(url, headers=headers)
+        request.context = self.context
+        patcher = mock.patch('pecan.request', request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_validators_in_etag(self):
+        etag = utils.make_etag([self.validator])
+        self.assertEqual(etag, utils.make_etag([self.validator]))
+        updated = self.validator[:2] + (datetime.datetime(2016, 5, 2),)
+        self.assertNotEqual(etag, utils.make_etag([updated]))
+        self.assertNotEqual(etag, utils.make_etag([]))
+
+    def test_url_in_etag(self):
+        etag = utils.make_etag([self.validator])
+        self._request('/v1/functions?limit=1')
+        self.assertNotEqual(etag, utils.make_etag([self.validator]))
+
+    def test_aware_datetimes(self):
+        # Objects carry UTC aware datetimes, rows naive ones.
+        obj = mock.Mock(id=self.validator[0],
+                        created_at=self.validator[1].replace(
+                            tzinfo=iso8601.iso8601.UTC),
+                        updated_at=None)
+        self.assertEqual(utils.make_etag([self.validator]),
+                         utils.make_etag(utils.get_validators([obj])))
+
+    def test_not_modified(self):
+        etag = utils.make_etag([self.validator])
+        self.assertFalse(utils.is_conditional_get())
+        self.assertIsNone(utils.not_modified(etag))
+        self._request('/v1/functions', etag=etag)
+        self.assertTrue(utils.is_conditional_get())
+        response = utils.not_modified(etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, self.response.etag)
+        self.assertIsNone(utils.not_modified('other'))
+
+    @mock.patch.object(objects.Function, 'get_validator')
+    def test_resource_not_modified(self, mock_get_validator):
+        url = '/v1/functions/%s' % self.validator[0]
+        self._request(url)
+        etag = utils.make_etag([self.validator])
+        mock_get_validator.return_value = self.validator
+        self.assertIsNone(utils.check_resource_not_modified(
+            objects.Function, self.validator[0]))
+        # Nothing is read without an If-None-Match header.
+        self.assertFalse(mock_get_validator.called)
+
+        self._request(url, etag=etag)
+        response = utils.check_resource_not_modified(objects.Function,
+                                                     self.validator[0])
+        self.assertEqual(304, response.status_code)
+        mock_get_validator.assert_called_once_with(self.context,
+                                                   self.validator[0])
+        self.assertIsNone(utils.check_resource_not_modified(
+            objects.Function, 'fn'))
+        mock_get_validator.return_value = None
+        self.assertIsNone(utils.check_resource_not_modified(
+            objects.Function, self.validator[0]))
+
+    def test_set_etag(self):
+        obj = mock.Mock(id=self.validator[0], created_at=self.validator[1],
+                        updated_at=None)
+        utils.set_etag([obj])
+        self.assertEqual(utils.make_etag([self.validator]),
+                         self.response.etag)
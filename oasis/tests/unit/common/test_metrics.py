@@ -0,0 +1,84 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import errno
+import socket
+
+import mock
+
+from oasis.common import metrics
+from oasis.tests import base
+
+
+class TestRegistry(base.TestCase):
+
+    def setUp(self):
+        super(TestRegistry, self).setUp()
+        self.registry = metrics.Registry()
+
+    @mock.patch('os.getpid', return_value=42)
+    def test_counter_labelled_with_pid(self, mock_getpid):
+        counter = self.registry.register(metrics.Counter(
+            'requests_total', 'Requests.', ('method',)))
+        counter.labels('GET').inc(2)
+        lines = self.registry.render().decode('utf-8').splitlines()
+        self.assertEqual(['# HELP requests_total Requests.',
+                          '# TYPE requests_total counter',
+                          'requests_total{pid="42",method="GET"} 2.0'],
+                         lines)
+
+    @mock.patch('os.getpid', return_value=42)
+    def test_unlabelled_counter_labelled_with_pid(self, mock_getpid):
+        counter = self.registry.register(metrics.Counter('bytes_total',
+                                                         'Bytes.'))
+        counter.labels().inc(5)
+        self.assertIn('bytes_total{pid="42"} 5.0',
+                      self.registry.render().decode('utf-8'))
+
+    @mock.patch('os.getpid', return_value=42)
+    def test_histogram_labelled_with_pid(self, mock_getpid):
+        histogram = self.registry.register(metrics.Histogram(
+            'duration_seconds', 'Duration.', ('op',), buckets=(1.0,)))
+        histogram.labels('get').observe(0.5)
+        lines = self.registry.render().decode('utf-8').splitlines()
+        self.assertEqual(
+            ['duration_seconds_bucket{pid="42",op="get",le="1.0"} 1',
+             'duration_seconds_bucket{pid="42",op="get",le="+Inf"} 1',
+             'duration_seconds_sum{pid="42",op="get"} 0.5',
+             'duration_seconds_count{pid="42",op="get"} 1'],
+            lines[2:])
+
+
+class TestStartServer(base.TestCase):
+
+    @mock.patch('eventlet.spawn_n')
+    @mock.patch('eventlet.listen')
+    def test_first_free_port(self, mock_listen, mock_spawn_n):
+        sock = mock.Mock()
+        sock.getsockname.return_value = ('127.0.0.1', 9101)
+        mock_listen.side_effect = [socket.error(errno.EADDRINUSE, 'in use'),
+                                   sock]
+        self.assertEqual(9101, metrics.start_server('127.0.0.1', 9100,
+                                                    ports=4))
+        self.assertEqual([mock.call(('127.0.0.1', 9100)),
+                          mock.call(('127.0.0.1', 9101))],
+                         mock_listen.call_args_list)
+        self.assertEqual(sock, mock_spawn_n.call_args[0][1])
+
+    @mock.patch('eventlet.spawn_n')
+    @mock.patch('eventlet.listen')
+    def test_all_ports_in_use(self, mock_listen, mock_spawn_n):
+        mock_listen.side_effect = socket.error(errno.EADDRINUSE, 'in use')
+        self.assertRaises(socket.error, metrics.start_server,
+                          '127.0.0.1', 9100, ports=2)
+        self.assertEqual(2, mock_listen.call_count)
+        self.assertFalse(mock_spawn_n.called)
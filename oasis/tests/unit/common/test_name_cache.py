@@ -0,0 +1,118 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from oasis.common import name_cache
+from oasis.tests import base
+
+
+class TestNameCache(base.TestCase):
+
+    def setUp(self):
+        super(TestNameCache, self).setUp()
+        self.cache = name_cache.NameCache(maxsize=3, ttl=60)
+
+    def _assert_indexes_empty(self):
+        self.assertEqual({}, dict(self.cache._by_id))
+        self.assertEqual({}, dict(self.cache._by_name))
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('Function', 'p1', 'fn'))
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        self.assertEqual('id-1', self.cache.get('Function', 'p1', 'fn'))
+        self.assertIsNone(self.cache.get('Function', 'p2', 'fn'))
+        self.assertIsNone(self.cache.get('Endpoint', 'p1', 'fn'))
+        stats = self.cache.stats()
+        self.assertEqual((1, 1, 3), (stats['size'], stats['hits'],
+                                     stats['misses']))
+
+    @mock.patch('time.time')
+    def test_expired(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        mock_time.return_value = 1060
+        self.assertIsNone(self.cache.get('Function', 'p1', 'fn'))
+        self.assertEqual(0, self.cache.stats()['size'])
+        self._assert_indexes_empty()
+
+    def test_least_recently_used_evicted(self):
+        for name in ('a', 'b', 'c'):
+            self.cache.set('Function', 'p1', name, 'id-' + name)
+        self.cache.get('Function', 'p1', 'a')
+        self.cache.set('Function', 'p1', 'd', 'id-d')
+        self.assertIsNone(self.cache.get('Function', 'p1', 'b'))
+        self.assertEqual('id-a', self.cache.get('Function', 'p1', 'a'))
+        self.assertNotIn(('Function', 'id-b'), self.cache._by_id)
+        self.assertNotIn(('Function', 'b'), self.cache._by_name)
+
+    def test_set_replaces_entry(self):
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        self.cache.set('Function', 'p1', 'fn', 'id-2')
+        self.assertEqual('id-2', self.cache.get('Function', 'p1', 'fn'))
+        self.assertNotIn(('Function', 'id-1'), self.cache._by_id)
+
+    def test_invalidate_by_id(self):
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        self.cache.set('Function', 'p1', 'other', 'id-2')
+        self.cache.set('Endpoint', 'p1', 'fn', 'id-1')
+        self.cache.invalidate('Function', resource_id='id-1')
+        self.assertIsNone(self.cache.get('Function', 'p1', 'fn'))
+        self.assertEqual('id-2', self.cache.get('Function', 'p1', 'other'))
+        self.assertEqual('id-1', self.cache.get('Endpoint', 'p1', 'fn'))
+
+    def test_invalidate_by_name_in_every_project(self):
+        # The project creating a resource is not known when its name is
+        # invalidated.
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        self.cache.set('Function', 'p2', 'fn', 'id-2')
+        self.cache.set('Function', 'p1', 'other', 'id-3')
+        self.cache.invalidate('Function', name='fn')
+        self.assertIsNone(self.cache.get('Function', 'p1', 'fn'))
+        self.assertIsNone(self.cache.get('Function', 'p2', 'fn'))
+        self.assertEqual('id-3', self.cache.get('Function', 'p1', 'other'))
+
+    def test_invalidate_by_id_and_name(self):
+        self.cache.set('Function', 'p1', 'old', 'id-1')
+        self.cache.set('Function', 'p2', 'new', 'id-2')
+        self.cache.invalidate('Function', resource_id='id-1', name='new')
+        self.assertEqual(0, self.cache.stats()['size'])
+        self._assert_indexes_empty()
+
+    def test_invalidate_unknown(self):
+        self.cache.set('Function', 'p1', 'fn', 'id-1')
+        self.cache.invalidate('Function', resource_id='id-2', name='other')
+        self.cache.invalidate('Function')
+        self.assertEqual('id-1', self.cache.get('Function', 'p1', 'fn'))
+
+
+class TestGetCache(base.TestCase):
+
+    def setUp(self):
+        super(TestGetCache, self).setUp()
+        self.addCleanup(setattr, name_cache, '_CACHE', None)
+        name_cache._CACHE = None
+
+    def test_disabled(self):
+        self.config(name_cache_ttl=0, group='api')
+        self.assertIsNone(name_cache.get_cache())
+        # Invalidating a disabled cache does nothing.
+        name_cache.invalidate('Function', resource_id='id-1')
+
+    def test_shared(self):
+        self.config(name_cache_ttl=30, name_cache_size=10, group='api')
+        cache = name_cache.get_cache()
+        self.assertIs(cache, name_cache.get_cache())
+        self.assertEqual((10, 30), (cache.maxsize, cache.ttl))
+        cache.set('Function', 'p1', 'fn', 'id-1')
+        name_cache.invalidate('Function', resource_id='id-1')
+        self.assertIsNone(cache.get('Function', 'p1', 'fn'))
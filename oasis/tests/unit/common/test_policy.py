@@ -0,0 +1,161 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+
+import fixtures
+import mock
+from oslo_policy import policy as oslo_policy
+
+from oasis.common import context as oasis_context
+from oasis.common import exception
+from oasis.common import policy
+from oasis.tests import base
+
+
+class TestDecisionCache(base.TestCase):
+
+    def setUp(self):
+        super(TestDecisionCache, self).setUp()
+        self.cache = policy.DecisionCache(2)
+        self.rules = object()
+
+    def test_hit(self):
+        check = mock.Mock(return_value=True)
+        self.assertTrue(self.cache.get(self.rules, 'a', check))
+        self.assertTrue(self.cache.get(self.rules, 'a', check))
+        self.assertEqual(1, check.call_count)
+        self.assertEqual({'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1},
+                         self.cache.stats())
+
+    def test_lru_eviction(self):
+        for key in ('a', 'b', 'a', 'c'):
+            self.cache.get(self.rules, key, lambda: True)
+        check = mock.Mock(return_value=False)
+        self.assertTrue(self.cache.get(self.rules, 'a', check))
+        self.assertFalse(self.cache.get(self.rules, 'b', check))
+        self.assertEqual(1, check.call_count)
+
+    def test_new_rules_invalidate(self):
+        self.cache.get(self.rules, 'a', lambda: True)
+        self.assertFalse(self.cache.get(object(), 'a', lambda: False))
+        self.assertEqual(1, self.cache.stats()['size'])
+
+    def test_decision_of_replaced_rules_not_kept(self):
+        new_rules = object()
+
+        def check():
+            # The rules are reloaded while the decision is being made.
+            self.cache.get(new_rules, 'b', lambda: True)
+            return True
+
+        self.cache.get(self.rules, 'a', check)
+        self.assertFalse(self.cache.get(new_rules, 'a', lambda: False))
+
+    def test_counters_under_lock(self):
+        counters = []
+
+        class RecordingLock(object):
+            def __enter__(lock):
+                counters.append((self.cache.hits, self.cache.misses))
+
+            def __exit__(lock, *exc_info):
+                counters.append((self.cache.hits, self.cache.misses))
+
+        self.cache._lock = RecordingLock()
+        self.cache.get(self.rules, 'a', lambda: True)
+        self.cache.get(self.rules, 'a', lambda: True)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        # The counters never change between releasing the lock and taking
+        # it again.
+        for released, taken in zip(counters[1::2], counters[2::2]):
+            self.assertEqual(released, taken)
+
+
+class TestEnforce(base.TestCase):
+
+    def setUp(self):
+        super(TestEnforce, self).setUp()
+        self.policy_file = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'policy.json')
+        self._write_policy({'fn:get': 'role:admin'}, mtime=1000)
+        self.useFixture(fixtures.MockPatchObject(
+            policy, '_ENFORCER',
+            oslo_policy.Enforcer(policy.CONF, policy_file=self.policy_file)))
+        self.useFixture(fixtures.MockPatchObject(policy, '_DECISIONS', None))
+        self.useFixture(fixtures.MockPatchObject(policy, '_NEXT_RELOAD', 0))
+        self.admin = oasis_context.RequestContext(
+            auth_token='a', project_id='p', user_id='u', roles=['admin'])
+        self.member = oasis_context.RequestContext(
+            auth_token='b', project_id='p', user_id='u', roles=['member'])
+
+    def _write_policy(self, rules, mtime):
+        with open(self.policy_file, 'w') as f:
+            json.dump(rules, f)
+        # The enforcer reloads the file when its modification time changes.
+        os.utime(self.policy_file, (mtime, mtime))
+
+    def _stats(self):
+        return policy._get_decision_cache().stats()
+
+    def test_cached(self):
+        self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+        # Credentials no rule checks, like the token, share the decision.
+        other = oasis_context.RequestContext(
+            auth_token='c', project_id='p', user_id='u', roles=['admin'],
+            request_id='req-1')
+        self.assertTrue(policy.enforce(other, 'fn:get'))
+        self.assertEqual(1, self._stats()['hits'])
+
+        self.assertRaises(exception.PolicyNotAuthorized, policy.enforce,
+                          self.member, 'fn:get', action='fn:get')
+        self.assertFalse(policy.enforce(self.member, 'fn:get',
+                                        do_raise=False))
+        self.assertEqual(2, self._stats()['hits'])
+
+    def test_policy_file_change_invalidates(self):
+        self.config(policy_reload_interval=0)
+        self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+        self.assertFalse(policy.enforce(self.member, 'fn:get',
+                                        do_raise=False))
+
+        self._write_policy({'fn:get': 'role:member'}, mtime=2000)
+        self.assertFalse(policy.enforce(self.admin, 'fn:get',
+                                        do_raise=False))
+        self.assertTrue(policy.enforce(self.member, 'fn:get'))
+        self.assertEqual(0, self._stats()['hits'])
+
+    @mock.patch('time.time')
+    def test_policy_file_checked_on_interval(self, mock_time):
+        self.config(policy_reload_interval=10)
+        mock_time.return_value = 100.0
+        self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+
+        self._write_policy({'fn:get': 'role:member'}, mtime=2000)
+        with mock.patch.object(policy._ENFORCER, 'load_rules',
+                               wraps=policy._ENFORCER.load_rules) as load:
+            mock_time.return_value = 105.0
+            self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+            self.assertFalse(load.called)
+
+            mock_time.return_value = 110.0
+            self.assertTrue(policy.enforce(self.member, 'fn:get'))
+            self.assertFalse(policy.enforce(self.admin, 'fn:get',
+                                            do_raise=False))
+            self.assertTrue(load.called)
+
+    def test_cache_disabled(self):
+        self.config(policy_cache_enabled=False)
+        self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+        self.assertTrue(policy.enforce(self.admin, 'fn:get'))
+        self.assertIsNone(policy._DECISIONS)
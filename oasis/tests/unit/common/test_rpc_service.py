@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from oasis.common import rpc_service
+from oasis.tests import base
+
+
+class TestClientCache(base.TestCase):
+
+    def setUp(self):
+        super(TestClientCache, self).setUp()
+        self.transport = mock.sentinel.transport
+        patcher = mock.patch.object(rpc_service, 'get_transport',
+                                    lambda: self.transport)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = rpc_service.ClientCache(maxsize=2)
+
+    def _get(self, topic):
+        return self.cache.get(topic, lambda: mock.Mock(topic=topic))
+
+    def test_client_reused(self):
+        client = self._get('pool-1')
+        self.assertIs(client, self._get('pool-1'))
+        self.assertIsNot(client, self._get('pool-2'))
+        stats = self.cache.stats()
+        self.assertEqual((2, 1, 2, 0), (stats['size'], stats['hits'],
+                                        stats['misses'],
+                                        stats['evictions']))
+
+    def test_least_recently_used_evicted(self):
+        first = self._get('pool-1')
+        self._get('pool-2')
+        self._get('pool-1')
+        self._get('pool-3')
+        self.assertEqual(1, self.cache.stats()['evictions'])
+        self.assertIs(first, self._get('pool-1'))
+        misses = self.cache.stats()['misses']
+        self._get('pool-2')
+        self.assertEqual(misses + 1, self.cache.stats()['misses'])
+
+    def test_cleared_with_new_transport(self):
+        # A forked process builds its own transport.
+        client = self._get('pool-1')
+        self.transport = mock.sentinel.other_transport
+        self.assertIsNot(client, self._get('pool-1'))
+        self.assertEqual(1, self.cache.stats()['size'])
+
+    def test_clear(self):
+        client = self._get('pool-1')
+        self.cache.clear()
+        self.assertIsNot(client, self._get('pool-1'))
+
+
+class TestAPIChangeClient(base.TestCase):
+
+    def setUp(self):
+        super(TestAPIChangeClient, self).setUp()
+        patcher = mock.patch.object(rpc_service, 'get_transport',
+                                    return_value=mock.sentinel.transport)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('oslo_messaging.RPCClient',
+                             side_effect=lambda *args, **kwargs: mock.Mock())
+        self.rpc_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _api(self, cache, transport=None):
+        api = rpc_service.API(transport=transport, topic='conductor')
+        api.client_cache = cache
+        return api
+
+    def test_cached(self):
+        cache = rpc_service.ClientCache(maxsize=10)
+        first = self._api(cache)
+        first.change_client('pool-1')
+        second = self._api(cache)
+        second.change_client('pool-1')
+        self.assertIs(first.client, second.client)
+        self.assertEqual(1, self.rpc_client.call_count)
+        target = self.rpc_client.call_args[0][1]
+        self.assertEqual('pool-1', target.topic)
+
+    def test_not_cached(self):
+        for api in (self._api(None),
+                    self._api(rpc_service.ClientCache(maxsize=10),
+                              transport=mock.sentinel.own_transport)):
+            api.change_client('pool-1')
+            client = api.client
+            api.change_client('pool-1')
+            self.assertIsNot(client, api.client)
+        self.assertEqual(4, self.rpc_client.call_count)
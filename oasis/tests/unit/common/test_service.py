@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from oasis.cmd import api as api_cmd
+from oasis.common import service
+from oasis.tests import base
+
+CONF = cfg.CONF
+
+
+class TestWSGIService(base.TestCase):
+
+    def setUp(self):
+        super(TestWSGIService, self).setUp()
+        patcher = mock.patch('oslo_service.wsgi.Server')
+        self.server = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_settings(self):
+        self.config(host='127.0.0.1', port=9418, workers=3,
+                    max_green_threads=50, keep_alive=False,
+                    client_socket_timeout=30, group='api')
+        wsgi_service = service.WSGIService('oasis_api', mock.sentinel.app)
+        self.assertEqual(3, wsgi_service.workers)
+        self.server.assert_called_once_with(
+            CONF, 'oasis_api', mock.sentinel.app, host='127.0.0.1',
+            port=9418, pool_size=50)
+        # oslo.service reads the keep-alive settings from [DEFAULT].
+        self.assertFalse(CONF.wsgi_keep_alive)
+        self.assertEqual(30, CONF.client_socket_timeout)
+
+    @mock.patch('oslo_concurrency.processutils.get_worker_count',
+                return_value=8)
+    def test_workers_default_to_cpu_count(self, mock_count):
+        self.config(workers=None, group='api')
+        self.assertEqual(8, service.WSGIService('oasis_api',
+                                                mock.sentinel.app).workers)
+
+    def test_keep_alive_default(self):
+        service.WSGIService('oasis_api', mock.sentinel.app)
+        self.assertTrue(CONF.wsgi_keep_alive)
+
+
+class TestAPIMain(base.TestCase):
+
+    @mock.patch('oslo_service.service.launch')
+    @mock.patch.object(service, 'WSGIService')
+    @mock.patch('oasis.api.app.load_app')
+    @mock.patch.object(service, 'prepare_service')
+    def test_launched_with_workers(self, mock_prepare, mock_load_app,
+                                   mock_service, mock_launch):
+        mock_service.return_value.workers = 4
+        api_cmd.main()
+        # The application is loaded before the workers are forked.
+        mock_service.assert_called_once_with('oasis_api',
+                                             mock_load_app.return_value)
+        mock_launch.assert_called_once_with(
+            CONF, mock_service.return_value, workers=4)
+        mock_launch.return_value.wait.assert_called_once_with()
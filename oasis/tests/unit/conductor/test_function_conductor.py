@@ -0,0 +1,88 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from oasis.cmd import conductor as conductor_cmd
+from oasis.conductor import api as conductor_api
+from oasis.conductor.handlers import function_conductor
+from oasis.tests import base
+
+
+class TestConductorAPI(base.TestCase):
+
+    def setUp(self):
+        super(TestConductorAPI, self).setUp()
+        self.api = conductor_api.API(transport=mock.Mock(),
+                                     context=self.context)
+        patcher = mock.patch.object(self.api, '_cast')
+        self.cast = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_async_methods(self):
+        # The operations are cast to the conductor, which serves them.
+        self.api.function_create_async('job', 'pool', 'fn', '/r', 'b', ['GET'])
+        self.api.function_update_async('job', 'pool', 'fn', '/r', 'b', ['GET'])
+        self.api.function_delete_async('job', 'pool', 'fn')
+        self.assertEqual(
+            ['function_create_async', 'function_update_async',
+             'function_delete_async'],
+            [call[0][0] for call in self.cast.call_args_list])
+        for call in self.cast.call_args_list:
+            self.assertEqual('job', call[1]['job_id'])
+            self.assertEqual('pool', call[1]['nodepool_id'])
+
+
+class TestFunctionConductorHandler(base.DbTestCase):
+
+    def setUp(self):
+        super(TestFunctionConductorHandler, self).setUp()
+        self.config(host='conductor-1')
+        self.handler = function_conductor.Handler()
+        patcher = mock.patch('oasis.agent.api.AgentAPI')
+        self.agent_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.agent = self.agent_api.return_value
+        patcher = mock.patch('oasis.conductor.api.API')
+        self.conductor_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job_report = self.conductor_api.return_value.job_report
+
+    def test_complete(self):
+        self.handler.function_create_async(
+            self.context, 'job', 'pool', function_id='fn', rule='/r',
+            body='b', methods=['GET'])
+        self.agent_api.assert_called_once_with(context=self.context)
+        self.agent.function_create.assert_called_once_with(
+            'pool', function_id='fn', rule='/r', body='b', methods=['GET'])
+        self.conductor_api.assert_called_once_with(context=self.context)
+        self.job_report.assert_called_once_with('job', 'conductor-1',
+                                                'COMPLETE', None)
+
+    def test_failed(self):
+        self.agent.function_delete.side_effect = ValueError('boom')
+        self.handler.function_delete_async(self.context, 'job', 'pool',
+                                           function_id='fn')
+        self.job_report.assert_called_once_with('job', 'conductor-1',
+                                                'FAILED', 'boom')
+
+    @mock.patch('oslo_service.service.launch')
+    @mock.patch('oasis.common.rpc_service.Service.create')
+    @mock.patch('oslo_reports.guru_meditation_report.TextGuruMeditation')
+    @mock.patch('oasis.common.service.prepare_service')
+    def test_served_by_conductor(self, mock_prepare, mock_gmr, mock_create,
+                                 mock_launch):
+        self.config(metrics_port=0, group='conductor')
+        conductor_cmd.main()
+        endpoints = mock_create.call_args[0][2]
+        self.assertTrue(any(isinstance(endpoint, function_conductor.Handler)
+                            for endpoint in endpoints))
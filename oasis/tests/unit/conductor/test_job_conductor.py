@@ -0,0 +1,67 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oasis.common import exception
+from oasis.conductor.handlers import job_conductor
+from oasis.objects import fields
+from oasis.tests import base
+
+
+class TestJobConductorHandler(base.DbTestCase):
+
+    def setUp(self):
+        super(TestJobConductorHandler, self).setUp()
+        self.handler = job_conductor.Handler()
+        self.function = self.dbapi.create_function({
+            'name': 'f1', 'project_id': self.context.project_id,
+            'user_id': self.context.user_id})
+
+    def _create_job(self, action):
+        return self.dbapi.create_job({
+            'project_id': self.context.project_id,
+            'user_id': self.context.user_id,
+            'function_id': self.function.id,
+            'action': action,
+            'status': fields.JobStatus.PENDING,
+            'expected_reports': 1})
+
+    def test_report(self):
+        job = self._create_job(fields.JobAction.CREATE)
+        job = self.handler.job_report(self.context, job.id, 'node-1',
+                                      fields.JobStatus.COMPLETE)
+        self.assertEqual(fields.JobStatus.COMPLETE, job.status)
+        self.dbapi.get_function_by_id(self.context, self.function.id)
+
+    def test_unknown_job(self):
+        self.assertIsNone(self.handler.job_report(
+            self.context, 'unknown', 'node-1', fields.JobStatus.COMPLETE))
+
+    def test_completed_delete_destroys_function(self):
+        job = self._create_job(fields.JobAction.DELETE)
+        self.handler.job_report(self.context, job.id, 'node-1',
+                                fields.JobStatus.COMPLETE)
+        self.assertRaises(exception.FunctionNotFound,
+                          self.dbapi.get_function_by_id, self.context,
+                          self.function.id)
+
+    def test_failed_delete_keeps_function(self):
+        job = self._create_job(fields.JobAction.DELETE)
+        self.handler.job_report(self.context, job.id, 'node-1',
+                                fields.JobStatus.FAILED, 'boom')
+        self.dbapi.get_function_by_id(self.context, self.function.id)
+
+    def test_delete_of_destroyed_function(self):
+        job = self._create_job(fields.JobAction.DELETE)
+        self.dbapi.destroy_function(self.function.id)
+        job = self.handler.job_report(self.context, job.id, 'node-1',
+                                      fields.JobStatus.COMPLETE)
+        self.assertEqual(fields.JobStatus.COMPLETE, job.status)
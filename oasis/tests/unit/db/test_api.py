@@ -0,0 +1,361 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import copy
+
+import mock
+from oslo_db import exception as db_exc
+from sqlalchemy import event
+
+from oasis.api.controllers.v1 import function as function_api
+from oasis.api.controllers.v1 import serializers
+from oasis.common import context as oasis_context
+from oasis.common import exception
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis.db.sqlalchemy import models
+from oasis import objects
+from oasis.tests import base
+
+
+def _rows(model):
+    return dict((row.id, row) for row in sqla_api.model_query(model).all())
+
+
+class TestCreateResourceBulk(base.DbTestCase):
+
+    def test_create(self):
+        created = self.dbapi.create_resource_bulk(
+            'HttpApi', [{'method': 'GET', 'endpoint_id': 'e1'},
+                        {'method': 'POST', 'endpoint_id': 'e1'}])
+        self.assertEqual(['GET', 'POST'], [row.method for row in created])
+        self.assertEqual(set(row.id for row in created),
+                         set(_rows(models.HttpApi)))
+
+    def test_duplicate_creates_nothing(self):
+        self.dbapi.create_resource_bulk('HttpApi', [{'id': 'dup'}])
+        self.assertRaises(exception.ResourceAlreadyExists,
+                          self.dbapi.create_resource_bulk,
+                          'HttpApi', [{'id': 'new'}, {'id': 'dup'}])
+        self.assertEqual(['dup'], list(_rows(models.HttpApi)))
+
+    def test_failed_chunk_creates_nothing(self):
+        values_list = [{'id': 'a%d' % i} for i in range(5)]
+        values_list.append({'id': 'a0'})
+        with mock.patch.object(sqla_api, '_BULK_CHUNK_SIZE', 2):
+            self.assertRaises(exception.ResourceAlreadyExists,
+                              self.dbapi.create_resource_bulk,
+                              'HttpApi', values_list)
+        self.assertEqual({}, _rows(models.HttpApi))
+
+
+class TestUpsertResourceBulk(base.DbTestCase):
+
+    def setUp(self):
+        super(TestUpsertResourceBulk, self).setUp()
+        self.other_context = oasis_context.RequestContext(
+            project_id='other_project', user_id='other_user')
+
+    def test_create_and_update(self):
+        ids = self.dbapi.upsert_resource_bulk(
+            self.context, 'NodePoolPolicy',
+            [{'name': 'a', 'min_size': 1, 'project_id': 'fake_project'},
+             {'name': 'b', 'min_size': 2, 'project_id': 'fake_project'}])
+        self.assertEqual(2, len(ids))
+
+        self.dbapi.upsert_resource_bulk(
+            self.context, 'NodePoolPolicy',
+            [{'id': ids[0], 'min_size': 5},
+             {'id': 'new', 'name': 'c', 'project_id': 'fake_project'}])
+
+        rows = _rows(models.NodePoolPolicy)
+        self.assertEqual(set(ids + ['new']), set(rows))
+        # Only the given values of an existing row are updated.
+        self.assertEqual(('a', 5), (rows[ids[0]].name, rows[ids[0]].min_size))
+        self.assertEqual(('b', 2), (rows[ids[1]].name, rows[ids[1]].min_size))
+
+    def test_other_project_rejected(self):
+        [policy_id] = self.dbapi.upsert_resource_bulk(
+            self.other_context, 'NodePoolPolicy',
+            [{'name': 'a', 'min_size': 1, 'project_id': 'other_project'}])
+
+        self.assertRaises(exception.ResourceNotFound,
+                          self.dbapi.upsert_resource_bulk,
+                          self.context, 'NodePoolPolicy',
+                          [{'id': 'new', 'name': 'b'},
+                           {'id': policy_id, 'min_size': 5}])
+
+        rows = _rows(models.NodePoolPolicy)
+        self.assertEqual([policy_id], list(rows))
+        self.assertEqual(1, rows[policy_id].min_size)
+
+    def test_owner_kept(self):
+        [policy_id] = self.dbapi.upsert_resource_bulk(
+            self.context, 'NodePoolPolicy',
+            [{'name': 'a', 'project_id': 'fake_project',
+              'user_id': 'fake_user'}])
+
+        self.dbapi.upsert_resource_bulk(
+            self.context, 'NodePoolPolicy',
+            [{'id': policy_id, 'project_id': 'other_project',
+              'user_id': 'other_user'}])
+
+        row = _rows(models.NodePoolPolicy)[policy_id]
+        self.assertEqual(('fake_project', 'fake_user'),
+                         (row.project_id, row.user_id))
+
+    def test_resource_without_project(self):
+        [http_api_id] = self.dbapi.upsert_resource_bulk(
+            self.context, 'HttpApi', [{'method': 'GET'}])
+
+        self.assertRaises(exception.ResourceNotFound,
+                          self.dbapi.upsert_resource_bulk,
+                          self.context, 'HttpApi',
+                          [{'id': http_api_id, 'method': 'POST'}])
+
+        admin_context = oasis_context.make_admin_context()
+        self.dbapi.upsert_resource_bulk(
+            admin_context, 'HttpApi', [{'id': http_api_id, 'method': 'POST'}])
+        row = _rows(models.HttpApi)[http_api_id]
+        self.assertEqual('POST', row.method)
+
+
+class TestGetResourceListByIds(base.DbTestCase):
+
+    def setUp(self):
+        super(TestGetResourceListByIds, self).setUp()
+        self.functions = [self._create_function(name, 'fake_project')
+                          for name in ('a', 'b')]
+        self.other = self._create_function('c', 'other_project')
+
+    def _create_function(self, name, project_id):
+        return self.dbapi.create_function({
+            'name': name, 'project_id': project_id, 'user_id': 'fake_user',
+            'nodepool_id': 'pool-' + name})
+
+    def _ids(self, **kwargs):
+        ids = [function.id for function in self.functions + [self.other]]
+        rows = self.dbapi.get_resource_list_by_ids(
+            self.context, 'Function', kwargs.pop('ids', ids), **kwargs)
+        return sorted(row.name for row in rows)
+
+    def test_tenant_filtered(self):
+        self.assertEqual(['a', 'b'], self._ids())
+
+    def test_unknown_ids(self):
+        self.assertEqual(['a'], self._ids(ids=[self.functions[0].id,
+                                               'unknown']))
+
+    def test_other_key(self):
+        self.assertEqual(['b'], self._ids(ids=['pool-b', 'pool-c'],
+                                          key='nodepool_id'))
+
+    def test_columns(self):
+        [row] = self.dbapi.get_resource_list_by_ids(
+            self.context, 'Function', [self.functions[0].id],
+            columns=['id', 'name'])
+        self.assertEqual('a', row.name)
+        self.assertNotIn('body', row.__dict__)
+
+
+class TestCreateEndpointDefinition(base.DbTestCase):
+
+    definition = {
+        'name': 'orders', 'url': '/orders', 'project_id': 'fake_project',
+        'http_apis': [
+            {'method': 'GET',
+             'request': {'headers': [{'name': 'Accept',
+                                      'value': 'application/json'}]},
+             'response': {'status_codes': [
+                 {'status_code': '404',
+                  'messages': [{'message': 'no such order'}]}]}},
+            {'method': 'POST'}]}
+
+    all_models = (models.Endpoint, models.HttpApi, models.Request,
+                  models.RequestHeader, models.Response,
+                  models.ResponseStatusCode, models.ResponseErrorMessage)
+
+    def test_create(self):
+        endpoint = self.dbapi.create_endpoint_definition(self.definition)
+
+        [get, post] = endpoint['http_apis']
+        self.assertEqual(endpoint['id'], get['endpoint_id'])
+        self.assertEqual(get['id'], get['request']['http_api_id'])
+        header = get['request']['headers'][0]
+        self.assertEqual(get['request']['id'], header['request_id'])
+        code = get['response']['status_codes'][0]
+        self.assertEqual(code['id'],
+                         code['messages'][0]['response_statuscode_id'])
+        self.assertNotIn('request', post)
+
+        [graph] = self.dbapi.get_endpoint_graph(self.context,
+                                                [endpoint['id']])
+        for values in (endpoint, graph):
+            values['http_apis'].sort(key=lambda http_api: http_api['id'])
+        self.assertEqual(endpoint, graph)
+
+    def test_failure_creates_nothing(self):
+        insert_rows = sqla_api._insert_rows
+
+        def fail_on_headers(session, model, rows, statement=None):
+            if model is models.RequestHeader:
+                raise db_exc.DBError('fake error')
+            insert_rows(session, model, rows, statement)
+
+        with mock.patch.object(sqla_api, '_insert_rows', fail_on_headers):
+            self.assertRaises(db_exc.DBError,
+                              self.dbapi.create_endpoint_definition,
+                              self.definition)
+        for model in self.all_models:
+            self.assertEqual({}, _rows(model))
+
+
+class TestGetEndpointGraph(base.DbTestCase):
+
+    def _create(self, name, project_id='fake_project'):
+        definition = copy.deepcopy(TestCreateEndpointDefinition.definition)
+        definition.update(name=name, url='/' + name, project_id=project_id)
+        return self.dbapi.create_endpoint_definition(definition)['id']
+
+    def _graph(self, ids):
+        statements = []
+        engine = sqla_api.get_engine()
+
+        def capture(conn, cursor, statement, *args):
+            # NOTE: oslo.db pings each connection it checks out.
+            if statement != 'SELECT 1':
+                statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            graph = self.dbapi.get_endpoint_graph(self.context, ids)
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        return graph, len(statements)
+
+    def test_queries_per_level(self):
+        ids = [self._create(name) for name in ('a', 'b', 'c')]
+        graph, queries = self._graph(ids)
+        self.assertEqual(sorted(ids), sorted(values['id']
+                                             for values in graph))
+        for values in graph:
+            self.assertEqual(2, len(values['http_apis']))
+        # The endpoints, their http apis with requests and responses,
+        # headers, status codes and messages.
+        self.assertEqual(5, queries)
+        self.assertEqual(queries, self._graph(ids[:1])[1])
+
+    def test_tenant_filtered(self):
+        hidden = self._create('hidden', project_id='other_project')
+        visible = self._create('visible')
+        graph, _ = self._graph([hidden, visible])
+        self.assertEqual([visible], [values['id'] for values in graph])
+
+    def test_unknown(self):
+        self.assertEqual([], self._graph(['unknown'])[0])
+
+
+class TestAddJobResult(base.DbTestCase):
+
+    def _create_job(self, expected_reports):
+        return self.dbapi.create_job({'project_id': 'fake_project',
+                                      'status': 'PENDING', 'results': [],
+                                      'expected_reports': expected_reports})
+
+    def _report(self, job, host, status, status_reason=None):
+        return self.dbapi.add_job_result(job.id, {
+            'host': host, 'status': status, 'status_reason': status_reason})
+
+    def test_complete_once_every_node_reported(self):
+        job = self._create_job(expected_reports=3)
+        self.assertEqual('PENDING',
+                         self._report(job, 'node-1', 'COMPLETE').status)
+        self.assertEqual('PENDING',
+                         self._report(job, 'node-2', 'COMPLETE').status)
+        # A node reporting twice counts once.
+        self.assertEqual('PENDING',
+                         self._report(job, 'node-2', 'COMPLETE').status)
+        job = self._report(job, 'node-3', 'COMPLETE')
+        self.assertEqual(('COMPLETE', None), (job.status, job.status_reason))
+        self.assertEqual(['node-1', 'node-2', 'node-3'],
+                         sorted(r['host'] for r in job.results))
+
+    def test_failed_as_soon_as_a_node_failed(self):
+        job = self._create_job(expected_reports=3)
+        job = self._report(job, 'node-1', 'FAILED', 'no space left')
+        self.assertEqual(('FAILED', 'no space left'),
+                         (job.status, job.status_reason))
+        job = self._report(job, 'node-2', 'COMPLETE')
+        job = self._report(job, 'node-3', 'COMPLETE')
+        self.assertEqual('FAILED', job.status)
+
+    def test_single_report_expected(self):
+        job = self._create_job(expected_reports=None)
+        self.assertEqual('COMPLETE',
+                         self._report(job, 'node-1', 'COMPLETE').status)
+
+    def test_unknown_job(self):
+        self.assertRaises(exception.JobNotFound, self.dbapi.add_job_result,
+                          '5e2b0a1c-58f4-4b5a-a4b6-6c2cd3a0e8d1',
+                          {'host': 'node-1', 'status': 'FAILED'})
+
+
+class TestStreamedList(base.DbTestCase):
+
+    def setUp(self):
+        super(TestStreamedList, self).setUp()
+        for i in range(5):
+            self.dbapi.create_function({'name': 'f%d' % i,
+                                        'project_id': 'fake_project'})
+        facade = sqla_api._create_facade_lazily()
+        get_session = facade.get_session
+        self.sessions = []
+
+        def spy_session(**kwargs):
+            session = get_session(**kwargs)
+            session.close = mock.Mock(wraps=session.close)
+            self.sessions.append(session)
+            return session
+
+        patcher = mock.patch.object(facade, 'get_session',
+                                    side_effect=spy_session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _stream(self):
+        rows = self.dbapi.get_function_list(self.context, yield_per=2)
+        return rows, self.sessions[-1]
+
+    def test_session_closed_when_exhausted(self):
+        rows, session = self._stream()
+        self.assertEqual(5, len(list(rows)))
+        self.assertTrue(session.close.called)
+
+    def test_session_closed_when_closed_early(self):
+        rows, session = self._stream()
+        next(rows)
+        self.assertFalse(session.close.called)
+        rows.close()
+        self.assertTrue(session.close.called)
+
+    def test_session_closed_with_response_body(self):
+        rpc_items = objects.Function.list(self.context, yield_per=2)
+        session = self.sessions[-1]
+        body = function_api.FunctionCollection._iter_json(
+            'functions', function_api.Function, rpc_items, None,
+            'http://localhost:9417', 'functions', False, None,
+            serializers.get(function_api.Function))
+        next(body)
+        next(body)
+        self.assertFalse(session.close.called)
+        # What the WSGI server does when the client goes away.
+        body.close()
+        self.assertTrue(session.close.called)
@@ -0,0 +1,201 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Query plan regression tests.
+
+Every query method of the Connection is run against SQLite, and each
+SELECT, UPDATE and DELETE statement it sends is explained with EXPLAIN
+QUERY PLAN. A statement fails the test if its plan scans a table without
+an index.
+"""
+
+import mock
+from sqlalchemy import event
+
+from oasis.common import exception
+from oasis.common import utils
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis.db.sqlalchemy import models
+from oasis.tests import base
+
+ENDPOINT_ID = utils.generate_uuid()
+HTTP_API_ID = utils.generate_uuid()
+REQUEST_ID = utils.generate_uuid()
+HEADER_ID = utils.generate_uuid()
+RESPONSE_ID = utils.generate_uuid()
+CODE_ID = utils.generate_uuid()
+MESSAGE_ID = utils.generate_uuid()
+FUNCTION_ID = utils.generate_uuid()
+NODEPOOL_ID = utils.generate_uuid()
+POLICY_ID = utils.generate_uuid()
+JOB_ID = utils.generate_uuid()
+
+# The prefixes of the Connection methods which query the database.
+_QUERY_PREFIXES = ('get_', 'update_', 'upsert_', 'destroy_', 'destory_',
+                   'add_')
+
+
+def _cases(context):
+    """Return the (method, HTTP method, args, kwargs) run by the test.
+
+    The HTTP method is the one of the request a method reads, if any.
+    The rows are destroyed last.
+    """
+    tenant = {'project_id': context.project_id}
+    return [
+        ('get_validator', None, (context, 'Function', FUNCTION_ID), {}),
+        ('get_resource_list_by_ids', None,
+         (context, 'Function', [FUNCTION_ID]), {}),
+        ('upsert_resource_bulk', None,
+         (context, 'Function', [{'id': FUNCTION_ID, 'name': 'f1'}]), {}),
+        ('get_endpoint_graph', None, (context, [ENDPOINT_ID]), {}),
+        ('get_endpoint_list', None, (context,), {'limit': 10}),
+        ('get_endpoint_by_id', None, (context, ENDPOINT_ID), {}),
+        ('get_endpoint_by_name', None, (context, 'e1'), {}),
+        ('get_httpapi_list', None, (context,),
+         {'filters': {'endpoint_id': ENDPOINT_ID}, 'limit': 10}),
+        ('get_httpapi_by_id', 'GET', (context, ENDPOINT_ID), {}),
+        ('get_httpapi_by_id', 'DELETE', (context, HTTP_API_ID), {}),
+        ('get_request_by_id', 'GET', (context, HTTP_API_ID), {}),
+        ('get_request_by_id', 'DELETE', (context, REQUEST_ID), {}),
+        ('get_request_list', None, (context,),
+         {'filters': {'http_api_id': HTTP_API_ID}, 'limit': 10}),
+        ('get_request_header_by_id', 'GET', (context, REQUEST_ID), {}),
+        ('get_request_header_by_id', 'DELETE', (context, HEADER_ID), {}),
+        ('get_request_header_list', None, (context,),
+         {'filters': {'request_id': REQUEST_ID}, 'limit': 10}),
+        ('get_response_list', None, (context,),
+         {'filters': {'http_api_id': HTTP_API_ID}, 'limit': 10}),
+        ('get_response_code_list', None, (context,), {'limit': 10}),
+        ('get_response_message_list', None, (context,), {'limit': 10}),
+        ('get_function_list', None, (context,),
+         {'filters': dict(tenant, endpoint_id=ENDPOINT_ID), 'limit': 10}),
+        ('get_function_list', None, (context,),
+         {'filters': {'nodepool_id': NODEPOOL_ID}, 'limit': 10}),
+        ('get_function_by_id', None, (context, FUNCTION_ID), {}),
+        ('get_function_by_name', None, (context, 'f1'), {}),
+        ('update_function', None, (FUNCTION_ID, {'desc': 'updated'}), {}),
+        ('get_nodepool_policy_list', None, (context,), {'limit': 10}),
+        ('get_nodepool_policy_by_id', None, (context, POLICY_ID), {}),
+        ('get_nodepool_policy_by_name', None, (context, 'p1'), {}),
+        ('update_nodepool_policy', None, (POLICY_ID, {'min_size': 2}), {}),
+        ('get_nodepool_list', None, (context,), {'limit': 10}),
+        ('get_nodepool_by_id', None, (context, NODEPOOL_ID), {}),
+        ('update_nodepool', None, (NODEPOOL_ID, {'host': 'node-1'}), {}),
+        ('get_job_list', None, (context,),
+         {'filters': {'function_id': FUNCTION_ID}, 'limit': 10}),
+        ('get_job_by_id', None, (context, JOB_ID), {}),
+        ('update_job', None, (JOB_ID, {'status_reason': 'updated'}), {}),
+        ('add_job_result', None,
+         (JOB_ID, {'host': 'node-1', 'status': 'COMPLETE'}), {}),
+        ('destroy_request_header', None, (HEADER_ID,), {}),
+        ('destroy_httpapi', None, (HTTP_API_ID,), {}),
+        ('destroy_endpoint', None, (ENDPOINT_ID,), {}),
+        ('destroy_function', None, (FUNCTION_ID,), {}),
+        ('destroy_nodepool_policy', None, (POLICY_ID,), {}),
+        ('destroy_nodepool', None, (NODEPOOL_ID,), {}),
+        ('destory_nodepool', None, (NODEPOOL_ID,), {}),
+    ]
+
+
+class TestQueryPlans(base.DbTestCase):
+
+    def setUp(self):
+        super(TestQueryPlans, self).setUp()
+        tenant = {'project_id': self.context.project_id,
+                  'user_id': self.context.user_id}
+        for model, values in (
+                (models.Endpoint, dict(tenant, id=ENDPOINT_ID, name='e1')),
+                (models.HttpApi, {'id': HTTP_API_ID, 'method': 'GET',
+                                  'endpoint_id': ENDPOINT_ID}),
+                (models.Request, {'id': REQUEST_ID,
+                                  'http_api_id': HTTP_API_ID}),
+                (models.RequestHeader, {'id': HEADER_ID, 'name': 'Accept',
+                                        'request_id': REQUEST_ID}),
+                (models.Response, {'id': RESPONSE_ID,
+                                   'http_api_id': HTTP_API_ID}),
+                (models.ResponseStatusCode, {'id': CODE_ID,
+                                             'status_code': '200',
+                                             'response_id': RESPONSE_ID}),
+                (models.ResponseErrorMessage,
+                 {'id': MESSAGE_ID, 'message': 'OK',
+                  'response_statuscode_id': CODE_ID}),
+                (models.Function, dict(tenant, id=FUNCTION_ID, name='f1',
+                                       endpoint_id=ENDPOINT_ID,
+                                       nodepool_id=NODEPOOL_ID)),
+                (models.NodePoolPolicy, dict(tenant, id=POLICY_ID,
+                                             name='p1')),
+                (models.NodePool, dict(tenant, id=NODEPOOL_ID, name='n1',
+                                       function_id=FUNCTION_ID,
+                                       nodepool_policy_id=POLICY_ID)),
+                (models.Job, dict(tenant, id=JOB_ID,
+                                  function_id=FUNCTION_ID,
+                                  nodepool_id=NODEPOOL_ID,
+                                  expected_reports=1))):
+            sqla_api.get_engine().execute(model.__table__.insert(), values)
+
+        self.statements = []
+        engine = sqla_api.get_engine()
+        event.listen(engine, 'before_cursor_execute', self._capture)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute',
+                        self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context,
+                 executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ('SELECT', 'UPDATE', 'DELETE') and not executemany:
+            self.statements.append((statement, parameters))
+
+    def _full_scans(self, statement, parameters):
+        """Return the tables the statement's plan scans without index."""
+        connection = sqla_api.get_engine().raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+            details = [row[-1] for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+        scans = []
+        for detail in details:
+            words = [word for word in detail.split() if word != 'TABLE']
+            if (words[0] == 'SCAN' and
+                    words[1] in models.Base.metadata.tables and
+                    'USING' not in words):
+                scans.append(detail)
+        return scans
+
+    def test_query_methods_covered(self):
+        methods = set(name for name in dir(sqla_api.Connection)
+                      if name.startswith(_QUERY_PREFIXES))
+        covered = set(case[0] for case in _cases(self.context))
+        self.assertEqual(set(), methods - covered)
+
+    @mock.patch.object(sqla_api, 'pecan')
+    def test_queries_use_an_index(self, mock_pecan):
+        failures = []
+        for name, http_method, args, kwargs in _cases(self.context):
+            mock_pecan.request.method = http_method
+            self.statements = []
+            try:
+                getattr(self.dbapi, name)(*args, **kwargs)
+            except exception.OasisException:
+                # The lookups of rows destroyed earlier fail after their
+                # query ran.
+                pass
+            self.assertNotEqual([], self.statements, name)
+            for statement, parameters in self.statements:
+                scans = self._full_scans(statement, parameters)
+                if scans:
+                    failures.append('%s: %s\n%s' % (name, ', '.join(scans),
+                                                    statement))
+        self.assertEqual([], failures, '\n\n'.join(failures))
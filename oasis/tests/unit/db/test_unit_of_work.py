@@ -0,0 +1,127 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from oasis.api import hooks
+from oasis.common import rpc_service
+from oasis.conductor import utils as conductor_utils
+from oasis.db.sqlalchemy import api as sqla_api
+from oasis.db.sqlalchemy import models
+from oasis.tests import base
+
+
+class TestUnitOfWork(base.DbTestCase):
+
+    def _create_job(self):
+        return self.dbapi.create_job({'project_id': 'fake_project',
+                                      'status': 'PENDING'}).id
+
+    def _committed_job_ids(self):
+        # A session of its own only sees the committed rows.
+        session = sqla_api._create_facade_lazily().get_session()
+        try:
+            return [job.id for job in session.query(models.Job)]
+        finally:
+            session.close()
+
+    def test_commit(self):
+        self.dbapi.begin_unit_of_work()
+        job_id = self._create_job()
+        self.assertEqual([], self._committed_job_ids())
+        self.dbapi.end_unit_of_work()
+        self.assertEqual([job_id], self._committed_job_ids())
+
+    def test_rollback(self):
+        self.dbapi.begin_unit_of_work()
+        self._create_job()
+        self.dbapi.end_unit_of_work(commit=False)
+        self.assertEqual([], self._committed_job_ids())
+
+    def test_shared_session(self):
+        self.dbapi.begin_unit_of_work()
+        self.addCleanup(self.dbapi.end_unit_of_work, commit=False)
+        self.assertIs(sqla_api.get_session(), sqla_api.get_session())
+
+    def test_commit_unit_of_work_keeps_earlier_writes(self):
+        self.dbapi.begin_unit_of_work()
+        job_id = self._create_job()
+        self.dbapi.commit_unit_of_work()
+        self._create_job()
+        self.dbapi.end_unit_of_work(commit=False)
+        self.assertEqual([job_id], self._committed_job_ids())
+
+    def _rpc_api(self, seen):
+        api = rpc_service.API(topic='fake-topic')
+        api._client = mock.Mock()
+        api._client.call.side_effect = (
+            lambda *args, **kwargs: seen.append(
+                sorted(self._committed_job_ids())))
+        api._client.cast.side_effect = api._client.call.side_effect
+        return api
+
+    def _create_jobs_around_rpc(self, api):
+        first = self._create_job()
+        api._call('fake_method', None)
+        second = self._create_job()
+        api._cast('fake_method', None)
+        return first, second
+
+    def test_rpc_handler_commits_before_rpc(self):
+        seen = []
+        api = self._rpc_api(seen)
+
+        @conductor_utils.unit_of_work
+        def handler():
+            self.jobs = self._create_jobs_around_rpc(api)
+            raise ValueError()
+
+        self.assertRaises(ValueError, handler)
+        first, second = self.jobs
+        self.assertEqual([[first], sorted([first, second])], seen)
+        self.assertEqual(sorted([first, second]),
+                         sorted(self._committed_job_ids()))
+
+    def test_request_commits_before_rpc(self):
+        self.config(db_session_per_request=True, group='api')
+        seen = []
+        api = self._rpc_api(seen)
+        hook = hooks.DBSessionHook()
+        state = mock.Mock()
+        state.response.status_int = 500
+
+        hook.before(state)
+        first, second = self._create_jobs_around_rpc(api)
+        hook.after(state)
+
+        self.assertEqual([[first], sorted([first, second])], seen)
+        self.assertEqual(sorted([first, second]),
+                         sorted(self._committed_job_ids()))
+
+    def test_rpc_without_unit_of_work(self):
+        seen = []
+        api = self._rpc_api(seen)
+
+        @conductor_utils.unit_of_work
+        def handler():
+            pass
+
+        handler()
+        with mock.patch.object(self.dbapi, 'commit_unit_of_work') as commit:
+            api._call('fake_method', None)
+        self.assertFalse(commit.called)
+
+    def test_no_unit_of_work(self):
+        self.dbapi.commit_unit_of_work()
+        self.dbapi.end_unit_of_work()
+        job_id = self._create_job()
+        self.assertEqual([job_id], self._committed_job_ids())
@@ -57,6 +57,14 @@ setup(
         ],
         'oasis.database.migration_backend': [
             'sqlalchemy = oasis.db.sqlalchemy.migration'
+        ],
+        'oasis.api.rate_limit_backend': [
+            'memory = oasis.api.rate_limit:MemoryBackend',
+            'memcached = oasis.api.rate_limit:MemcachedBackend'
+        ],
+        'oasis.api.token_cache_backend': [
+            'memory = oasis.api.token_cache:MemoryBackend',
+            'memcached = oasis.api.token_cache:MemcachedBackend'
         ]
     },
     packages=[